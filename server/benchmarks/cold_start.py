@@ -0,0 +1,80 @@
+"""
+Measure API cold-start time.
+
+Starts the application in a fresh process and reports the time until the
+first successful ``GET /health``. Run it against a migrated database, e.g.:
+
+    python benchmarks/cold_start.py --runs 5
+    python benchmarks/cold_start.py --runs 5 --workers 4
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+
+def wait_for_health(url: str, timeout: float) -> float:
+    """
+    Poll the health endpoint until it answers.
+    
+    Args:
+        url: Health endpoint URL
+        timeout: Maximum number of seconds to wait
+        
+    Returns:
+        float: Seconds elapsed until the first 200 response
+    """
+    start = time.perf_counter()
+    while time.perf_counter() - start < timeout:
+        try:
+            with urllib.request.urlopen(url, timeout=0.5) as response:
+                if response.status == 200:
+                    return time.perf_counter() - start
+        except OSError:
+            pass
+        time.sleep(0.01)
+    raise TimeoutError(f"{url} did not become healthy within {timeout}s")
+
+def measure(port: int, workers: int, timeout: float) -> float:
+    """
+    Start the server once and measure time to first healthy response.
+    
+    Args:
+        port: Port to bind
+        workers: Number of uvicorn worker processes
+        timeout: Maximum number of seconds to wait
+        
+    Returns:
+        float: Cold-start time in seconds
+    """
+    process = subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "src.main:app",
+            "--port", str(port), "--workers", str(workers), "--log-level", "warning",
+        ],
+    )
+    try:
+        return wait_for_health(f"http://127.0.0.1:{port}/health", timeout)
+    finally:
+        process.terminate()
+        process.wait()
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--timeout", type=float, default=60.0)
+    args = parser.parse_args()
+    
+    samples = [measure(args.port, args.workers, args.timeout) for _ in range(args.runs)]
+    print(f"workers={args.workers} runs={args.runs}")
+    print(f"  min    {min(samples) * 1000:8.1f} ms")
+    print(f"  median {statistics.median(samples) * 1000:8.1f} ms")
+    print(f"  max    {max(samples) * 1000:8.1f} ms")
+
+if __name__ == "__main__":
+    main()
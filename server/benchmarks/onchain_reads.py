@@ -0,0 +1,108 @@
+"""
+Measure on-chain read latency.
+
+Reads a wallet's state (native balance, contract balance and the owner of
+``--tokens`` badge tokens) from ``BLOCKCHAIN_PROVIDER_URL`` one call per
+request, as one JSON-RPC batch and, when Multicall3 is deployed, as one
+aggregated call, and reports the latency of each. With ``--user-id`` it also
+measures ``GET /users/{id}/onchain``, whose responses are cached per block.
+Run it against a local dev chain, e.g.:
+
+    docker compose --profile dev up -d anvil
+    python benchmarks/onchain_reads.py --tokens 1 10 100
+    python benchmarks/onchain_reads.py --user-id 1 --repeat 200
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+import urllib.request
+from typing import Callable, List
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.blockchain import multicall  # noqa: E402
+from src.blockchain.multicall import encode_call, multicall_available, read  # noqa: E402
+from src.blockchain.provider import ZERO_ADDRESS  # noqa: E402
+from src.blockchain.rpc import get_rpc  # noqa: E402
+from src.config.settings import settings  # noqa: E402
+
+WALLET = "0x" + "a1" * 20
+
+def timings(run: Callable[[], object], repeat: int) -> List[float]:
+    """
+    Time repeated runs.
+    
+    Args:
+        run: Function to time
+        repeat: Number of runs
+        
+    Returns:
+        List[float]: Milliseconds per run
+    """
+    run()  # Warm up the connection pool
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+def report(name: str, samples: List[float]) -> None:
+    """Print the latency distribution of a strategy."""
+    samples = sorted(samples)
+    p95 = samples[min(int(len(samples) * 0.95), len(samples) - 1)]
+    print(f"{name:<28}{statistics.median(samples):>10.2f}{p95:>10.2f}{statistics.mean(samples):>10.2f}")
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tokens", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--user-id", type=int)
+    parser.add_argument("--api-url", default="http://localhost:8000/api")
+    args = parser.parse_args()
+    
+    rpc = get_rpc()
+    contract = settings.CONTRACT_ADDRESS or ZERO_ADDRESS
+    block = int(rpc.call("eth_blockNumber"), 16)
+    has_multicall = multicall_available(rpc)
+    print(f"Node {settings.BLOCKCHAIN_PROVIDER_URL} at block {block}, multicall {'on' if has_multicall else 'off'}")
+    print(f"{'strategy':<28}{'p50 ms':>10}{'p95 ms':>10}{'mean ms':>10}")
+    
+    for tokens in args.tokens:
+        calls = [(contract, encode_call("balanceOf(address)", ["address"], [WALLET]))]
+        calls += [(contract, encode_call("ownerOf(uint256)", ["uint256"], [token_id])) for token_id in range(tokens)]
+        
+        def sequential():
+            rpc.call("eth_getBalance", [WALLET, hex(block)])
+            for to, data in calls:
+                rpc.call("eth_call", [{"to": to, "data": data}, hex(block)])
+        
+        def batched():
+            multicall._multicall_available = False
+            try:
+                read(rpc, block, [("eth_getBalance", [WALLET])], calls)
+            finally:
+                multicall._multicall_available = has_multicall
+        
+        report(f"sequential x{tokens}", timings(sequential, args.repeat))
+        report(f"batch x{tokens}", timings(batched, args.repeat))
+        if has_multicall:
+            report(f"multicall x{tokens}", timings(
+                lambda: read(rpc, block, [("eth_getBalance", [WALLET])], calls), args.repeat,
+            ))
+    
+    if args.user_id is not None:
+        url = f"{args.api_url}/users/{args.user_id}/onchain"
+        
+        def endpoint():
+            with urllib.request.urlopen(url, timeout=settings.BLOCKCHAIN_REQUEST_TIMEOUT) as response:
+                response.read()
+        
+        report("GET /users/{id}/onchain", timings(endpoint, args.repeat))
+
+if __name__ == "__main__":
+    main()
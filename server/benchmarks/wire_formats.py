@@ -0,0 +1,131 @@
+"""
+Compare wire formats and response compression.
+
+Encodes representative list payloads (contribution and task listings of
+several sizes) in every supported format and content coding, and reports
+bytes on the wire and server CPU time per response. Uses the same encoders
+as ``ContentNegotiationMiddleware`` with the levels from settings, e.g.:
+
+    python benchmarks/wire_formats.py
+    python benchmarks/wire_formats.py --rows 100 1000 --repeat 50
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.utils.encoding import ENCODERS, json_to_msgpack  # noqa: E402
+
+CONTRIBUTION_TYPES = ["code", "design", "documentation", "testing", "review", "financial", "other"]
+STATUSES = ["pending", "verified", "rejected"]
+
+def contributions(rows: int) -> list:
+    """
+    Build a contribution listing like ``GET /contributions/``.
+    
+    Args:
+        rows: Number of contributions
+        
+    Returns:
+        list: JSON-serializable payload
+    """
+    rng = random.Random(rows)
+    start = datetime(2026, 1, 1)
+    payload = []
+    for i in range(rows):
+        created = start + timedelta(minutes=rng.randint(0, 500_000))
+        payload.append({
+            "id": i + 1,
+            "title": f"Contribution {i + 1}: {rng.choice(['fix', 'add', 'refactor', 'document'])} module",
+            "description": " ".join(rng.choice(["lorem", "ipsum", "dolor", "sit", "amet"]) for _ in range(rng.randint(5, 60))),
+            "type": rng.choice(CONTRIBUTION_TYPES),
+            "value": round(rng.uniform(0, 500), 2),
+            "user_id": rng.randint(1, 500),
+            "project_id": rng.randint(1, 40),
+            "task_id": rng.choice([None, rng.randint(1, 5000)]),
+            "status": rng.choice(STATUSES),
+            "transaction_hash": rng.choice([None, "0x" + "".join(rng.choice("0123456789abcdef") for _ in range(64))]),
+            "token_amount": rng.choice([None, round(rng.uniform(0, 500), 6)]),
+            "created_at": created.isoformat(),
+            "updated_at": (created + timedelta(hours=rng.randint(0, 72))).isoformat(),
+        })
+    return payload
+
+def tasks(rows: int) -> list:
+    """
+    Build a task listing like ``GET /projects/{id}/tasks``.
+    
+    Args:
+        rows: Number of tasks
+        
+    Returns:
+        list: JSON-serializable payload
+    """
+    rng = random.Random(rows + 1)
+    return [
+        {
+            "id": i + 1,
+            "title": f"Task {i + 1}",
+            "description": None if rng.random() < 0.3 else "Implement the feature described in the issue",
+            "taiga_task_id": rng.randint(1, 100_000),
+            "status": rng.choice(["pending", "in_progress", "done"]),
+            "priority": rng.choice([None, "low", "normal", "high"]),
+            "assignee_id": rng.choice([None, rng.randint(1, 500)]),
+            "project_id": 1,
+            "created_at": datetime(2026, 1, 1).isoformat(),
+            "updated_at": datetime(2026, 1, 2).isoformat(),
+        }
+        for i in range(rows)
+    ]
+
+def cpu_time(func, body: bytes, repeat: int) -> float:
+    """
+    Measure the mean CPU time of one call.
+    
+    Args:
+        func: Encoder
+        body: Input
+        repeat: Number of calls
+        
+    Returns:
+        float: Seconds of CPU time per call
+    """
+    start = time.process_time()
+    for _ in range(repeat):
+        func(body)
+    return (time.process_time() - start) / repeat
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    
+    print(f"{'payload':<22}{'format':<10}{'coding':<10}{'bytes':>10}{'ratio':>8}{'cpu ms':>10}")
+    for name, build in (("contributions", contributions), ("tasks", tasks)):
+        for rows in args.rows:
+            json_body = json.dumps(build(rows)).encode()
+            msgpack_body = json_to_msgpack(json_body)
+            msgpack_cpu = cpu_time(json_to_msgpack, json_body, args.repeat)
+            for format_name, body, format_cpu in (
+                ("json", json_body, 0.0),
+                ("msgpack", msgpack_body, msgpack_cpu),
+            ):
+                codings = [("identity", lambda b: b)] + list(ENCODERS.items())
+                for coding, encoder in codings:
+                    encoded = encoder(body)
+                    cpu = format_cpu + (cpu_time(encoder, body, args.repeat) if coding != "identity" else 0.0)
+                    print(
+                        f"{name + ' x' + str(rows):<22}{format_name:<10}{coding:<10}"
+                        f"{len(encoded):>10}{len(encoded) / len(json_body):>8.2f}{cpu * 1000:>10.3f}"
+                    )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+Gunicorn configuration for production.
+
+Runs the FastAPI application in several Uvicorn worker processes:
+
+    gunicorn -c gunicorn.conf.py src.main:app
+
+The application is imported once in the master process (``preload_app``)
+and shared with the workers through fork. Nothing in the application opens a
+database or Redis connection at import time; pools are (re)created in each
+worker after fork by ``post_fork``.
+"""
+
+import logging
+import os
+import shutil
+import signal
+import threading
+import time
+
+from src.config.settings import settings
+
+logger = logging.getLogger("gunicorn.error")
+
+def available_cpus() -> int:
+    """
+    Number of CPUs this process may use.
+    
+    Honours CPU affinity and, inside containers, the cgroup v2 CPU quota.
+    
+    Returns:
+        int: Usable CPU count, at least 1
+    """
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+    
+    try:
+        with open("/sys/fs/cgroup/cpu.max", encoding="utf-8") as f:
+            quota, period = f.read().split()
+        if quota != "max":
+            cpus = min(cpus, max(1, int(int(quota) / int(period))))
+    except (OSError, ValueError):
+        pass
+    
+    return max(1, cpus)
+
+# Server socket
+bind = f"{settings.SERVER_HOST}:{settings.SERVER_PORT}"
+backlog = 2048
+
+# Worker processes: Uvicorn workers are asynchronous, one per core
+worker_class = "uvicorn.workers.UvicornWorker"
+workers = settings.WEB_CONCURRENCY or available_cpus()
+
+# Import the application once, before forking
+preload_app = True
+
+# Recycle workers after a number of requests (jittered so they do not all
+# restart at once); the memory ceiling is enforced by post_fork below
+max_requests = settings.WORKER_MAX_REQUESTS
+max_requests_jitter = max(1, settings.WORKER_MAX_REQUESTS // 10)
+
+# Graceful shutdown: workers stop accepting connections and get this long
+# to finish in-flight requests
+graceful_timeout = settings.WORKER_GRACEFUL_TIMEOUT
+timeout = 60
+keepalive = 5
+
+# Logging
+accesslog = "-"
+errorlog = "-"
+loglevel = "info"
+
+def on_starting(server):
+    """Clear metrics left behind by a previous run."""
+    directory = os.getenv("PROMETHEUS_MULTIPROC_DIR")
+    if directory:
+        shutil.rmtree(directory, ignore_errors=True)
+        os.makedirs(directory, exist_ok=True)
+
+def _rss_bytes() -> int:
+    """Current resident set size of this process."""
+    with open("/proc/self/statm", encoding="utf-8") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+def _watch_memory(worker, limit: int) -> None:
+    """
+    Gracefully stop the worker once its memory exceeds the ceiling.
+    
+    SIGTERM makes Uvicorn stop accepting requests and finish in-flight ones;
+    the master then forks a fresh worker.
+    """
+    while True:
+        time.sleep(settings.WORKER_MEMORY_CHECK_INTERVAL)
+        try:
+            rss = _rss_bytes()
+        except OSError:
+            return
+        if rss > limit:
+            logger.warning(
+                "Worker %s uses %d MB (limit %d MB), recycling",
+                worker.pid, rss // 2**20, limit // 2**20,
+            )
+            os.kill(os.getpid(), signal.SIGTERM)
+            return
+
+def post_fork(server, worker):
+    """Create per-process connection pools in the new worker."""
+    from src.db.database import engine
+    from src.utils.redis_client import reset_redis_clients
+    
+    # Drop any pooled connections inherited from the master without closing
+    # them (they belong to the parent)
+    engine.dispose(close=False)
+    reset_redis_clients()
+    
+    if settings.WORKER_MAX_MEMORY_MB:
+        threading.Thread(
+            target=_watch_memory,
+            args=(worker, settings.WORKER_MAX_MEMORY_MB * 2**20),
+            name="memory-watchdog",
+            daemon=True,
+        ).start()
+
+def child_exit(server, worker):
+    """Drop live gauges of an exited worker."""
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(worker.pid)
@@ -1,8 +1,11 @@
 """
 Run the FastAPI application.
 
-This script is used to run the FastAPI application in development mode.
-For production, use a proper ASGI server like Uvicorn or Hypercorn.
+This script is used to run the FastAPI application in development mode
+(single process, auto-reload). For production, use the multi-process
+launcher instead:
+
+    gunicorn -c gunicorn.conf.py src.main:app
 """
 
 import uvicorn
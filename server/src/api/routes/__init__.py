@@ -7,6 +7,10 @@ from .users import router as users_router
 from .projects import router as projects_router
 from .contributions import router as contributions_router
 from .badges import router as badges_router
+from .events import router as events_router
+from .debug import router as debug_router
+from .batch import router as batch_router
+from .analytics import router as analytics_router
 
 # Create main router
 api_router = APIRouter()
@@ -17,5 +21,9 @@ api_router.include_router(users_router)
 api_router.include_router(projects_router)
 api_router.include_router(contributions_router)
 api_router.include_router(badges_router)
+api_router.include_router(events_router)
+api_router.include_router(debug_router)
+api_router.include_router(batch_router)
+api_router.include_router(analytics_router)
 
 __all__ = ["api_router"]
\ No newline at end of file
@@ -0,0 +1,84 @@
+from datetime import date, timedelta
+from typing import Any, List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+
+from ...config.settings import settings
+from ...db.database import get_db
+from ...db.models import ContributionStatus, ContributionType
+from ...services.analytics import contribution_series, get_watermark
+from ..schemas import (
+    ContributionSeries,
+    ContributionStatusEnum,
+    ContributionTypeEnum,
+    DimensionEnum,
+    GranularityEnum,
+)
+
+router = APIRouter(prefix="/analytics", tags=["analytics"])
+
+@router.get("/contributions", response_model=ContributionSeries)
+def get_contribution_series(
+    start: date,
+    end: date,
+    granularity: GranularityEnum = GranularityEnum.DAY,
+    group_by: List[DimensionEnum] = Query([]),
+    project_id: Optional[int] = None,
+    type: Optional[ContributionTypeEnum] = None,
+    contribution_status: Optional[ContributionStatusEnum] = Query(None, alias="status"),
+    db: Session = Depends(get_db),
+) -> Any:
+    """
+    Get contribution counts, value and token amounts over time.
+    
+    Answered from the daily rollups, which trail live data by up to the
+    rollup interval; ``watermark`` tells up to when changes are included.
+    
+    Args:
+        start: First day, inclusive
+        end: Last day, inclusive
+        granularity: Bucket size (day, week or month)
+        group_by: Dimensions to break the series down by (project, type, status)
+        project_id: Only count contributions to this project
+        type: Only count contributions of this type
+        contribution_status: Only count contributions with this status
+        db: Database session
+        
+    Returns:
+        ContributionSeries: Time series
+        
+    Raises:
+        HTTPException: If the date range is invalid or too long
+    """
+    if end < start:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="end must not be before start",
+        )
+    if end - start > timedelta(days=settings.ANALYTICS_MAX_RANGE_DAYS):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Date range is limited to {settings.ANALYTICS_MAX_RANGE_DAYS} days",
+        )
+    
+    dimensions = list(dict.fromkeys(dimension.value for dimension in group_by))
+    points = contribution_series(
+        db,
+        granularity.value,
+        start,
+        end,
+        group_by=dimensions,
+        project_id=project_id,
+        contribution_type=ContributionType(type.value) if type else None,
+        contribution_status=ContributionStatus(contribution_status.value) if contribution_status else None,
+    )
+    
+    return {
+        "granularity": granularity,
+        "start": start,
+        "end": end,
+        "group_by": dimensions,
+        "watermark": get_watermark(db),
+        "points": points,
+    }
@@ -1,18 +1,20 @@
-from datetime import timedelta
 from typing import Any
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 
 from ...db.database import get_db
 from ...db.models import User
-from ...utils.auth import create_access_token
-from ..schemas import UserCreate, User as UserSchema, Token
+from ...services.sessions import issue_tokens, revoke_sessions, rotate_refresh_token
+from ...utils.auth import get_current_user
+from ...utils.rate_limit import auth_rate_limit
+from ..schemas import UserCreate, User as UserSchema, Token, TokenRefresh
 
 router = APIRouter(
     prefix="/auth",
     tags=["authentication"],
+    dependencies=[Depends(auth_rate_limit)],
 )
 
 @router.post("/register", response_model=UserSchema, status_code=status.HTTP_201_CREATED)
@@ -58,7 +60,6 @@ def register(user_data: UserCreate, db: Session = Depends(get_db)) -> Any:
     # Add user to database
     db.add(user)
     db.commit()
-    db.refresh(user)
     
     return user
 
@@ -68,14 +69,14 @@ def login(
     db: Session = Depends(get_db),
 ) -> Any:
     """
-    Get access token for user.
+    Get access and refresh tokens for user, starting a new session.
     
     Args:
         form_data: Form data with username and password
         db: Database session
         
     Returns:
-        Token: Access token
+        Token: Access and refresh tokens
         
     Raises:
         HTTPException: If username or password is incorrect
@@ -99,9 +100,56 @@ def login(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    # Create access token
-    access_token = create_access_token(
-        data={"sub": str(user.id)},
+    return issue_tokens(user.id)
+
+@router.post("/refresh", response_model=Token)
+def refresh(refresh_data: TokenRefresh, db: Session = Depends(get_db)) -> Any:
+    """
+    Exchange a refresh token for new access and refresh tokens.
+    
+    The refresh token is single use. Presenting one that was already
+    exchanged revokes its session.
+    
+    Args:
+        refresh_data: Refresh token
+        db: Database session
+        
+    Returns:
+        Token: New access and refresh tokens
+        
+    Raises:
+        HTTPException: If the refresh token is invalid or the user inactive
+    """
+    credentials_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Invalid refresh token",
+        headers={"WWW-Authenticate": "Bearer"},
     )
     
-    return {"access_token": access_token, "token_type": "bearer"}
\ No newline at end of file
+    session = rotate_refresh_token(refresh_data.refresh_token)
+    if session is None:
+        raise credentials_exception
+    user_id, session_id = session
+    
+    user = db.query(User.is_active).filter(User.id == user_id).first()
+    if not user or not user.is_active:
+        revoke_sessions([session_id])
+        raise credentials_exception
+    
+    return issue_tokens(user_id, session_id)
+
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+def logout(current_user: dict = Depends(get_current_user)) -> Response:
+    """
+    End the current session.
+    
+    Its access and refresh tokens stop working in every API process.
+    
+    Args:
+        current_user: Current user from token
+        
+    Returns:
+        Response: Empty response
+    """
+    revoke_sessions([current_user["sid"]])
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
\ No newline at end of file
@@ -1,11 +1,18 @@
-from typing import Any, List
+from typing import Any, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Response, status
+from redis.exceptions import RedisError
 from sqlalchemy.orm import Session
 
+from ...config.settings import settings
 from ...db.database import get_db
-from ...db.models import Badge, UserBadge, User
+from ...db.models import ActivityKind, Badge, UserBadge, User
+from ...services import events
+from ...services.activity import record_activity
+from ...services.badge_metadata import get_metadata, get_metadata_version
+from ...services.outbox import enqueue_event
 from ...utils.auth import get_current_user
+from ...utils.rate_limit import write_rate_limit_ip, write_rate_limit_user
 from ..schemas import (
     Badge as BadgeSchema,
     BadgeCreate,
@@ -19,6 +26,7 @@ from ..schemas import (
 router = APIRouter(
     prefix="/badges",
     tags=["badges"],
+    dependencies=[Depends(write_rate_limit_user), Depends(write_rate_limit_ip)],
 )
 
 @router.post("/", response_model=BadgeSchema, status_code=status.HTTP_201_CREATED)
@@ -41,7 +49,6 @@ def create_badge(
     badge = Badge(**badge_data.dict())
     db.add(badge)
     db.commit()
-    db.refresh(badge)
     return badge
 
 @router.get("/", response_model=List[BadgeSchema])
@@ -90,6 +97,94 @@ def get_badge(
         )
     return badge
 
+def _metadata_response(body: Optional[bytes], etag: str, cache_control: str, if_none_match: Optional[str]) -> Response:
+    """Serve a metadata document, or 304 if the client has it already."""
+    headers = {"ETag": f'"{etag}"', "Cache-Control": cache_control}
+    if if_none_match and f'"{etag}"' in (tag.strip().removeprefix("W/") for tag in if_none_match.split(",")):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+@router.get("/metadata/{token_id}")
+def get_badge_metadata(
+    token_id: int,
+    if_none_match: Optional[str] = Header(None),
+) -> Response:
+    """
+    Get the ERC-721 metadata of a soul-bound badge token (its token URI).
+    
+    Served from the precomputed metadata store without querying the
+    database. ``Content-Location`` names the immutable URL of this version.
+    
+    Args:
+        token_id: Token ID
+        if_none_match: ETags the client has cached
+        
+    Returns:
+        Response: Metadata JSON, or 304 if unchanged
+        
+    Raises:
+        HTTPException: If the token has no metadata or the store is unavailable
+    """
+    try:
+        metadata = get_metadata(token_id)
+    except RedisError:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Badge metadata unavailable",
+        )
+    if metadata is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Badge token not found",
+        )
+    
+    body, etag = metadata
+    response = _metadata_response(
+        body,
+        etag,
+        f"public, max-age={settings.BADGE_METADATA_MAX_AGE}, "
+        f"stale-while-revalidate={settings.BADGE_METADATA_STALE_WHILE_REVALIDATE}",
+        if_none_match,
+    )
+    response.headers["Content-Location"] = f"{settings.API_PREFIX}{router.prefix}/metadata/{token_id}/{etag}"
+    return response
+
+@router.get("/metadata/{token_id}/{content_hash}")
+def get_badge_metadata_version(
+    token_id: int,
+    content_hash: str,
+    if_none_match: Optional[str] = Header(None),
+) -> Response:
+    """
+    Get one version of a badge token's metadata by content hash.
+    
+    A version never changes, so it is cached as immutable.
+    
+    Args:
+        token_id: Token ID
+        content_hash: Content hash of the version, its ETag
+        if_none_match: ETags the client has cached
+        
+    Returns:
+        Response: Metadata JSON, or 304 if cached
+        
+    Raises:
+        HTTPException: If the version is unknown or the store is unavailable
+    """
+    try:
+        body = get_metadata_version(token_id, content_hash)
+    except RedisError:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Badge metadata unavailable",
+        )
+    if body is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Badge metadata version not found",
+        )
+    return _metadata_response(body, content_hash, "public, max-age=31536000, immutable", if_none_match)
+
 @router.put("/{badge_id}", response_model=BadgeSchema)
 def update_badge(
     badge_id: int,
@@ -124,8 +219,9 @@ def update_badge(
     for field, value in update_data.items():
         setattr(badge, field, value)
     
+    enqueue_event(db, events.BADGE_UPDATED, {"badge_id": badge.id})
+    
     db.commit()
-    db.refresh(badge)
     
     return badge
 
@@ -184,8 +280,28 @@ def award_badge_to_user(
     user_badge = UserBadge(**user_badge_data.dict())
     
     db.add(user_badge)
+    db.flush()
+    
+    enqueue_event(
+        db,
+        events.BADGE_AWARDED,
+        {
+            "user_badge_id": user_badge.id,
+            "user_id": user_badge.user_id,
+            "badge_id": user_badge.badge_id,
+        },
+        user_id=user_badge.user_id,
+    )
+    record_activity(
+        db,
+        ActivityKind.BADGE,
+        user_badge.user_id,
+        user_badge.id,
+        user_badge.created_at,
+        data={"badge_id": badge.id, "badge_name": badge.name},
+    )
+    
     db.commit()
-    db.refresh(user_badge)
     
     return user_badge
 
@@ -265,11 +381,23 @@ def update_user_badge(
         )
     
     # Update user badge data
+    previous_token_id = user_badge.token_id
     update_data = user_badge_data.dict(exclude_unset=True)
     for field, value in update_data.items():
         setattr(user_badge, field, value)
     
+    enqueue_event(
+        db,
+        events.USER_BADGE_UPDATED,
+        {
+            "user_badge_id": user_badge.id,
+            "user_id": user_badge.user_id,
+            "badge_id": user_badge.badge_id,
+            "previous_token_id": previous_token_id,
+        },
+        user_id=user_badge.user_id,
+    )
+    
     db.commit()
-    db.refresh(user_badge)
     
     return user_badge
\ No newline at end of file
@@ -0,0 +1,146 @@
+import asyncio
+import json
+import logging
+from typing import Any, Optional
+from urllib.parse import urlsplit
+
+from fastapi import APIRouter, Depends, Request, status
+from starlette.concurrency import run_in_threadpool
+
+from ...config.settings import settings
+from ...db.database import SHARED_SESSION_STATE, SharedSession
+from ...utils.asgi import call_asgi
+from ...utils.auth import PRINCIPAL_STATE, get_optional_user
+from ..schemas import BatchItem, BatchItemResult, BatchRequest, BatchResponse
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(tags=["batch"])
+
+# Paths that cannot be batched: the batch endpoint itself, long-lived streams
+# and administrative endpoints
+EXCLUDED_PREFIXES = ("/batch", "/events/stream", "/debug")
+
+# Scope entries inherited by sub-requests from the batch request
+INHERITED_SCOPE = (
+    "type", "asgi", "http_version", "scheme", "server", "client", "root_path",
+    "app", "starlette.exception_handlers",
+)
+
+# Response headers passed through to the caller
+FORWARDED_HEADERS = ("content-type", "etag", "cache-control", "retry-after", "location")
+
+def _error(item: BatchItem, status_code: int, detail: str) -> BatchItemResult:
+    """Result for a sub-request rejected without being run."""
+    return BatchItemResult(id=item.id, status=status_code, body={"detail": detail})
+
+async def _run_item(
+    request: Request,
+    item: BatchItem,
+    state: dict,
+    shared_session: SharedSession,
+) -> BatchItemResult:
+    """
+    Run one sub-request through the API router.
+    
+    Args:
+        request: Batch request
+        item: Sub-request
+        state: Request state shared by the sub-requests
+        shared_session: Database session of the batch, held while running
+        
+    Returns:
+        BatchItemResult: Sub-response
+    """
+    if item.method.upper() != "GET":
+        return _error(item, status.HTTP_405_METHOD_NOT_ALLOWED, "Only GET requests can be batched")
+    
+    url = urlsplit(item.path)
+    if url.path.startswith(EXCLUDED_PREFIXES):
+        return _error(item, status.HTTP_400_BAD_REQUEST, "Path cannot be batched")
+    
+    path = f"{settings.API_PREFIX}{url.path}"
+    headers = [
+        (name.lower().encode("latin-1"), value.encode("latin-1"))
+        for name, value in item.headers.items()
+        if name.lower() != "authorization"
+    ]
+    authorization = request.headers.get("authorization")
+    if authorization:
+        headers.append((b"authorization", authorization.encode("latin-1")))
+    
+    scope = {key: request.scope[key] for key in INHERITED_SCOPE if key in request.scope}
+    scope.update({
+        "method": "GET",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": url.query.encode(),
+        "headers": headers,
+        "state": state,
+    })
+    
+    # Dispatch to the router, skipping the middleware stack the batch
+    # request already went through
+    async with shared_session.lock:
+        try:
+            response = await call_asgi(request.app.router, scope)
+        except Exception:
+            logger.exception("Batched request to %s failed", url.path)
+            return _error(item, status.HTTP_500_INTERNAL_SERVER_ERROR, "Internal server error")
+    
+    body: Any = None
+    if response.body:
+        if response.header("content-type").startswith("application/json"):
+            body = json.loads(response.body)
+        else:
+            body = response.body.decode("utf-8", errors="replace")
+    
+    return BatchItemResult(
+        id=item.id,
+        status=response.status,
+        headers={
+            name: response.header(name)
+            for name in FORWARDED_HEADERS
+            if response.header(name)
+        },
+        body=body,
+    )
+
+@router.post("/batch", response_model=BatchResponse)
+async def batch(
+    batch_request: BatchRequest,
+    request: Request,
+    current_user: Optional[dict] = Depends(get_optional_user),
+) -> Any:
+    """
+    Run several API reads in one round trip.
+    
+    Each sub-request is a GET against an API path (without the API prefix),
+    dispatched in-process to the API router. The token of the batch request
+    is validated once and applies to every sub-request, and all of them share
+    one database session, so they run one at a time (see ``SharedSession``).
+    Their responses are returned in request order, each with its own status
+    code.
+    
+    Args:
+        batch_request: Sub-requests, at most ``BATCH_MAX_REQUESTS``
+        request: Batch request
+        current_user: Current user from token, None for anonymous batches
+        
+    Returns:
+        BatchResponse: Sub-responses
+    """
+    shared_session = SharedSession()
+    state = {SHARED_SESSION_STATE: shared_session}
+    if current_user is not None:
+        state[PRINCIPAL_STATE] = current_user
+    
+    try:
+        responses = await asyncio.gather(*(
+            _run_item(request, item, state, shared_session)
+            for item in batch_request.requests
+        ))
+    finally:
+        await run_in_threadpool(shared_session.close)
+    
+    return {"responses": responses}
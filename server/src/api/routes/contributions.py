@@ -1,23 +1,83 @@
+from datetime import datetime
 from typing import Any, List
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select, update
+from sqlalchemy.orm import Query, Session
 
+from ...config.settings import settings
 from ...db.database import get_db
-from ...db.models import Contribution, User, Project, Task
-from ...utils.auth import get_current_user
+from ...db.models import (
+    ActivityKind, Contribution, ContributionStatus, ContributionType,
+    User, Project, Task,
+)
+from ...services import events
+from ...services.activity import record_activity
+from ...services.archive import archived_contributions
+from ...services.outbox import enqueue_event
+from ...services.rewards import create_reward_tokens, token_amount, token_amount_expr
+from ...services.summary import mark_stale
+from ...utils.auth import get_current_admin, get_current_user
+from ...utils.fields import FieldSet, SparseFields
+from ...utils.rate_limit import write_rate_limit_ip, write_rate_limit_user
 from ..schemas import (
     Contribution as ContributionSchema,
     ContributionCreate,
     ContributionUpdate,
     ContributionWithDetails,
+    ContributionStatusEnum,
+    ContributionVerifyBatch,
+    ContributionVerifyBatchResult,
 )
 
 router = APIRouter(
     prefix="/contributions",
     tags=["contributions"],
+    dependencies=[Depends(write_rate_limit_user), Depends(write_rate_limit_ip)],
 )
 
+contribution_fields = SparseFields(ContributionSchema, Contribution)
+contribution_detail_fields = SparseFields(ContributionWithDetails, Contribution)
+
+def _list_contributions(
+    query: Query,
+    fields: FieldSet,
+    skip: int,
+    limit: int,
+    include_archived: bool,
+    **filters: Any,
+) -> Any:
+    """
+    Page through contributions, continuing into the archive if requested.
+    
+    Contributions are listed newest first, by descending id. Archived
+    contributions are older, so they have lower ids than every contribution
+    still in the database and come after them in that order: a page is
+    filled from the archive, also newest first, once the database rows run
+    out.
+    
+    Args:
+        query: Contribution query, already filtered by ``filters``
+        fields: Fields to return
+        skip: Number of contributions to skip
+        limit: Maximum number of contributions to return
+        include_archived: Whether to include archived contributions
+        filters: Column values the archived contributions must equal
+        
+    Returns:
+        Any: Rendered contributions
+    """
+    contributions = fields.apply(query).order_by(Contribution.id.desc()).offset(skip).limit(limit).all()
+    if include_archived and len(contributions) < limit:
+        # Rows skipped in the database count against skip only if the page
+        # had none left
+        offset = max(skip - query.count(), 0) if not contributions else 0
+        columns = fields.names if fields.selected else None
+        contributions += archived_contributions(
+            columns, offset, limit - len(contributions), descending=True, **filters,
+        )
+    return fields.render(contributions)
+
 @router.post("/", response_model=ContributionSchema, status_code=status.HTTP_201_CREATED)
 def create_contribution(
     contribution_data: ContributionCreate,
@@ -67,8 +127,36 @@ def create_contribution(
     contribution = Contribution(**contribution_data.dict())
     
     db.add(contribution)
+    db.flush()
+    
+    enqueue_event(
+        db,
+        events.CONTRIBUTION_CREATED,
+        {
+            "contribution_id": contribution.id,
+            "user_id": contribution.user_id,
+            "project_id": contribution.project_id,
+            "type": contribution.type.value,
+            "status": contribution.status.value,
+        },
+        user_id=contribution.user_id,
+        project_id=contribution.project_id,
+    )
+    record_activity(
+        db,
+        ActivityKind.CONTRIBUTION,
+        contribution.user_id,
+        contribution.id,
+        contribution.created_at,
+        project_id=contribution.project_id,
+        data={
+            "title": contribution.title,
+            "type": contribution.type.value,
+            "value": contribution.value,
+        },
+    )
+    
     db.commit()
-    db.refresh(contribution)
     
     return contribution
 
@@ -76,6 +164,8 @@ def create_contribution(
 def get_contributions(
     skip: int = 0,
     limit: int = 100,
+    include_archived: bool = False,
+    fields: FieldSet = Depends(contribution_fields),
     db: Session = Depends(get_db),
 ) -> Any:
     """
@@ -84,19 +174,21 @@ def get_contributions(
     Args:
         skip: Number of contributions to skip
         limit: Maximum number of contributions to return
+        include_archived: Whether to include contributions moved to the archive
         db: Database session
         
     Returns:
         List[Contribution]: List of contributions
     """
-    contributions = db.query(Contribution).offset(skip).limit(limit).all()
-    return contributions
+    return _list_contributions(db.query(Contribution), fields, skip, limit, include_archived)
 
 @router.get("/user/{user_id}", response_model=List[ContributionSchema])
 def get_user_contributions(
     user_id: int,
     skip: int = 0,
     limit: int = 100,
+    include_archived: bool = False,
+    fields: FieldSet = Depends(contribution_fields),
     db: Session = Depends(get_db),
 ) -> Any:
     """
@@ -106,6 +198,7 @@ def get_user_contributions(
         user_id: User ID
         skip: Number of contributions to skip
         limit: Maximum number of contributions to return
+        include_archived: Whether to include contributions moved to the archive
         db: Database session
         
     Returns:
@@ -115,27 +208,29 @@ def get_user_contributions(
         HTTPException: If user not found
     """
     # Check if user exists
-    user = db.query(User).filter(User.id == user_id).first()
+    user = db.query(User.id).filter(User.id == user_id).first()
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found",
         )
     
-    contributions = (
-        db.query(Contribution)
-        .filter(Contribution.user_id == user_id)
-        .offset(skip)
-        .limit(limit)
-        .all()
+    return _list_contributions(
+        db.query(Contribution).filter(Contribution.user_id == user_id),
+        fields,
+        skip,
+        limit,
+        include_archived,
+        user_id=user_id,
     )
-    return contributions
 
 @router.get("/project/{project_id}", response_model=List[ContributionSchema])
 def get_project_contributions(
     project_id: int,
     skip: int = 0,
     limit: int = 100,
+    include_archived: bool = False,
+    fields: FieldSet = Depends(contribution_fields),
     db: Session = Depends(get_db),
 ) -> Any:
     """
@@ -145,6 +240,7 @@ def get_project_contributions(
         project_id: Project ID
         skip: Number of contributions to skip
         limit: Maximum number of contributions to return
+        include_archived: Whether to include contributions moved to the archive
         db: Database session
         
     Returns:
@@ -154,25 +250,26 @@ def get_project_contributions(
         HTTPException: If project not found
     """
     # Check if project exists
-    project = db.query(Project).filter(Project.id == project_id).first()
+    project = db.query(Project.id).filter(Project.id == project_id).first()
     if not project:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Project not found",
         )
     
-    contributions = (
-        db.query(Contribution)
-        .filter(Contribution.project_id == project_id)
-        .offset(skip)
-        .limit(limit)
-        .all()
+    return _list_contributions(
+        db.query(Contribution).filter(Contribution.project_id == project_id),
+        fields,
+        skip,
+        limit,
+        include_archived,
+        project_id=project_id,
     )
-    return contributions
 
 @router.get("/{contribution_id}", response_model=ContributionWithDetails)
 def get_contribution(
     contribution_id: int,
+    fields: FieldSet = Depends(contribution_detail_fields),
     db: Session = Depends(get_db),
 ) -> Any:
     """
@@ -180,6 +277,7 @@ def get_contribution(
     
     Args:
         contribution_id: Contribution ID
+        fields: Fields to return, all if omitted
         db: Database session
         
     Returns:
@@ -188,31 +286,163 @@ def get_contribution(
     Raises:
         HTTPException: If contribution not found
     """
-    contribution = db.query(Contribution).filter(Contribution.id == contribution_id).first()
+    contribution = (
+        fields.apply(
+            db.query(Contribution),
+            Contribution.user_id,
+            Contribution.project_id,
+            Contribution.task_id,
+        )
+        .filter(Contribution.id == contribution_id)
+        .first()
+    )
     if not contribution:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Contribution not found",
         )
     
-    # Get user and project names
-    user = db.query(User).filter(User.id == contribution.user_id).first()
-    project = db.query(Project).filter(Project.id == contribution.project_id).first()
+    # Get user and project names, unless excluded by the field selection
+    details = {}
+    if fields.wants("user_name"):
+        user = db.query(User.username).filter(User.id == contribution.user_id).first()
+        details["user_name"] = user.username if user else ""
+    if fields.wants("project_name"):
+        project = db.query(Project.name).filter(Project.id == contribution.project_id).first()
+        details["project_name"] = project.name if project else ""
+    
+    # Add task title if task_id is provided
+    if fields.wants("task_title"):
+        task = None
+        if contribution.task_id:
+            task = db.query(Task.title).filter(Task.id == contribution.task_id).first()
+        details["task_title"] = task.title if task else None
+    
+    if fields.selected:
+        return fields.render(contribution, **details)
     
     # Create response with details
-    result = ContributionWithDetails(
-        **contribution.__dict__,
-        user_name=user.username if user else "",
-        project_name=project.name if project else "",
+    return ContributionWithDetails(**contribution.__dict__, **details)
+
+@router.post("/verify-batch", response_model=ContributionVerifyBatchResult)
+def verify_contributions_batch(
+    batch: ContributionVerifyBatch,
+    current_user: dict = Depends(get_current_admin),
+    db: Session = Depends(get_db),
+) -> Any:
+    """
+    Verify or reject pending contributions in bulk. Requires administrator
+    privileges.
+    
+    The selected contributions are updated with a single set-based UPDATE.
+    When verifying, the database computes each token amount from the
+    contribution type and value, and the matching ``Token`` rows and status
+    change events are inserted in the same transaction. At most
+    ``CONTRIBUTION_VERIFY_BATCH_MAX`` contributions are processed per call;
+    ``has_more`` tells the caller to repeat the request for the rest.
+    
+    Args:
+        batch: Target status and contribution ids or filter
+        current_user: Current administrator from token
+        db: Database session
+        
+    Returns:
+        ContributionVerifyBatchResult: Summary of the changes
+        
+    Raises:
+        HTTPException: If the target status is pending or no selection is given
+    """
+    if batch.status == ContributionStatusEnum.PENDING:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Target status must be verified or rejected",
+        )
+    
+    criteria = [Contribution.status == ContributionStatus.PENDING]
+    if batch.ids:
+        criteria.append(Contribution.id.in_(batch.ids))
+    if batch.project_id is not None:
+        criteria.append(Contribution.project_id == batch.project_id)
+    if batch.user_id is not None:
+        criteria.append(Contribution.user_id == batch.user_id)
+    if batch.task_id is not None:
+        criteria.append(Contribution.task_id == batch.task_id)
+    if batch.type is not None:
+        criteria.append(Contribution.type == ContributionType(batch.type.value))
+    if batch.created_before is not None:
+        criteria.append(Contribution.created_at < batch.created_before)
+    if len(criteria) == 1:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Provide contribution ids or at least one filter",
+        )
+    
+    # Lock the selected rows so that concurrent batches never process the same
+    # contribution twice; rows locked by another batch are left for the next call
+    limit = settings.CONTRIBUTION_VERIFY_BATCH_MAX
+    selected = (
+        select(Contribution.id)
+        .where(*criteria)
+        .order_by(Contribution.id)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+        .scalar_subquery()
     )
     
-    # Add task title if task_id is provided
-    if contribution.task_id:
-        task = db.query(Task).filter(Task.id == contribution.task_id).first()
-        if task:
-            result.task_title = task.title
+    new_status = ContributionStatus(batch.status.value)
+    now = datetime.utcnow()
+    values = {"status": new_status, "updated_at": now}
+    if new_status == ContributionStatus.VERIFIED:
+        values["token_amount"] = token_amount_expr()
+    
+    rows = db.execute(
+        update(Contribution)
+        .where(Contribution.id.in_(selected))
+        .values(**values)
+        .returning(
+            Contribution.id,
+            Contribution.user_id,
+            Contribution.project_id,
+            Contribution.token_amount,
+        )
+        .execution_options(synchronize_session=False)
+    ).all()
+    rows.sort(key=lambda row: row.id)
+    
+    tokens = []
+    if new_status == ContributionStatus.VERIFIED:
+        tokens = create_reward_tokens(db, rows, now)
+    
+    # The UPDATE bypasses the unit of work, so the cached summaries it
+    # changes are reported explicitly
+    mark_stale(db, {row.user_id for row in rows})
     
-    return result
+    for row in rows:
+        enqueue_event(
+            db,
+            events.CONTRIBUTION_STATUS_CHANGED,
+            {
+                "contribution_id": row.id,
+                "user_id": row.user_id,
+                "project_id": row.project_id,
+                "status": new_status.value,
+                "previous_status": ContributionStatus.PENDING.value,
+                "token_amount": row.token_amount,
+            },
+            user_id=row.user_id,
+            project_id=row.project_id,
+        )
+    
+    db.commit()
+    
+    return {
+        "status": new_status.value,
+        "updated": len(rows),
+        "contribution_ids": [row.id for row in rows],
+        "tokens_created": len(tokens),
+        "token_amount_total": sum(token["amount"] for token in tokens),
+        "has_more": len(rows) == limit,
+    }
 
 @router.put("/{contribution_id}", response_model=ContributionSchema)
 def update_contribution(
@@ -224,6 +454,12 @@ def update_contribution(
     """
     Update contribution.
     
+    Changing the status or the token amount requires administrator
+    privileges. Verifying a pending contribution rewards it like
+    ``/verify-batch``: its token amount is computed from its type and value
+    and its pending token is created. A verified contribution keeps its
+    status, so it is never rewarded twice.
+    
     Args:
         contribution_id: Contribution ID
         contribution_data: Contribution data to update
@@ -234,21 +470,64 @@ def update_contribution(
         Contribution: Updated contribution
         
     Raises:
-        HTTPException: If contribution not found
+        HTTPException: If contribution not found, the user may not change
+            its status or token amount, or it is already verified
     """
-    contribution = db.query(Contribution).filter(Contribution.id == contribution_id).first()
+    update_data = contribution_data.dict(exclude_unset=True)
+    changes_reward = "status" in update_data or "token_amount" in update_data
+    if changes_reward:
+        get_current_admin(current_user, db)
+    
+    query = db.query(Contribution).filter(Contribution.id == contribution_id)
+    if changes_reward:
+        # Concurrent updates wait for each other, so only one sees the
+        # contribution pending and rewards it
+        query = query.with_for_update()
+    contribution = query.first()
     if not contribution:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Contribution not found",
         )
     
+    previous_status = contribution.status
+    if (
+        previous_status == ContributionStatus.VERIFIED
+        and update_data.get("status", previous_status) != ContributionStatus.VERIFIED
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="A verified contribution cannot change status",
+        )
+    
     # Update contribution data
-    update_data = contribution_data.dict(exclude_unset=True)
     for field, value in update_data.items():
         setattr(contribution, field, value)
     
+    rewarded = (
+        previous_status == ContributionStatus.PENDING
+        and contribution.status == ContributionStatus.VERIFIED
+    )
+    if rewarded:
+        contribution.token_amount = token_amount(contribution.type, contribution.value)
+        create_reward_tokens(db, [contribution], datetime.utcnow())
+    
+    if contribution.status != previous_status:
+        enqueue_event(
+            db,
+            events.CONTRIBUTION_STATUS_CHANGED,
+            {
+                "contribution_id": contribution.id,
+                "user_id": contribution.user_id,
+                "project_id": contribution.project_id,
+                "status": contribution.status.value,
+                "previous_status": previous_status.value,
+                "token_amount": contribution.token_amount,
+            },
+            user_id=contribution.user_id,
+            project_id=contribution.project_id,
+        )
+    
     db.commit()
-    db.refresh(contribution)
     
     return contribution
\ No newline at end of file
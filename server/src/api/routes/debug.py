@@ -0,0 +1,74 @@
+import os
+import time
+from typing import Any
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import PlainTextResponse
+
+from ...config.settings import settings
+from ...utils.auth import get_current_admin
+from ...utils.profiler import ProfilerBusy, profile
+from ...worker import celery
+
+router = APIRouter(
+    prefix="/debug",
+    tags=["debug"],
+    dependencies=[Depends(get_current_admin)],
+)
+
+@router.get("/profile", response_class=PlainTextResponse)
+async def profile_api_worker(
+    seconds: float = Query(10.0, gt=0, le=settings.PROFILER_MAX_SECONDS),
+) -> Any:
+    """
+    Profile the API worker process serving this request.
+    
+    Samples every thread of the process, including the event loop, while it
+    keeps serving traffic, and returns the stacks in collapsed format
+    (``flamegraph.pl`` / speedscope input).
+    
+    Args:
+        seconds: Sampling duration
+        
+    Returns:
+        PlainTextResponse: Collapsed stacks as a downloadable file
+        
+    Raises:
+        HTTPException: If a profiling session is already running on the node
+    """
+    try:
+        stacks = await run_in_threadpool(profile, seconds)
+    except ProfilerBusy as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e),
+        )
+    
+    filename = f"api-{os.getpid()}-{int(time.time())}.collapsed"
+    return PlainTextResponse(
+        stacks,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+@router.post("/profile/celery")
+def profile_celery_workers(
+    seconds: float = Query(10.0, gt=0, le=settings.PROFILER_MAX_SECONDS),
+) -> Any:
+    """
+    Ask every Celery worker to profile its pool processes.
+    
+    Each worker writes collapsed-stack files to its ``PROFILER_OUTPUT_DIR``.
+    
+    Args:
+        seconds: Sampling duration
+        
+    Returns:
+        list: Reply of each worker
+    """
+    return celery.control.broadcast(
+        "profile",
+        arguments={"seconds": seconds},
+        reply=True,
+        timeout=2.0,
+    )
@@ -0,0 +1,61 @@
+from typing import List, Optional
+
+from fastapi import APIRouter, Header, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+
+from ...config.settings import settings
+from ...services.events import project_channel, stream_events, user_channel
+
+router = APIRouter(
+    prefix="/events",
+    tags=["events"],
+)
+
+@router.get("/stream")
+async def event_stream(
+    user_id: List[int] = Query([]),
+    project_id: List[int] = Query([]),
+    last_event_id: Optional[str] = Query(None),
+    last_event_id_header: Optional[str] = Header(None, alias="Last-Event-ID"),
+) -> StreamingResponse:
+    """
+    Stream contribution, badge and token events as Server-Sent Events.
+    
+    Browsers reconnect automatically and send the ``Last-Event-ID`` header,
+    so missed events are replayed instead of forcing a full refetch. If the
+    missed events are no longer available a ``reset`` event is sent first.
+    
+    Args:
+        user_id: Users to subscribe to
+        project_id: Projects to subscribe to
+        last_event_id: Last event ID received, for clients that cannot set headers
+        last_event_id_header: Last event ID sent by the browser on reconnect
+        
+    Returns:
+        StreamingResponse: Event stream
+        
+    Raises:
+        HTTPException: If no or too many channels are requested
+    """
+    channels = [user_channel(uid) for uid in user_id]
+    channels += [project_channel(pid) for pid in project_id]
+    
+    if not channels:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Subscribe to at least one user_id or project_id",
+        )
+    if len(channels) > settings.EVENTS_MAX_CHANNELS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {settings.EVENTS_MAX_CHANNELS} channels per stream",
+        )
+    
+    return StreamingResponse(
+        stream_events(channels, last_event_id_header or last_event_id),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",
+        },
+    )
@@ -6,6 +6,8 @@ from sqlalchemy.orm import Session
 from ...db.database import get_db
 from ...db.models import Project, Task
 from ...utils.auth import get_current_user
+from ...utils.fields import FieldSet, SparseFields
+from ...utils.rate_limit import write_rate_limit_ip, write_rate_limit_user
 from ..schemas import (
     Project as ProjectSchema,
     ProjectCreate,
@@ -19,8 +21,12 @@ from ..schemas import (
 router = APIRouter(
     prefix="/projects",
     tags=["projects"],
+    dependencies=[Depends(write_rate_limit_user), Depends(write_rate_limit_ip)],
 )
 
+project_fields = SparseFields(ProjectSchema, Project)
+project_detail_fields = SparseFields(ProjectWithTasks, Project)
+
 @router.post("/", response_model=ProjectSchema, status_code=status.HTTP_201_CREATED)
 def create_project(
     project_data: ProjectCreate,
@@ -41,13 +47,13 @@ def create_project(
     project = Project(**project_data.dict())
     db.add(project)
     db.commit()
-    db.refresh(project)
     return project
 
 @router.get("/", response_model=List[ProjectSchema])
 def get_projects(
     skip: int = 0,
     limit: int = 100,
+    fields: FieldSet = Depends(project_fields),
     db: Session = Depends(get_db),
 ) -> Any:
     """
@@ -56,17 +62,19 @@ def get_projects(
     Args:
         skip: Number of projects to skip
         limit: Maximum number of projects to return
+        fields: Fields to return, all if omitted
         db: Database session
         
     Returns:
         List[Project]: List of projects
     """
-    projects = db.query(Project).offset(skip).limit(limit).all()
-    return projects
+    projects = fields.apply(db.query(Project)).offset(skip).limit(limit).all()
+    return fields.render(projects)
 
 @router.get("/{project_id}", response_model=ProjectWithTasks)
 def get_project(
     project_id: int,
+    fields: FieldSet = Depends(project_detail_fields),
     db: Session = Depends(get_db),
 ) -> Any:
     """
@@ -74,6 +82,7 @@ def get_project(
     
     Args:
         project_id: Project ID
+        fields: Fields to return, all if omitted
         db: Database session
         
     Returns:
@@ -82,13 +91,13 @@ def get_project(
     Raises:
         HTTPException: If project not found
     """
-    project = db.query(Project).filter(Project.id == project_id).first()
+    project = fields.apply(db.query(Project)).filter(Project.id == project_id).first()
     if not project:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Project not found",
         )
-    return project
+    return fields.render(project)
 
 @router.put("/{project_id}", response_model=ProjectSchema)
 def update_project(
@@ -125,7 +134,6 @@ def update_project(
         setattr(project, field, value)
     
     db.commit()
-    db.refresh(project)
     
     return project
 
@@ -165,7 +173,6 @@ def create_task(
     
     db.add(task)
     db.commit()
-    db.refresh(task)
     
     return task
 
@@ -284,6 +291,5 @@ def update_task(
         setattr(task, field, value)
     
     db.commit()
-    db.refresh(task)
     
     return task
\ No newline at end of file
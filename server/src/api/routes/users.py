@@ -1,18 +1,35 @@
-from typing import Any, List
+import logging
+from typing import Any, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+import requests
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
+from ...config.settings import settings
 from ...db.database import get_db
+from ...blockchain.rpc import RpcError
 from ...db.models import User
+from ...services.activity import get_timeline
+from ...services.chain import get_wallet_events
+from ...services.onchain import get_onchain_state
+from ...services.sessions import revoke_user_sessions
+from ...services.summary import build_summary, cache_summary, get_cached_summary
 from ...utils.auth import get_current_user
-from ..schemas import User as UserSchema, UserUpdate
+from ...utils.fields import FieldSet, SparseFields
+from ...utils.rate_limit import write_rate_limit_ip, write_rate_limit_user
+from ..schemas import ActivityPage, ChainEventPage, OnchainState, User as UserSchema, UserSummary, UserUpdate
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(
     prefix="/users",
     tags=["users"],
+    dependencies=[Depends(write_rate_limit_user), Depends(write_rate_limit_ip)],
 )
 
+user_fields = SparseFields(UserSchema, User)
+
 @router.get("/me", response_model=UserSchema)
 def get_current_user_info(
     current_user: dict = Depends(get_current_user),
@@ -64,7 +81,8 @@ def update_current_user(
     update_data = user_data.dict(exclude_unset=True)
     
     # Handle password update separately
-    if "password" in update_data:
+    password_changed = "password" in update_data
+    if password_changed:
         user.set_password(update_data.pop("password"))
     
     # Update other fields
@@ -72,13 +90,17 @@ def update_current_user(
         setattr(user, field, value)
     
     db.commit()
-    db.refresh(user)
+    
+    # Sign out every session, including this one
+    if password_changed:
+        revoke_user_sessions(user.id)
     
     return user
 
 @router.get("/{user_id}", response_model=UserSchema)
 def get_user(
     user_id: int,
+    fields: FieldSet = Depends(user_fields),
     db: Session = Depends(get_db),
 ) -> Any:
     """
@@ -86,6 +108,7 @@ def get_user(
     
     Args:
         user_id: User ID
+        fields: Fields to return, all if omitted
         db: Database session
         
     Returns:
@@ -94,18 +117,170 @@ def get_user(
     Raises:
         HTTPException: If user not found
     """
-    user = db.query(User).filter(User.id == user_id).first()
+    user = fields.apply(db.query(User)).filter(User.id == user_id).first()
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found",
         )
-    return user
+    return fields.render(user)
+
+@router.get("/{user_id}/summary", response_model=UserSummary)
+def get_user_summary(
+    user_id: int,
+    db: Session = Depends(get_db),
+) -> Any:
+    """
+    Get everything a profile page shows about a user in one call.
+    
+    Returns the profile, contribution counts by type and status, visible
+    badges with details and token balances. The summary is built with two
+    queries and cached until one of the user's records changes.
+    
+    Args:
+        user_id: User ID
+        db: Database session
+        
+    Returns:
+        UserSummary: User profile summary
+        
+    Raises:
+        HTTPException: If user not found
+    """
+    summary, stamp = get_cached_summary(user_id)
+    if summary is not None:
+        return summary
+    
+    summary = build_summary(db, user_id)
+    if summary is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found",
+        )
+    
+    summary = UserSummary.model_validate(summary, from_attributes=True).model_dump(mode="json")
+    if stamp is not None:
+        cache_summary(user_id, summary, stamp)
+    return summary
+
+@router.get("/{user_id}/activity", response_model=ActivityPage)
+def get_user_activity(
+    user_id: int,
+    cursor: Optional[str] = None,
+    limit: int = Query(settings.ACTIVITY_PAGE_SIZE, ge=1, le=settings.ACTIVITY_PAGE_MAX),
+    db: Session = Depends(get_db),
+) -> Any:
+    """
+    Get a page of a user's activity timeline, newest first.
+    
+    The page is read from the precomputed timeline with one index range
+    scan; an unknown user simply has an empty timeline.
+    
+    Args:
+        user_id: User ID
+        cursor: ``next_cursor`` of the previous page
+        limit: Maximum number of entries to return
+        db: Database session
+        
+    Returns:
+        ActivityPage: Timeline entries and the cursor of the next page
+        
+    Raises:
+        HTTPException: If the cursor is invalid
+    """
+    try:
+        items, next_cursor = get_timeline(db, user_id, cursor, limit)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
+    return {"items": items, "next_cursor": next_cursor}
+
+@router.get("/{user_id}/chain-events", response_model=ChainEventPage)
+def get_user_chain_events(
+    user_id: int,
+    cursor: Optional[str] = None,
+    limit: int = Query(settings.CHAIN_EVENTS_PAGE_SIZE, ge=1, le=settings.CHAIN_EVENTS_PAGE_MAX),
+    db: Session = Depends(get_db),
+) -> Any:
+    """
+    Get a page of the contract events involving a user's wallet, newest first.
+    
+    Events come from the chain indexer's tables, so the node is not queried;
+    a user without a wallet address has no events.
+    
+    Args:
+        user_id: User ID
+        cursor: ``next_cursor`` of the previous page
+        limit: Maximum number of events to return
+        db: Database session
+        
+    Returns:
+        ChainEventPage: Events and the cursor of the next page
+        
+    Raises:
+        HTTPException: If the user is not found or the cursor is invalid
+    """
+    wallet_address = db.scalar(select(User.wallet_address).where(User.id == user_id))
+    if wallet_address is None and db.get(User, user_id) is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found",
+        )
+    if not wallet_address:
+        return {"items": [], "next_cursor": None}
+    
+    try:
+        items, next_cursor = get_wallet_events(db, wallet_address, cursor, limit)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
+    return {"items": items, "next_cursor": next_cursor}
+
+@router.get("/{user_id}/onchain", response_model=OnchainState)
+def get_user_onchain(
+    user_id: int,
+    db: Session = Depends(get_db),
+) -> Any:
+    """
+    Get a user's wallet balances and owned badge tokens from the chain.
+    
+    Values are read in one batched node request and cached until the next
+    block.
+    
+    Args:
+        user_id: User ID
+        db: Database session
+        
+    Returns:
+        OnchainState: Wallet state at the latest block
+        
+    Raises:
+        HTTPException: If the user is not found or the node is unavailable
+    """
+    try:
+        state = get_onchain_state(db, user_id)
+    except (RpcError, requests.RequestException):
+        logger.warning("Blockchain node unavailable", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Blockchain node unavailable",
+        )
+    if state is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found",
+        )
+    return state
 
 @router.get("/", response_model=List[UserSchema])
 def get_users(
     skip: int = 0,
     limit: int = 100,
+    fields: FieldSet = Depends(user_fields),
     db: Session = Depends(get_db),
 ) -> Any:
     """
@@ -114,10 +289,11 @@ def get_users(
     Args:
         skip: Number of users to skip
         limit: Maximum number of users to return
+        fields: Fields to return, all if omitted
         db: Database session
         
     Returns:
         List[User]: List of users
     """
-    users = db.query(User).offset(skip).limit(limit).all()
-    return users
\ No newline at end of file
+    users = fields.apply(db.query(User)).offset(skip).limit(limit).all()
+    return fields.render(users)
\ No newline at end of file
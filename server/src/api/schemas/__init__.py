@@ -2,7 +2,7 @@
 
 from .user import (
     UserBase, UserCreate, UserUpdate, UserLogin,
-    Token, TokenData, User,
+    Token, TokenRefresh, TokenData, User,
 )
 from .project import (
     ProjectBase, ProjectCreate, ProjectUpdate, Project,
@@ -12,6 +12,7 @@ from .contribution import (
     ContributionTypeEnum, ContributionStatusEnum,
     ContributionBase, ContributionCreate, ContributionUpdate,
     Contribution, ContributionWithDetails,
+    ContributionVerifyBatch, ContributionVerifyBatchResult,
 )
 from .badge import (
     BadgeBase, BadgeCreate, BadgeUpdate, Badge,
@@ -23,11 +24,27 @@ from .token import (
     TokenBase, TokenCreate, TokenUpdate,
     BlockchainToken, TokenWithDetails,
 )
+from .summary import (
+    ContributionStats, TokenBalance, UserSummary,
+)
+from .batch import (
+    BatchItem, BatchRequest, BatchItemResult, BatchResponse,
+)
+from .analytics import (
+    GranularityEnum, DimensionEnum,
+    ContributionSeriesPoint, ContributionSeries,
+)
+from .activity import (
+    ActivityKindEnum, Activity, ActivityPage,
+)
+from .chain import (
+    ChainEventTypeEnum, ChainEvent, ChainEventPage, OnchainState,
+)
 
 __all__ = [
     # User schemas
     "UserBase", "UserCreate", "UserUpdate", "UserLogin",
-    "Token", "TokenData", "User",
+    "Token", "TokenRefresh", "TokenData", "User",
     
     # Project schemas
     "ProjectBase", "ProjectCreate", "ProjectUpdate", "Project",
@@ -37,6 +54,7 @@ __all__ = [
     "ContributionTypeEnum", "ContributionStatusEnum",
     "ContributionBase", "ContributionCreate", "ContributionUpdate",
     "Contribution", "ContributionWithDetails",
+    "ContributionVerifyBatch", "ContributionVerifyBatchResult",
     
     # Badge schemas
     "BadgeBase", "BadgeCreate", "BadgeUpdate", "Badge",
@@ -47,4 +65,20 @@ __all__ = [
     "TokenTypeEnum", "TokenStatusEnum",
     "TokenBase", "TokenCreate", "TokenUpdate",
     "BlockchainToken", "TokenWithDetails",
+    
+    # Summary schemas
+    "ContributionStats", "TokenBalance", "UserSummary",
+    
+    # Batch schemas
+    "BatchItem", "BatchRequest", "BatchItemResult", "BatchResponse",
+    
+    # Analytics schemas
+    "GranularityEnum", "DimensionEnum",
+    "ContributionSeriesPoint", "ContributionSeries",
+    
+    # Activity schemas
+    "ActivityKindEnum", "Activity", "ActivityPage",
+    
+    # Chain schemas
+    "ChainEventTypeEnum", "ChainEvent", "ChainEventPage", "OnchainState",
 ]
\ No newline at end of file
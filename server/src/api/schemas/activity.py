@@ -0,0 +1,35 @@
+from typing import Any, Dict, List, Optional
+from pydantic import BaseModel
+from datetime import datetime
+from enum import Enum
+
+# Activity Kind Enum
+class ActivityKindEnum(str, Enum):
+    """Enum for activity timeline entry kinds."""
+    
+    CONTRIBUTION = "contribution"
+    BADGE = "badge"
+    TOKEN = "token"
+
+# Schema for activity response
+class Activity(BaseModel):
+    """Schema for activity timeline entry response."""
+    
+    id: int
+    kind: ActivityKindEnum
+    subject_id: int
+    project_id: Optional[int] = None
+    occurred_at: datetime
+    data: Dict[str, Any]
+    
+    class Config:
+        """Pydantic config."""
+        
+        from_attributes = True
+
+# Schema for a page of a timeline
+class ActivityPage(BaseModel):
+    """Schema for a page of a user's activity timeline."""
+    
+    items: List[Activity]
+    next_cursor: Optional[str] = None
@@ -0,0 +1,45 @@
+from typing import Optional, List
+from pydantic import BaseModel
+from datetime import date, datetime
+from enum import Enum
+
+from .contribution import ContributionTypeEnum, ContributionStatusEnum
+
+# Time Granularity Enum
+class GranularityEnum(str, Enum):
+    """Enum for time series bucket sizes."""
+    
+    DAY = "day"
+    WEEK = "week"
+    MONTH = "month"
+
+# Breakdown Dimension Enum
+class DimensionEnum(str, Enum):
+    """Enum for time series breakdown dimensions."""
+    
+    PROJECT = "project"
+    TYPE = "type"
+    STATUS = "status"
+
+# Schema for one point of a contribution time series
+class ContributionSeriesPoint(BaseModel):
+    """Schema for contribution totals of one period."""
+    
+    period: date
+    project_id: Optional[int] = None
+    type: Optional[ContributionTypeEnum] = None
+    status: Optional[ContributionStatusEnum] = None
+    count: int
+    value: float
+    token_amount: float
+
+# Schema for a contribution time series
+class ContributionSeries(BaseModel):
+    """Schema for contribution totals over time."""
+    
+    granularity: GranularityEnum
+    start: date
+    end: date
+    group_by: List[DimensionEnum]
+    watermark: Optional[datetime] = None
+    points: List[ContributionSeriesPoint]
@@ -0,0 +1,34 @@
+from typing import Any, Dict, List, Optional
+from pydantic import BaseModel, Field
+
+from ...config.settings import settings
+
+# Schema for a batched sub-request
+class BatchItem(BaseModel):
+    """Schema for one read of a batch request."""
+    
+    id: Optional[str] = None
+    method: str = "GET"
+    path: str = Field(..., pattern=r"^/")
+    headers: Dict[str, str] = {}
+
+# Schema for a batch request
+class BatchRequest(BaseModel):
+    """Schema for a batch of API reads."""
+    
+    requests: List[BatchItem] = Field(..., min_length=1, max_length=settings.BATCH_MAX_REQUESTS)
+
+# Schema for a batched sub-response
+class BatchItemResult(BaseModel):
+    """Schema for the response to one read of a batch."""
+    
+    id: Optional[str] = None
+    status: int
+    headers: Dict[str, str] = {}
+    body: Any = None
+
+# Schema for a batch response
+class BatchResponse(BaseModel):
+    """Schema for the responses to a batch, in request order."""
+    
+    responses: List[BatchItemResult]
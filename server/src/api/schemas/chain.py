@@ -0,0 +1,51 @@
+from typing import List, Optional
+from pydantic import BaseModel
+from datetime import datetime
+from decimal import Decimal
+from enum import Enum
+
+# Chain Event Type Enum
+class ChainEventTypeEnum(str, Enum):
+    """Enum for indexed token transfer kinds."""
+    
+    MINT = "mint"
+    TRANSFER = "transfer"
+    BURN = "burn"
+
+# Schema for chain event response
+class ChainEvent(BaseModel):
+    """Schema for indexed contract event response."""
+    
+    block_number: int
+    transaction_hash: str
+    log_index: int
+    contract_address: str
+    type: ChainEventTypeEnum
+    from_address: str
+    to_address: str
+    token_id: Optional[Decimal] = None
+    amount: Optional[Decimal] = None
+    created_at: datetime
+    
+    class Config:
+        """Pydantic config."""
+        
+        from_attributes = True
+
+# Schema for a page of a wallet's events
+class ChainEventPage(BaseModel):
+    """Schema for a page of a wallet's contract events."""
+    
+    items: List[ChainEvent]
+    next_cursor: Optional[str] = None
+
+# Schema for on-chain wallet state
+class OnchainState(BaseModel):
+    """Schema for a user's on-chain wallet state at a block."""
+    
+    wallet_address: Optional[str] = None
+    block_number: Optional[int] = None
+    # Wei and token base units, as decimal strings to keep uint256 precision
+    native_balance: Optional[str] = None
+    token_balance: Optional[str] = None
+    badge_token_ids: List[int] = []
@@ -78,4 +78,31 @@ class ContributionWithDetails(Contribution):
     
     user_name: str
     project_name: str
-    task_title: Optional[str] = None
\ No newline at end of file
+    task_title: Optional[str] = None
+
+# Schema for verifying contributions in bulk
+class ContributionVerifyBatch(BaseModel):
+    """Schema for verifying or rejecting pending contributions in bulk.
+    
+    Either ``ids`` or at least one filter must be given; filters are combined
+    with AND and only pending contributions are affected.
+    """
+    
+    status: ContributionStatusEnum
+    ids: Optional[List[int]] = Field(None, min_length=1)
+    project_id: Optional[int] = None
+    user_id: Optional[int] = None
+    task_id: Optional[int] = None
+    type: Optional[ContributionTypeEnum] = None
+    created_before: Optional[datetime] = None
+
+# Schema for bulk verification result
+class ContributionVerifyBatchResult(BaseModel):
+    """Schema for the summary of a bulk verification."""
+    
+    status: ContributionStatusEnum
+    updated: int
+    contribution_ids: List[int]
+    tokens_created: int
+    token_amount_total: float
+    has_more: bool
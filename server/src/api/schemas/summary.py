@@ -0,0 +1,29 @@
+from typing import Dict, List
+from pydantic import BaseModel
+
+from .user import User
+from .badge import UserBadgeWithDetails
+
+# Schema for contribution counts
+class ContributionStats(BaseModel):
+    """Schema for a user's contribution counts."""
+    
+    total: int = 0
+    by_status: Dict[str, int] = {}
+    by_type: Dict[str, int] = {}
+
+# Schema for token balances
+class TokenBalance(BaseModel):
+    """Schema for a user's token balances by transaction status."""
+    
+    confirmed: float = 0.0
+    pending: float = 0.0
+
+# Schema for user profile summary
+class UserSummary(BaseModel):
+    """Schema for everything a profile page shows about a user."""
+    
+    user: User
+    contributions: ContributionStats
+    badges: List[UserBadgeWithDetails]
+    tokens: TokenBalance
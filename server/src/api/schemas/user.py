@@ -44,6 +44,14 @@ class Token(BaseModel):
     
     access_token: str
     token_type: str = "bearer"
+    refresh_token: Optional[str] = None
+    expires_in: Optional[int] = None
+
+# Schema for refreshing a token
+class TokenRefresh(BaseModel):
+    """Schema for exchanging a refresh token."""
+    
+    refresh_token: str
 
 # Schema for token data
 class TokenData(BaseModel):
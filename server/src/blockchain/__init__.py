@@ -0,0 +1 @@
+"""On-chain integration: node access and the contract event indexer."""
@@ -0,0 +1,289 @@
+"""
+Contract event indexer.
+
+Scans the ``Transfer`` logs of the portal contract (``CONTRACT_ADDRESS``)
+and stores them decoded in ``chainevent``, so wallet activity is read from
+Postgres instead of the node.
+
+:func:`index_chain` runs periodically (see ``tasks.chain``). It resumes from
+the ``chaincheckpoint`` row and requests logs in block ranges sized to return
+about ``CHAIN_INDEXER_TARGET_LOGS`` logs each: a range that the node rejects
+or that returns too many logs is halved, a sparse one is grown up to
+``CHAIN_INDEXER_MAX_BLOCK_RANGE``. Each range is inserted in bulk and
+committed together with the checkpoint, so an interrupted run resumes at the
+last committed range and never stores a log twice.
+
+Reorgs are detected from the block hashes kept in ``chainblock`` for the last
+``CHAIN_REORG_DEPTH`` blocks. When the checkpoint block is no longer
+canonical, the indexer walks back to the newest kept block the node still
+agrees on, deletes everything above it and indexes from there again. Only
+blocks ``CHAIN_INDEXER_CONFIRMATIONS`` deep are indexed, which makes this
+rare.
+"""
+
+import logging
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import requests
+from sqlalchemy import delete, select, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+from web3 import Web3
+from web3.exceptions import Web3Exception
+
+from ..config.settings import settings
+from ..db.models import ChainBlock, ChainCheckpoint, ChainEvent, ChainEventType
+from .provider import ZERO_ADDRESS, contract_address, get_web3
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_NAME = "contract_transfers"
+
+# Arbitrary application-wide key serializing indexer runs
+INDEXER_LOCK_KEY = 7_204_314
+
+# Transfer(address,address,uint256), shared by ERC-20 and ERC-721
+TRANSFER_TOPIC = "0x" + Web3.keccak(text="Transfer(address,address,uint256)").hex().removeprefix("0x")
+
+# Errors after which a range is retried at half its size
+_RANGE_ERRORS = (ValueError, Web3Exception, requests.RequestException)
+
+def _hex(value: Any) -> str:
+    """0x-prefixed lower-case hex of a bytes or hex string value."""
+    if isinstance(value, (bytes, bytearray)):
+        return "0x" + bytes(value).hex()
+    value = value.lower()
+    return value if value.startswith("0x") else "0x" + value
+
+def _topic_address(topic: Any) -> str:
+    """Address held in the last 20 bytes of an indexed topic."""
+    return "0x" + _hex(topic)[-40:]
+
+def decode_transfer(log: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Decode a ``Transfer`` log into ``chainevent`` column values.
+    
+    ERC-721 transfers index the token id as a fourth topic; ERC-20 transfers
+    carry the amount in the data.
+    
+    Args:
+        log: Log as returned by ``eth_getLogs``
+        
+    Returns:
+        Optional[Dict[str, Any]]: Column values, None if the log is not a transfer
+    """
+    topics = log["topics"]
+    if len(topics) not in (3, 4) or _hex(topics[0]) != TRANSFER_TOPIC:
+        return None
+    
+    from_address = _topic_address(topics[1])
+    to_address = _topic_address(topics[2])
+    if from_address == ZERO_ADDRESS:
+        event_type = ChainEventType.MINT
+    elif to_address == ZERO_ADDRESS:
+        event_type = ChainEventType.BURN
+    else:
+        event_type = ChainEventType.TRANSFER
+    
+    token_id = amount = None
+    if len(topics) == 4:
+        token_id = int(_hex(topics[3]), 16)
+    else:
+        data = _hex(log["data"])
+        amount = int(data, 16) if len(data) > 2 else 0
+    
+    return {
+        "block_number": log["blockNumber"],
+        "block_hash": _hex(log["blockHash"]),
+        "transaction_hash": _hex(log["transactionHash"]),
+        "log_index": log["logIndex"],
+        "contract_address": log["address"].lower(),
+        "type": event_type.name,
+        "from_address": from_address,
+        "to_address": to_address,
+        "token_id": token_id,
+        "amount": amount,
+    }
+
+def _block_hash(w3: Web3, number: int) -> str:
+    """Hash of the canonical block at a height."""
+    return _hex(w3.eth.get_block(number)["hash"])
+
+def _upsert_blocks(db: Session, blocks: Iterable[Tuple[int, str]], now: datetime) -> None:
+    """Record the hashes of indexed blocks."""
+    rows = [
+        {"number": number, "hash": block_hash, "created_at": now, "updated_at": now}
+        for number, block_hash in dict(blocks).items()
+    ]
+    if not rows:
+        return
+    statement = pg_insert(ChainBlock).values(rows)
+    db.execute(statement.on_conflict_do_update(
+        index_elements=[ChainBlock.number],
+        set_={"hash": statement.excluded.hash, "updated_at": now},
+    ))
+
+def _save_checkpoint(db: Session, block_number: int, block_hash: str, now: datetime) -> None:
+    """Move the checkpoint."""
+    statement = pg_insert(ChainCheckpoint).values(
+        name=CHECKPOINT_NAME, block_number=block_number, block_hash=block_hash, created_at=now, updated_at=now,
+    )
+    db.execute(statement.on_conflict_do_update(
+        index_elements=[ChainCheckpoint.name],
+        set_={"block_number": block_number, "block_hash": block_hash, "updated_at": now},
+    ))
+
+def _rollback(db: Session, w3: Web3, checkpoint: ChainCheckpoint) -> int:
+    """
+    Undo the blocks orphaned by a reorg.
+    
+    Args:
+        db: Database session
+        w3: Web3 client
+        checkpoint: Checkpoint whose block is no longer canonical
+        
+    Returns:
+        int: Last block still valid, where indexing resumes
+    """
+    kept = db.execute(
+        select(ChainBlock.number, ChainBlock.hash)
+        .where(ChainBlock.number < checkpoint.block_number)
+        .order_by(ChainBlock.number.desc())
+    ).all()
+    ancestor = None
+    for number, block_hash in kept:
+        if _block_hash(w3, number) == block_hash:
+            ancestor = (number, block_hash)
+            break
+    
+    if ancestor is None:
+        # The reorg is deeper than the kept hashes: re-index all of them
+        number = (kept[-1].number if kept else checkpoint.block_number) - 1
+        ancestor = (number, _block_hash(w3, number) if number >= 0 else "")
+    
+    number, block_hash = ancestor
+    logger.warning("Chain reorg below block %s, rolling back to block %s", checkpoint.block_number, number)
+    db.execute(delete(ChainEvent).where(ChainEvent.block_number > number))
+    db.execute(delete(ChainBlock).where(ChainBlock.number > number))
+    _save_checkpoint(db, number, block_hash, datetime.utcnow())
+    return number
+
+def _get_logs(w3: Web3, address: str, start: int, block_range: int) -> Tuple[List[Dict[str, Any]], int]:
+    """
+    Fetch the transfer logs of a range, halving it until the node accepts it.
+    
+    Args:
+        w3: Web3 client
+        address: Contract address
+        start: First block
+        block_range: Number of blocks to try first
+        
+    Returns:
+        Tuple[List[Dict[str, Any]], int]: Logs and the number of blocks covered
+        
+    Raises:
+        Exception: The node rejected a single-block range
+    """
+    while True:
+        try:
+            logs = w3.eth.get_logs({
+                "address": address,
+                "fromBlock": start,
+                "toBlock": start + block_range - 1,
+                "topics": [TRANSFER_TOPIC],
+            })
+        except _RANGE_ERRORS:
+            if block_range == 1:
+                raise
+            block_range //= 2
+            continue
+        
+        if len(logs) > 2 * settings.CHAIN_INDEXER_TARGET_LOGS and block_range > 1:
+            block_range //= 2
+            continue
+        return logs, block_range
+
+def _next_range(block_range: int, logs: int) -> int:
+    """Block range expected to return about the target number of logs."""
+    target = settings.CHAIN_INDEXER_TARGET_LOGS
+    if logs == 0:
+        scaled = block_range * 2
+    else:
+        scaled = block_range * target // logs
+    # Change by at most a factor of two per step to damp outliers
+    scaled = min(max(scaled, block_range // 2), block_range * 2)
+    return min(max(scaled, 1), settings.CHAIN_INDEXER_MAX_BLOCK_RANGE)
+
+def index_chain(db: Session) -> Dict[str, Any]:
+    """
+    Index new contract transfer logs.
+    
+    Each range runs in its own transaction holding an advisory lock; a run
+    finding the lock taken stops, leaving the work to the one holding it.
+    Stops once the confirmed head is reached or after
+    ``CHAIN_INDEXER_MAX_SECONDS``.
+    
+    Args:
+        db: Database session
+        
+    Returns:
+        Dict[str, Any]: Ranges processed, events inserted, blocks rolled back
+        and the new checkpoint
+    """
+    address = contract_address()
+    if address is None:
+        return {"skipped": "CONTRACT_ADDRESS is not configured"}
+    
+    w3 = get_web3()
+    deadline = time.monotonic() + settings.CHAIN_INDEXER_MAX_SECONDS
+    block_range = settings.CHAIN_INDEXER_BLOCK_RANGE
+    stats = {"ranges": 0, "events": 0, "rolled_back": 0, "block_number": None}
+    
+    while time.monotonic() < deadline:
+        if not db.scalar(text("SELECT pg_try_advisory_xact_lock(:key)"), {"key": INDEXER_LOCK_KEY}):
+            db.rollback()
+            break
+        
+        checkpoint = db.scalar(select(ChainCheckpoint).where(ChainCheckpoint.name == CHECKPOINT_NAME))
+        if checkpoint is None:
+            last = settings.CHAIN_INDEXER_START_BLOCK - 1
+        elif checkpoint.block_number >= 0 and _block_hash(w3, checkpoint.block_number) != checkpoint.block_hash:
+            last = _rollback(db, w3, checkpoint)
+            stats["rolled_back"] += checkpoint.block_number - last
+            db.commit()
+            continue
+        else:
+            last = checkpoint.block_number
+        
+        head = w3.eth.block_number - settings.CHAIN_INDEXER_CONFIRMATIONS
+        if last >= head:
+            db.rollback()
+            break
+        
+        start = last + 1
+        logs, covered = _get_logs(w3, address, start, min(block_range, head - last))
+        end = start + covered - 1
+        end_hash = _block_hash(w3, end)
+        
+        now = datetime.utcnow()
+        rows = [row for row in map(decode_transfer, logs) if row is not None]
+        if rows:
+            result = db.execute(
+                pg_insert(ChainEvent)
+                .values([{**row, "created_at": now, "updated_at": now} for row in rows])
+                .on_conflict_do_nothing(constraint="uq_chainevent_log")
+            )
+            stats["events"] += result.rowcount
+        
+        _upsert_blocks(db, [(row["block_number"], row["block_hash"]) for row in rows] + [(end, end_hash)], now)
+        _save_checkpoint(db, end, end_hash, now)
+        db.execute(delete(ChainBlock).where(ChainBlock.number < end - settings.CHAIN_REORG_DEPTH))
+        db.commit()
+        
+        stats["ranges"] += 1
+        stats["block_number"] = end
+        block_range = _next_range(covered, len(logs))
+    
+    return stats
@@ -0,0 +1,124 @@
+"""
+Batched contract reads.
+
+:func:`read` runs plain JSON-RPC calls and contract ``eth_call``s at one
+block in a single batch. When the Multicall3 contract is deployed on the
+chain (``MULTICALL_ADDRESS``, present at the same address on most
+networks), all contract calls are folded into one ``aggregate3`` call, which
+nodes and rate limiters count as a single request; otherwise each is its own
+``eth_call`` in the batch.
+"""
+
+import threading
+from typing import Any, List, Optional, Sequence, Tuple
+
+from eth_abi import decode, encode
+from web3 import Web3
+
+from ..config.settings import settings
+from .rpc import RpcClient, RpcError
+
+def selector(signature: str) -> bytes:
+    """
+    Function selector of a signature.
+    
+    Args:
+        signature: Canonical signature, e.g. ``balanceOf(address)``
+        
+    Returns:
+        bytes: First four bytes of its keccak hash
+    """
+    return bytes(Web3.keccak(text=signature)[:4])
+
+def encode_call(signature: str, types: Sequence[str], args: Sequence[Any]) -> str:
+    """
+    Encode the calldata of a contract call.
+    
+    Args:
+        signature: Canonical signature
+        types: ABI types of the arguments
+        args: Arguments
+        
+    Returns:
+        str: 0x-prefixed calldata
+    """
+    return "0x" + (selector(signature) + encode(list(types), list(args))).hex()
+
+_AGGREGATE3 = "aggregate3((address,bool,bytes)[])"
+
+# Whether Multicall3 is deployed, checked once per process
+_multicall_available: Optional[bool] = None
+_multicall_lock = threading.Lock()
+
+def multicall_available(rpc: RpcClient) -> bool:
+    """
+    Check whether Multicall3 can be used.
+    
+    Args:
+        rpc: JSON-RPC client
+        
+    Returns:
+        bool: True if ``MULTICALL_ADDRESS`` is set and has code
+    """
+    global _multicall_available
+    if not settings.MULTICALL_ADDRESS:
+        return False
+    with _multicall_lock:
+        if _multicall_available is None:
+            code = rpc.call("eth_getCode", [settings.MULTICALL_ADDRESS, "latest"])
+            _multicall_available = code not in ("0x", "0x0", "")
+        return _multicall_available
+
+def _bytes(value: str) -> bytes:
+    """Decode a 0x-prefixed hex result."""
+    return bytes.fromhex(value[2:])
+
+def read(
+    rpc: RpcClient,
+    block: int,
+    requests: Sequence[Tuple[str, Sequence[Any]]],
+    calls: Sequence[Tuple[str, str]],
+) -> Tuple[List[Any], List[Optional[bytes]]]:
+    """
+    Run JSON-RPC calls and contract calls at one block in one round trip.
+    
+    Args:
+        rpc: JSON-RPC client
+        block: Block number to read at
+        requests: Method and parameters of plain JSON-RPC calls, without the
+            block parameter, which is appended
+        calls: Contract address and calldata of each contract call
+        
+    Returns:
+        Tuple[List[Any], List[Optional[bytes]]]: Result of each JSON-RPC call,
+        and the return data of each contract call, None if it reverted
+        
+    Raises:
+        RpcError: If a JSON-RPC call failed
+        requests.RequestException: If the node could not be reached
+    """
+    tag = hex(block)
+    batch = [(method, [*params, tag]) for method, params in requests]
+    aggregate = bool(calls) and multicall_available(rpc)
+    if aggregate:
+        data = encode_call(_AGGREGATE3, ["(address,bool,bytes)[]"], [[
+            (Web3.to_checksum_address(to), True, _bytes(calldata)) for to, calldata in calls
+        ]])
+        batch.append(("eth_call", [{"to": settings.MULTICALL_ADDRESS, "data": data}, tag]))
+    else:
+        batch += [("eth_call", [{"to": to, "data": calldata}, tag]) for to, calldata in calls]
+    
+    results = rpc.batch(batch)
+    for result in results[:len(requests)]:
+        if isinstance(result, RpcError):
+            raise result
+    call_results = results[len(requests):]
+    
+    if aggregate:
+        if isinstance(call_results[0], RpcError):
+            raise call_results[0]
+        (returned,) = decode(["(bool,bytes)[]"], _bytes(call_results[0]))
+        return results[:len(requests)], [data if success else None for success, data in returned]
+    return results[:len(requests)], [
+        None if isinstance(result, RpcError) else _bytes(result) for result in call_results
+    ]
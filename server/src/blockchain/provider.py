@@ -0,0 +1,39 @@
+"""Shared connection to the blockchain node."""
+
+from typing import Optional
+
+from web3 import Web3
+
+from ..config.settings import settings
+
+ZERO_ADDRESS = "0x" + "00" * 20
+
+# Created lazily so that no connection is opened at import time
+_web3: Optional[Web3] = None
+
+def get_web3() -> Web3:
+    """
+    Get the process-wide Web3 client for ``BLOCKCHAIN_PROVIDER_URL``.
+    
+    Returns:
+        Web3: Web3 client
+    """
+    global _web3
+    if _web3 is None:
+        _web3 = Web3(Web3.HTTPProvider(
+            settings.BLOCKCHAIN_PROVIDER_URL,
+            request_kwargs={"timeout": settings.BLOCKCHAIN_REQUEST_TIMEOUT},
+        ))
+    return _web3
+
+def contract_address() -> Optional[str]:
+    """
+    Get the configured portal contract address.
+    
+    Returns:
+        Optional[str]: Checksummed address, None if not configured
+    """
+    address = settings.CONTRACT_ADDRESS
+    if not address or address.lower() == ZERO_ADDRESS:
+        return None
+    return Web3.to_checksum_address(address)
@@ -0,0 +1,130 @@
+"""
+Pooled JSON-RPC client for request-path reads.
+
+``web3.py`` sends one HTTP request per call. Pages reading several values
+from the node use :class:`RpcClient` instead: its HTTP connections are
+pooled and kept alive across requests, and :meth:`RpcClient.batch` sends any
+number of calls as one JSON-RPC batch, so a page costs one round trip.
+"""
+
+import itertools
+import threading
+from typing import Any, List, Optional, Sequence, Tuple, Union
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from ..config.settings import settings
+
+class RpcError(Exception):
+    """Error returned by the node for a call."""
+    
+    def __init__(self, error: dict):
+        """Initialize the error from a JSON-RPC error object."""
+        super().__init__(error.get("message", "JSON-RPC error"))
+        self.code = error.get("code")
+        self.data = error.get("data")
+
+class RpcClient:
+    """
+    Thread-safe JSON-RPC client over a pooled HTTP session.
+    
+    Args:
+        url: Node URL
+        pool_size: Maximum number of kept-alive connections
+        timeout: Seconds to wait for a response
+    """
+    
+    def __init__(self, url: str, pool_size: int = 10, timeout: float = 10.0):
+        """Initialize the client."""
+        self.url = url
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._ids = itertools.count(1)
+        self._ids_lock = threading.Lock()
+    
+    def _next_id(self) -> int:
+        """Next request id."""
+        with self._ids_lock:
+            return next(self._ids)
+    
+    def _post(self, payload: Union[dict, list]) -> Any:
+        """Send a request and return the decoded response."""
+        response = self.session.post(self.url, json=payload, timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()
+    
+    def call(self, method: str, params: Sequence[Any] = ()) -> Any:
+        """
+        Make one call.
+        
+        Args:
+            method: JSON-RPC method, e.g. ``eth_blockNumber``
+            params: Method parameters
+            
+        Returns:
+            Any: Result of the call
+            
+        Raises:
+            RpcError: If the node returned an error
+            requests.RequestException: If the node could not be reached
+        """
+        reply = self._post({"jsonrpc": "2.0", "id": self._next_id(), "method": method, "params": list(params)})
+        if "error" in reply:
+            raise RpcError(reply["error"])
+        return reply["result"]
+    
+    def batch(self, calls: Sequence[Tuple[str, Sequence[Any]]]) -> List[Union[Any, RpcError]]:
+        """
+        Make several calls in one HTTP request.
+        
+        Args:
+            calls: Method and parameters of each call
+            
+        Returns:
+            List[Union[Any, RpcError]]: Result of each call in order, or the
+            error the node returned for it
+            
+        Raises:
+            RpcError: If the node rejected the whole batch
+            requests.RequestException: If the node could not be reached
+        """
+        if not calls:
+            return []
+        ids = [self._next_id() for _ in calls]
+        reply = self._post([
+            {"jsonrpc": "2.0", "id": call_id, "method": method, "params": list(params)}
+            for call_id, (method, params) in zip(ids, calls)
+        ])
+        if isinstance(reply, dict):
+            raise RpcError(reply.get("error", {}))
+        
+        # Responses to a batch may come in any order
+        by_id = {item.get("id"): item for item in reply}
+        results = []
+        for call_id in ids:
+            item = by_id.get(call_id, {"error": {"message": "Missing response in batch"}})
+            results.append(RpcError(item["error"]) if "error" in item else item["result"])
+        return results
+
+# Created lazily so that no connection is opened at import time
+_client: Optional[RpcClient] = None
+
+def get_rpc() -> RpcClient:
+    """
+    Get the process-wide JSON-RPC client for ``BLOCKCHAIN_PROVIDER_URL``.
+    
+    Returns:
+        RpcClient: JSON-RPC client
+    """
+    global _client
+    if _client is None:
+        _client = RpcClient(
+            settings.BLOCKCHAIN_PROVIDER_URL,
+            pool_size=settings.BLOCKCHAIN_RPC_POOL_SIZE,
+            timeout=settings.BLOCKCHAIN_REQUEST_TIMEOUT,
+        )
+    return _client
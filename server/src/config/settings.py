@@ -16,6 +16,15 @@ class Settings(BaseModel):
     # API settings
     API_PREFIX: str = "/api"
     
+    # Server settings (WEB_CONCURRENCY=0 sizes workers to the available CPUs)
+    SERVER_HOST: str = os.getenv("SERVER_HOST", "0.0.0.0")
+    SERVER_PORT: int = int(os.getenv("SERVER_PORT", "8000"))
+    WEB_CONCURRENCY: int = int(os.getenv("WEB_CONCURRENCY", "0"))
+    WORKER_MAX_REQUESTS: int = int(os.getenv("WORKER_MAX_REQUESTS", "10000"))
+    WORKER_MAX_MEMORY_MB: int = int(os.getenv("WORKER_MAX_MEMORY_MB", "512"))
+    WORKER_MEMORY_CHECK_INTERVAL: float = float(os.getenv("WORKER_MEMORY_CHECK_INTERVAL", "10"))
+    WORKER_GRACEFUL_TIMEOUT: int = int(os.getenv("WORKER_GRACEFUL_TIMEOUT", "30"))
+    
     # Database settings
     DATABASE_URL: str = os.getenv(
         "DATABASE_URL", 
@@ -25,7 +34,13 @@ class Settings(BaseModel):
     # JWT settings
     JWT_SECRET_KEY: str = os.getenv("JWT_SECRET_KEY", "secret_key")
     JWT_ALGORITHM: str = "HS256"
-    JWT_ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    JWT_ACCESS_TOKEN_EXPIRE_MINUTES: int = int(os.getenv("JWT_ACCESS_TOKEN_EXPIRE_MINUTES", "15"))
+    JWT_REFRESH_TOKEN_EXPIRE_DAYS: int = int(os.getenv("JWT_REFRESH_TOKEN_EXPIRE_DAYS", "30"))
+    
+    # Session revocation settings (in-memory Bloom filter of revoked sessions)
+    REVOCATION_BLOOM_CAPACITY: int = int(os.getenv("REVOCATION_BLOOM_CAPACITY", "100000"))
+    REVOCATION_BLOOM_ERROR_RATE: float = float(os.getenv("REVOCATION_BLOOM_ERROR_RATE", "0.001"))
+    REVOCATION_REBUILD_INTERVAL: float = float(os.getenv("REVOCATION_REBUILD_INTERVAL", "300"))
     
     # Taiga API settings
     TAIGA_API_URL: str = os.getenv("TAIGA_API_URL", "https://api.taiga.io/api/v1/")
@@ -38,9 +53,156 @@ class Settings(BaseModel):
         "http://localhost:8545"
     )
     CONTRACT_ADDRESS: str = os.getenv("CONTRACT_ADDRESS", "")
+    BLOCKCHAIN_REQUEST_TIMEOUT: float = float(os.getenv("BLOCKCHAIN_REQUEST_TIMEOUT", "10"))
+    BLOCKCHAIN_RPC_POOL_SIZE: int = int(os.getenv("BLOCKCHAIN_RPC_POOL_SIZE", "10"))
+    # Multicall3, deployed at this address on most chains; empty to disable
+    MULTICALL_ADDRESS: str = os.getenv("MULTICALL_ADDRESS", "0xcA11bde05977b3631167028862bE2a173976CA11")
     
     # Redis settings
     REDIS_URL: str = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+    
+    # Database pool settings
+    DB_ECHO: bool = os.getenv("DB_ECHO", "false").lower() == "true"
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "5"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    DB_POOL_TIMEOUT: float = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+    DB_POOL_IDLE_PING_SECONDS: float = float(os.getenv("DB_POOL_IDLE_PING_SECONDS", "30"))
+    
+    # Rate limiting settings (token bucket: sustained rate per minute and burst size)
+    RATE_LIMIT_ENABLED: bool = os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true"
+    AUTH_RATE_LIMIT_PER_MINUTE: float = float(os.getenv("AUTH_RATE_LIMIT_PER_MINUTE", "10"))
+    AUTH_RATE_LIMIT_BURST: int = int(os.getenv("AUTH_RATE_LIMIT_BURST", "5"))
+    WRITE_RATE_LIMIT_PER_MINUTE: float = float(os.getenv("WRITE_RATE_LIMIT_PER_MINUTE", "120"))
+    WRITE_RATE_LIMIT_BURST: int = int(os.getenv("WRITE_RATE_LIMIT_BURST", "30"))
+    WRITE_RATE_LIMIT_IP_PER_MINUTE: float = float(os.getenv("WRITE_RATE_LIMIT_IP_PER_MINUTE", "480"))
+    WRITE_RATE_LIMIT_IP_BURST: int = int(os.getenv("WRITE_RATE_LIMIT_IP_BURST", "120"))
+    
+    # Admission control settings
+    ADMISSION_MAX_IN_FLIGHT: int = int(os.getenv("ADMISSION_MAX_IN_FLIGHT", "200"))
+    ADMISSION_MAX_POOL_WAIT_MS: float = float(os.getenv("ADMISSION_MAX_POOL_WAIT_MS", "250"))
+    ADMISSION_RETRY_AFTER_SECONDS: int = int(os.getenv("ADMISSION_RETRY_AFTER_SECONDS", "1"))
+    
+    # Real-time event stream settings
+    EVENTS_LOG_MAXLEN: int = int(os.getenv("EVENTS_LOG_MAXLEN", "100000"))
+    EVENTS_REPLAY_MAX: int = int(os.getenv("EVENTS_REPLAY_MAX", "1000"))
+    EVENTS_SUBSCRIBER_QUEUE_SIZE: int = int(os.getenv("EVENTS_SUBSCRIBER_QUEUE_SIZE", "256"))
+    EVENTS_MAX_CHANNELS: int = int(os.getenv("EVENTS_MAX_CHANNELS", "20"))
+    EVENTS_HEARTBEAT_SECONDS: float = float(os.getenv("EVENTS_HEARTBEAT_SECONDS", "15"))
+    EVENTS_RETRY_MS: int = int(os.getenv("EVENTS_RETRY_MS", "3000"))
+    
+    # Transactional outbox relay settings
+    OUTBOX_BATCH_SIZE: int = int(os.getenv("OUTBOX_BATCH_SIZE", "500"))
+    OUTBOX_MAX_ATTEMPTS: int = int(os.getenv("OUTBOX_MAX_ATTEMPTS", "10"))
+    OUTBOX_RELAY_INTERVAL: float = float(os.getenv("OUTBOX_RELAY_INTERVAL", "1"))
+    OUTBOX_RELAY_TIME_BUDGET: float = float(os.getenv("OUTBOX_RELAY_TIME_BUDGET", "10"))
+    # Delay before retrying a failed event, doubled on every further failure
+    OUTBOX_RETRY_BASE_DELAY: float = float(os.getenv("OUTBOX_RETRY_BASE_DELAY", "5"))
+    OUTBOX_RETRY_MAX_DELAY: float = float(os.getenv("OUTBOX_RETRY_MAX_DELAY", "600"))
+    
+    # Background task settings
+    TASK_IDEMPOTENCY_TTL: int = int(os.getenv("TASK_IDEMPOTENCY_TTL", "86400"))
+    TASK_IDEMPOTENCY_LOCK_TTL: int = int(os.getenv("TASK_IDEMPOTENCY_LOCK_TTL", "600"))
+    TASK_IDEMPOTENCY_RETRY_DELAY: int = int(os.getenv("TASK_IDEMPOTENCY_RETRY_DELAY", "30"))
+    TASK_BATCH_FLUSH_INTERVAL: float = float(os.getenv("TASK_BATCH_FLUSH_INTERVAL", "5"))
+    
+    # Metrics settings (port 0 disables the Celery worker metrics server)
+    CELERY_METRICS_PORT: int = int(os.getenv("CELERY_METRICS_PORT", "9808"))
+    
+    # Tracing settings (exporter: console, file or otlp)
+    TRACING_ENABLED: bool = os.getenv("TRACING_ENABLED", "false").lower() == "true"
+    TRACING_EXPORTER: str = os.getenv("TRACING_EXPORTER", "file")
+    TRACING_FILE_PATH: str = os.getenv("TRACING_FILE_PATH", "traces.jsonl")
+    TRACING_OTLP_ENDPOINT: str = os.getenv("TRACING_OTLP_ENDPOINT", "")
+    TRACING_SAMPLE_RATIO: float = float(os.getenv("TRACING_SAMPLE_RATIO", "0.1"))
+    
+    # Contribution settings
+    CONTRIBUTION_VERIFY_BATCH_MAX: int = int(os.getenv("CONTRIBUTION_VERIFY_BATCH_MAX", "1000"))
+    
+    # Tokens earned per unit of value by a verified contribution of each type;
+    # the defaults are a starting point, set them per deployment
+    TOKEN_RATE_CODE: float = float(os.getenv("TOKEN_RATE_CODE", "1.0"))
+    TOKEN_RATE_DESIGN: float = float(os.getenv("TOKEN_RATE_DESIGN", "1.0"))
+    TOKEN_RATE_DOCUMENTATION: float = float(os.getenv("TOKEN_RATE_DOCUMENTATION", "0.8"))
+    TOKEN_RATE_TESTING: float = float(os.getenv("TOKEN_RATE_TESTING", "0.8"))
+    TOKEN_RATE_REVIEW: float = float(os.getenv("TOKEN_RATE_REVIEW", "0.5"))
+    TOKEN_RATE_FINANCIAL: float = float(os.getenv("TOKEN_RATE_FINANCIAL", "1.0"))
+    TOKEN_RATE_OTHER: float = float(os.getenv("TOKEN_RATE_OTHER", "0.5"))
+    
+    # Activity timeline settings
+    ACTIVITY_PAGE_SIZE: int = int(os.getenv("ACTIVITY_PAGE_SIZE", "20"))
+    ACTIVITY_PAGE_MAX: int = int(os.getenv("ACTIVITY_PAGE_MAX", "100"))
+    ACTIVITY_BACKFILL_BATCH_SIZE: int = int(os.getenv("ACTIVITY_BACKFILL_BATCH_SIZE", "5000"))
+    
+    # Response compression settings (levels trade CPU for bytes on the wire)
+    COMPRESSION_MIN_SIZE: int = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+    COMPRESSION_THREAD_MIN_SIZE: int = int(os.getenv("COMPRESSION_THREAD_MIN_SIZE", "65536"))
+    COMPRESSION_ZSTD_LEVEL: int = int(os.getenv("COMPRESSION_ZSTD_LEVEL", "3"))
+    COMPRESSION_BROTLI_QUALITY: int = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "4"))
+    COMPRESSION_GZIP_LEVEL: int = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+    
+    # Idempotency key settings
+    IDEMPOTENCY_TTL: int = int(os.getenv("IDEMPOTENCY_TTL", "86400"))
+    IDEMPOTENCY_LOCK_TTL: int = int(os.getenv("IDEMPOTENCY_LOCK_TTL", "60"))
+    IDEMPOTENCY_WAIT: float = float(os.getenv("IDEMPOTENCY_WAIT", "10"))
+    IDEMPOTENCY_POLL_INTERVAL: float = float(os.getenv("IDEMPOTENCY_POLL_INTERVAL", "0.05"))
+    
+    # Request coalescing settings
+    COALESCE_REDIS: bool = os.getenv("COALESCE_REDIS", "false").lower() == "true"
+    COALESCE_LOCK_TTL: float = float(os.getenv("COALESCE_LOCK_TTL", "10"))
+    COALESCE_WAIT: float = float(os.getenv("COALESCE_WAIT", "5"))
+    COALESCE_POLL_INTERVAL: float = float(os.getenv("COALESCE_POLL_INTERVAL", "0.01"))
+    
+    # Batch request settings
+    BATCH_MAX_REQUESTS: int = int(os.getenv("BATCH_MAX_REQUESTS", "20"))
+    
+    # User summary cache settings
+    USER_SUMMARY_CACHE_TTL: int = int(os.getenv("USER_SUMMARY_CACHE_TTL", "300"))
+    
+    # Analytics rollup settings
+    ANALYTICS_ROLLUP_INTERVAL: float = float(os.getenv("ANALYTICS_ROLLUP_INTERVAL", "60"))
+    ANALYTICS_ROLLUP_LAG: float = float(os.getenv("ANALYTICS_ROLLUP_LAG", "30"))
+    ANALYTICS_MAX_RANGE_DAYS: int = int(os.getenv("ANALYTICS_MAX_RANGE_DAYS", "1096"))
+    
+    # Table partitioning settings (retention 0 keeps every partition attached)
+    PARTITION_MAINTENANCE_INTERVAL: float = float(os.getenv("PARTITION_MAINTENANCE_INTERVAL", "3600"))
+    PARTITION_PREMAKE_MONTHS: int = int(os.getenv("PARTITION_PREMAKE_MONTHS", "3"))
+    PARTITION_RETENTION_MONTHS: int = int(os.getenv("PARTITION_RETENTION_MONTHS", "0"))
+    
+    # Chain indexer settings (block ranges adapt between 1 and the maximum to
+    # return about CHAIN_INDEXER_TARGET_LOGS logs per request)
+    CHAIN_INDEXER_START_BLOCK: int = int(os.getenv("CHAIN_INDEXER_START_BLOCK", "0"))
+    CHAIN_INDEXER_BLOCK_RANGE: int = int(os.getenv("CHAIN_INDEXER_BLOCK_RANGE", "2000"))
+    CHAIN_INDEXER_MAX_BLOCK_RANGE: int = int(os.getenv("CHAIN_INDEXER_MAX_BLOCK_RANGE", "10000"))
+    CHAIN_INDEXER_TARGET_LOGS: int = int(os.getenv("CHAIN_INDEXER_TARGET_LOGS", "1000"))
+    CHAIN_INDEXER_CONFIRMATIONS: int = int(os.getenv("CHAIN_INDEXER_CONFIRMATIONS", "2"))
+    CHAIN_REORG_DEPTH: int = int(os.getenv("CHAIN_REORG_DEPTH", "128"))
+    CHAIN_INDEXER_INTERVAL: float = float(os.getenv("CHAIN_INDEXER_INTERVAL", "15"))
+    CHAIN_INDEXER_MAX_SECONDS: float = float(os.getenv("CHAIN_INDEXER_MAX_SECONDS", "60"))
+    CHAIN_EVENTS_PAGE_SIZE: int = int(os.getenv("CHAIN_EVENTS_PAGE_SIZE", "50"))
+    CHAIN_EVENTS_PAGE_MAX: int = int(os.getenv("CHAIN_EVENTS_PAGE_MAX", "200"))
+    
+    # On-chain read cache settings (wallet state is cached per block)
+    ONCHAIN_BLOCK_TTL: float = float(os.getenv("ONCHAIN_BLOCK_TTL", "2"))
+    ONCHAIN_CACHE_TTL: int = int(os.getenv("ONCHAIN_CACHE_TTL", "60"))
+    
+    # Badge metadata settings (cache lifetime of token URIs; versioned
+    # metadata URLs are cached as immutable)
+    BADGE_METADATA_MAX_AGE: int = int(os.getenv("BADGE_METADATA_MAX_AGE", "300"))
+    BADGE_METADATA_STALE_WHILE_REVALIDATE: int = int(os.getenv("BADGE_METADATA_STALE_WHILE_REVALIDATE", "86400"))
+    # Seconds a replaced metadata version stays available at its versioned URL
+    BADGE_METADATA_VERSION_TTL: int = int(os.getenv("BADGE_METADATA_VERSION_TTL", "2592000"))
+    
+    # Cold storage archive settings (horizon 0 keeps every row in Postgres)
+    ARCHIVE_URI: str = os.getenv("ARCHIVE_URI", "./archive")
+    ARCHIVE_HORIZON_MONTHS: int = int(os.getenv("ARCHIVE_HORIZON_MONTHS", "0"))
+    ARCHIVE_INTERVAL: float = float(os.getenv("ARCHIVE_INTERVAL", "86400"))
+    ARCHIVE_BATCH_SIZE: int = int(os.getenv("ARCHIVE_BATCH_SIZE", "50000"))
+    
+    # Profiler settings
+    PROFILER_MAX_SECONDS: float = float(os.getenv("PROFILER_MAX_SECONDS", "60"))
+    PROFILER_INTERVAL: float = float(os.getenv("PROFILER_INTERVAL", "0.01"))
+    PROFILER_OUTPUT_DIR: str = os.getenv("PROFILER_OUTPUT_DIR", "/tmp/profiles")
 
 # Create settings instance
 settings = Settings()
\ No newline at end of file
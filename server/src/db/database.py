@@ -1,32 +1,203 @@
-from sqlalchemy import create_engine
+import asyncio
+
+from fastapi import Request
+from sqlalchemy import create_engine, event
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import ORMExecuteState, Session, sessionmaker
 
 from ..config.settings import settings
+from .pool import TimedQueuePool, install_idle_ping
 
 # Create SQLAlchemy engine
 engine = create_engine(
     settings.DATABASE_URL,
-    echo=True,  # Set to False in production
-    pool_pre_ping=True,
+    echo=settings.DB_ECHO,
+    poolclass=TimedQueuePool,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    pool_recycle=settings.DB_POOL_RECYCLE,
 )
 
-# Create session factory
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Check liveness only of connections that sat idle in the pool, instead of
+# pinging on every checkout (pool_pre_ping)
+install_idle_ping(engine, settings.DB_POOL_IDLE_PING_SECONDS)
+
+# Create session factory. Objects keep their loaded state after commit, so
+# responses serialize without another round trip after the connection has
+# been returned to the pool.
+SessionLocal = sessionmaker(
+    autocommit=False,
+    autoflush=False,
+    expire_on_commit=False,
+    bind=engine,
+)
 
 # Create base class for models
 Base = declarative_base()
 
+# Session.info key of sessions that end read-only transactions after each query
+RELEASE_AFTER_READ = "release_after_read"
+
+# Session.info key set once the current transaction has written
+_TRANSACTION_WROTE = "transaction_wrote"
+
+@event.listens_for(SessionLocal, "do_orm_execute")
+def _release_after_read(state: ORMExecuteState):
+    """
+    End a read-only transaction as soon as a query's rows are loaded.
+    
+    Read-only endpoints never commit, so their transaction, and the pooled
+    connection under it, would otherwise stay open until the request is torn
+    down, including while the response is serialized. For sessions marked
+    with ``RELEASE_AFTER_READ``, a SELECT in a transaction that has not
+    written is buffered and the transaction committed, which returns the
+    connection to the pool; the next statement checks out a connection again.
+    Transactions that wrote, locking reads (``FOR UPDATE``) and streamed
+    results (``yield_per``) keep their connection until they end.
+    """
+    session = state.session
+    if not session.info.get(RELEASE_AFTER_READ):
+        return None
+    if not state.is_select:
+        session.info[_TRANSACTION_WROTE] = True
+        return None
+    if (
+        session.info.get(_TRANSACTION_WROTE)
+        or session.new or session.dirty or session.deleted
+        or getattr(state.statement, "_for_update_arg", None) is not None
+        or state.execution_options.get("yield_per")
+        or state.execution_options.get("stream_results")
+    ):
+        return None
+    
+    frozen = state.invoke_statement().freeze()
+    session.commit()
+    return frozen()
+
+@event.listens_for(SessionLocal, "after_flush")
+def _mark_written(session: Session, flush_context) -> None:
+    """Keep the transaction of a session that flushed changes open."""
+    session.info[_TRANSACTION_WROTE] = True
+
+@event.listens_for(SessionLocal, "after_commit")
+@event.listens_for(SessionLocal, "after_rollback")
+def _reset_written(session: Session) -> None:
+    """Forget the writes of the transaction that ended."""
+    session.info.pop(_TRANSACTION_WROTE, None)
+
+class LazySession:
+    """
+    Proxy that creates a database session on first use.
+    
+    Endpoints that declare a session but answer from cache, fail validation
+    or only need the token payload never create one. A created session
+    checks out a connection on its first statement; read-only transactions
+    return it to the pool as soon as each query's rows are loaded (see
+    ``_release_after_read``), others when they commit or roll back.
+    """
+    
+    __slots__ = ("_session",)
+    
+    def __init__(self):
+        """Initialize the proxy without a session."""
+        self._session = None
+    
+    @property
+    def session(self) -> Session:
+        """The underlying session, created on first access."""
+        if self._session is None:
+            self._session = SessionLocal(info={RELEASE_AFTER_READ: True})
+        return self._session
+    
+    @property
+    def created(self) -> bool:
+        """Whether a session has been created or borrowed."""
+        return self._session is not None
+    
+    def __getattr__(self, name):
+        """Delegate to the underlying session."""
+        return getattr(self.session, name)
+    
+    def close(self) -> None:
+        """Close the session if one was created."""
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+
+class SharedSession:
+    """
+    Session shared by the sub-requests of a batch (see ``api.routes.batch``).
+    
+    A session is not thread-safe, so the batch runs its sub-requests one at a
+    time, each holding ``lock`` for its whole run; the whole batch holds at
+    most one pooled connection. The lock is an ``asyncio.Lock`` taken on the
+    event loop around each sub-request, so waiting sub-requests never park a
+    threadpool thread that the running one may need.
+    """
+    
+    def __init__(self):
+        """Initialize the shared session; it is created on first use."""
+        self.lock = asyncio.Lock()
+        self.lazy = LazySession()
+    
+    def close(self) -> None:
+        """Close the session once every sub-request has finished."""
+        self.lazy.close()
+
+class BorrowedSession(LazySession):
+    """
+    Lazy handle on a ``SharedSession`` used by one sub-request.
+    
+    The sub-request runs while holding the shared session's lock, so the
+    handle uses the session without further locking and leaves it open on
+    close for the next sub-request.
+    """
+    
+    __slots__ = ("_shared",)
+    
+    def __init__(self, shared: SharedSession):
+        """Initialize the handle without borrowing the session yet."""
+        super().__init__()
+        self._shared = shared
+    
+    @property
+    def session(self) -> Session:
+        """The shared session, created on first access."""
+        if self._session is None:
+            self._session = self._shared.lazy.session
+        return self._session
+    
+    def close(self) -> None:
+        """Give the shared session back without closing it."""
+        self._session = None
+
+# Request state key under which a request may provide a ``SharedSession``
+SHARED_SESSION_STATE = "shared_db_session"
+
 # Dependency to get DB session
-def get_db():
+def get_db(request: Request):
     """
     Dependency for getting database session.
     
+    The session is created lazily (see ``LazySession``), so declaring this
+    dependency costs nothing until the first query. Sub-requests of a batch
+    borrow the batch's shared session instead.
+    
+    Args:
+        request: Current request
+        
     Yields:
         Session: Database session
     """
-    db = SessionLocal()
+    shared = request.scope.get("state", {}).get(SHARED_SESSION_STATE)
+    db = BorrowedSession(shared) if shared is not None else LazySession()
     try:
         yield db
+    except Exception:
+        # Leave a shared session usable for the next borrower
+        if db.created:
+            db.rollback()
+        raise
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
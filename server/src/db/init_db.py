@@ -1,23 +1,36 @@
-"""Database initialization script."""
+"""
+Database seeding script.
 
+The schema itself is managed by Alembic migrations (``alembic upgrade head``);
+this module only inserts the initial data. It is safe to run repeatedly and
+concurrently: every run takes a Postgres advisory lock and only creates rows
+that are missing.
+
+Usage:
+    python -m src.db.init_db
+"""
+
+from sqlalchemy import text
 from sqlalchemy.exc import IntegrityError
 
-from .database import Base, engine, SessionLocal
-from .models import User, Project, Task, Badge, ContributionType, TokenType
+from .database import SessionLocal
+from .models import User, Project, Badge
 
-def init_db():
-    """Initialize the database with tables and initial data."""
-    
-    # Create tables
-    Base.metadata.create_all(bind=engine)
+# Arbitrary application-wide key for the seeding advisory lock
+SEED_LOCK_KEY = 7_204_311
+
+def seed_db():
+    """Insert the initial admin user, badges and project if they are missing."""
     
     # Create session
     db = SessionLocal()
     
     try:
+        # Serialize concurrent seeders; released when the transaction ends
+        db.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": SEED_LOCK_KEY})
+        
         # Check if we already have users
-        user_count = db.query(User).count()
-        if user_count == 0:
+        if db.query(User.id).first() is None:
             print("Creating initial admin user...")
             admin_user = User(
                 email="admin@example.com",
@@ -25,17 +38,15 @@ def init_db():
                 full_name="Admin User",
                 is_active=True,
                 is_verified=True,
+                is_superuser=True,
             )
             admin_user.set_password("admin")
             db.add(admin_user)
-            db.commit()
-            print("Admin user created.")
         
         # Check if we already have badges
-        badge_count = db.query(Badge).count()
-        if badge_count == 0:
+        if db.query(Badge.id).first() is None:
             print("Creating initial badges...")
-            badges = [
+            db.add_all([
                 Badge(
                     name="First Contribution",
                     description="Awarded for making your first contribution",
@@ -54,31 +65,25 @@ def init_db():
                     is_skill=True,
                     is_soul_bound=True,
                 ),
-            ]
-            db.add_all(badges)
-            db.commit()
-            print("Initial badges created.")
+            ])
         
         # Check if we already have projects
-        project_count = db.query(Project).count()
-        if project_count == 0:
+        if db.query(Project.id).first() is None:
             print("Creating initial project...")
-            project = Project(
+            db.add(Project(
                 name="Bettercorp Contributor Portal",
                 description="Central hub for project collaborators",
                 is_active=True,
-            )
-            db.add(project)
-            db.commit()
-            print("Initial project created.")
+            ))
         
-        print("Database initialization completed.")
+        db.commit()
+        print("Database seeding completed.")
         
     except IntegrityError as e:
         db.rollback()
-        print(f"Error initializing database: {e}")
+        print(f"Error seeding database: {e}")
     finally:
         db.close()
 
 if __name__ == "__main__":
-    init_db()
\ No newline at end of file
+    seed_db()
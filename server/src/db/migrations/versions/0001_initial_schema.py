@@ -0,0 +1,153 @@
+"""Initial schema.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# Revision identifiers, used by Alembic
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+# Enum types, stored by member name as SQLAlchemy does for Enum(PythonEnum)
+contribution_type = sa.Enum(
+    "CODE", "DESIGN", "DOCUMENTATION", "TESTING", "REVIEW", "FINANCIAL", "OTHER",
+    name="contributiontype",
+)
+contribution_status = sa.Enum("PENDING", "VERIFIED", "REJECTED", name="contributionstatus")
+token_type = sa.Enum(
+    "CONTRIBUTION", "ACHIEVEMENT", "REWARD", "INVESTMENT", "OTHER",
+    name="tokentype",
+)
+token_status = sa.Enum("PENDING", "CONFIRMED", "FAILED", name="tokenstatus")
+
+def _timestamps():
+    """Columns shared by every table through BaseModel."""
+    return [
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+    ]
+
+def upgrade() -> None:
+    """Apply the migration."""
+    op.create_table(
+        "user",
+        *_timestamps(),
+        sa.Column("email", sa.String(), nullable=False),
+        sa.Column("username", sa.String(), nullable=False),
+        sa.Column("hashed_password", sa.String(), nullable=False),
+        sa.Column("is_active", sa.Boolean(), nullable=True),
+        sa.Column("is_verified", sa.Boolean(), nullable=True),
+        sa.Column("verification_token", sa.String(), nullable=True),
+        sa.Column("verification_token_expires", sa.DateTime(), nullable=True),
+        sa.Column("full_name", sa.String(), nullable=True),
+        sa.Column("bio", sa.String(), nullable=True),
+        sa.Column("avatar_url", sa.String(), nullable=True),
+        sa.Column("wallet_address", sa.String(), nullable=True),
+    )
+    op.create_index("ix_user_id", "user", ["id"])
+    op.create_index("ix_user_email", "user", ["email"], unique=True)
+    op.create_index("ix_user_username", "user", ["username"], unique=True)
+    op.create_index("ix_user_wallet_address", "user", ["wallet_address"])
+    
+    op.create_table(
+        "project",
+        *_timestamps(),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("taiga_project_id", sa.Integer(), nullable=True),
+        sa.Column("is_active", sa.Boolean(), nullable=True),
+        sa.Column("repository_url", sa.String(), nullable=True),
+        sa.Column("documentation_url", sa.String(), nullable=True),
+        sa.Column("logo_url", sa.String(), nullable=True),
+    )
+    op.create_index("ix_project_id", "project", ["id"])
+    op.create_index("ix_project_name", "project", ["name"])
+    op.create_index("ix_project_taiga_project_id", "project", ["taiga_project_id"], unique=True)
+    
+    op.create_table(
+        "badge",
+        *_timestamps(),
+        sa.Column("name", sa.String(), nullable=False, unique=True),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("image_url", sa.String(), nullable=True),
+        sa.Column("criteria", sa.Text(), nullable=True),
+        sa.Column("is_achievement", sa.Boolean(), nullable=True),
+        sa.Column("is_skill", sa.Boolean(), nullable=True),
+        sa.Column("is_contribution", sa.Boolean(), nullable=True),
+        sa.Column("is_soul_bound", sa.Boolean(), nullable=True),
+        sa.Column("contract_address", sa.String(), nullable=True),
+    )
+    op.create_index("ix_badge_id", "badge", ["id"])
+    
+    op.create_table(
+        "task",
+        *_timestamps(),
+        sa.Column("title", sa.String(), nullable=False),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("taiga_task_id", sa.Integer(), nullable=True),
+        sa.Column("status", sa.String(), nullable=False),
+        sa.Column("priority", sa.String(), nullable=True),
+        sa.Column("assignee_id", sa.Integer(), sa.ForeignKey("user.id"), nullable=True),
+        sa.Column("project_id", sa.Integer(), sa.ForeignKey("project.id"), nullable=False),
+    )
+    op.create_index("ix_task_id", "task", ["id"])
+    op.create_index("ix_task_title", "task", ["title"])
+    op.create_index("ix_task_taiga_task_id", "task", ["taiga_task_id"], unique=True)
+    
+    op.create_table(
+        "contribution",
+        *_timestamps(),
+        sa.Column("title", sa.String(), nullable=False),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("type", contribution_type, nullable=False),
+        sa.Column("status", contribution_status, nullable=False),
+        sa.Column("value", sa.Float(), nullable=False),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("user.id"), nullable=False),
+        sa.Column("project_id", sa.Integer(), sa.ForeignKey("project.id"), nullable=False),
+        sa.Column("task_id", sa.Integer(), sa.ForeignKey("task.id"), nullable=True),
+        sa.Column("transaction_hash", sa.String(), nullable=True),
+        sa.Column("token_amount", sa.Float(), nullable=True),
+    )
+    op.create_index("ix_contribution_id", "contribution", ["id"])
+    
+    op.create_table(
+        "userbadge",
+        *_timestamps(),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("user.id"), nullable=False),
+        sa.Column("badge_id", sa.Integer(), sa.ForeignKey("badge.id"), nullable=False),
+        sa.Column("is_visible", sa.Boolean(), nullable=True),
+        sa.Column("transaction_hash", sa.String(), nullable=True),
+        sa.Column("token_id", sa.Integer(), nullable=True),
+    )
+    op.create_index("ix_userbadge_id", "userbadge", ["id"])
+    
+    op.create_table(
+        "token",
+        *_timestamps(),
+        sa.Column("amount", sa.Float(), nullable=False),
+        sa.Column("type", token_type, nullable=False),
+        sa.Column("transaction_hash", sa.String(), nullable=True),
+        sa.Column("status", token_status, nullable=False),
+        sa.Column("contract_address", sa.String(), nullable=True),
+        sa.Column("token_id", sa.Integer(), nullable=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("user.id"), nullable=False),
+        sa.Column("contribution_id", sa.Integer(), sa.ForeignKey("contribution.id"), nullable=True),
+    )
+    op.create_index("ix_token_id", "token", ["id"])
+    op.create_index("ix_token_transaction_hash", "token", ["transaction_hash"])
+
+def downgrade() -> None:
+    """Revert the migration."""
+    for table in ("token", "userbadge", "contribution", "task", "badge", "project", "user"):
+        op.drop_table(table)
+    
+    bind = op.get_bind()
+    for enum_type in (token_status, token_type, contribution_status, contribution_type):
+        enum_type.drop(bind, checkfirst=True)
@@ -0,0 +1,42 @@
+"""Add transactional outbox.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# Revision identifiers, used by Alembic
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    """Apply the migration."""
+    op.create_table(
+        "outboxevent",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.Column("topic", sa.String(), nullable=False),
+        sa.Column("payload", sa.JSON(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=True),
+        sa.Column("project_id", sa.Integer(), nullable=True),
+        sa.Column("published_at", sa.DateTime(), nullable=True),
+        sa.Column("attempts", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("last_error", sa.Text(), nullable=True),
+    )
+    op.create_index("ix_outboxevent_id", "outboxevent", ["id"])
+    op.create_index(
+        "ix_outboxevent_unpublished",
+        "outboxevent",
+        ["id"],
+        postgresql_where=sa.text("published_at IS NULL"),
+    )
+
+def downgrade() -> None:
+    """Revert the migration."""
+    op.drop_table("outboxevent")
@@ -0,0 +1,28 @@
+"""Add user.is_superuser.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# Revision identifiers, used by Alembic
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    """Apply the migration."""
+    op.add_column(
+        "user",
+        sa.Column("is_superuser", sa.Boolean(), nullable=False, server_default=sa.false()),
+    )
+    # The seeded administrator keeps administrator rights
+    op.execute("""UPDATE "user" SET is_superuser = TRUE WHERE username = 'admin'""")
+
+def downgrade() -> None:
+    """Revert the migration."""
+    op.drop_column("user", "is_superuser")
@@ -0,0 +1,45 @@
+"""Add user activity timeline.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# Revision identifiers, used by Alembic
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+activity_kind = sa.Enum("CONTRIBUTION", "BADGE", "TOKEN", name="activitykind")
+
+def upgrade() -> None:
+    """Apply the migration."""
+    op.create_table(
+        "activity",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.Column(
+            "user_id",
+            sa.Integer(),
+            sa.ForeignKey("user.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("kind", activity_kind, nullable=False),
+        sa.Column("subject_id", sa.Integer(), nullable=False),
+        sa.Column("project_id", sa.Integer(), nullable=True),
+        sa.Column("occurred_at", sa.DateTime(), nullable=False),
+        sa.Column("data", sa.JSON(), nullable=False),
+        sa.UniqueConstraint("kind", "subject_id", name="uq_activity_subject"),
+    )
+    op.create_index("ix_activity_id", "activity", ["id"])
+    op.create_index("ix_activity_timeline", "activity", ["user_id", "occurred_at", "id"])
+
+def downgrade() -> None:
+    """Revert the migration."""
+    op.drop_table("activity")
+    activity_kind.drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,58 @@
+"""Add daily contribution rollups.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# Revision identifiers, used by Alembic
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+# Enum types created by revision 0001
+contribution_type = postgresql.ENUM(name="contributiontype", create_type=False)
+contribution_status = postgresql.ENUM(name="contributionstatus", create_type=False)
+
+def upgrade() -> None:
+    """Apply the migration."""
+    op.create_table(
+        "contributiondaily",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("project_id", sa.Integer(), nullable=False),
+        sa.Column("type", contribution_type, nullable=False),
+        sa.Column("status", contribution_status, nullable=False),
+        sa.Column("count", sa.Integer(), nullable=False),
+        sa.Column("value", sa.Float(), nullable=False),
+        sa.Column("token_amount", sa.Float(), nullable=False),
+        sa.UniqueConstraint("day", "project_id", "type", "status", name="uq_contributiondaily_key"),
+    )
+    op.create_index("ix_contributiondaily_id", "contributiondaily", ["id"])
+    op.create_index("ix_contributiondaily_project_day", "contributiondaily", ["project_id", "day"])
+    
+    op.create_table(
+        "rollupwatermark",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.Column("name", sa.String(), nullable=False, unique=True),
+        sa.Column("watermark", sa.DateTime(), nullable=False),
+    )
+    op.create_index("ix_rollupwatermark_id", "rollupwatermark", ["id"])
+    
+    # Lets the incremental refresh find the rows changed since its watermark
+    op.create_index("ix_contribution_updated_at", "contribution", ["updated_at"])
+
+def downgrade() -> None:
+    """Revert the migration."""
+    op.drop_index("ix_contribution_updated_at", table_name="contribution")
+    op.drop_table("rollupwatermark")
+    op.drop_table("contributiondaily")
@@ -0,0 +1,137 @@
+"""Partition contribution and token by month of creation.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-19
+"""
+
+from datetime import date, datetime
+
+from alembic import op
+import sqlalchemy as sa
+
+# Revision identifiers, used by Alembic
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+# Monthly partitions created ahead of the current month
+PREMAKE_MONTHS = 3
+
+# Foreign keys of each table, recreated on the partitioned table
+FOREIGN_KEYS = {
+    "contribution": [
+        ("contribution_user_id_fkey", "user_id", "user"),
+        ("contribution_project_id_fkey", "project_id", "project"),
+        ("contribution_task_id_fkey", "task_id", "task"),
+    ],
+    "token": [
+        ("token_user_id_fkey", "user_id", "user"),
+    ],
+}
+
+# Indexes of each table, recreated on the partitioned table
+INDEXES = {
+    "contribution": [
+        ("ix_contribution_id", ["id"]),
+        ("ix_contribution_updated_at", ["updated_at"]),
+    ],
+    "token": [
+        ("ix_token_id", ["id"]),
+        ("ix_token_transaction_hash", ["transaction_hash"]),
+    ],
+}
+
+def _add_months(month: date, months: int) -> date:
+    """First day of the month ``months`` after ``month``."""
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+def _partition(table: str) -> None:
+    """Rebuild a table as a partitioned table with monthly partitions."""
+    bind = op.get_bind()
+    old = f"{table}_unpartitioned"
+    
+    op.execute(f'ALTER TABLE "{table}" RENAME TO "{old}"')
+    op.execute(f'ALTER TABLE "{old}" RENAME CONSTRAINT "{table}_pkey" TO "{old}_pkey"')
+    op.execute(f'ALTER SEQUENCE "{table}_id_seq" OWNED BY NONE')
+    for name, _ in INDEXES[table]:
+        op.execute(f'DROP INDEX IF EXISTS "{name}"')
+    
+    # The primary key of a partitioned table must include the partition key
+    op.execute(
+        f'CREATE TABLE "{table}" (LIKE "{old}" INCLUDING DEFAULTS INCLUDING CONSTRAINTS) '
+        f"PARTITION BY RANGE (created_at)"
+    )
+    op.execute(f'ALTER TABLE "{table}" ADD CONSTRAINT "{table}_pkey" PRIMARY KEY (id, created_at)')
+    for name, column, target in FOREIGN_KEYS[table]:
+        op.execute(
+            f'ALTER TABLE "{table}" ADD CONSTRAINT "{name}" '
+            f'FOREIGN KEY ({column}) REFERENCES "{target}" (id)'
+        )
+    
+    first = bind.execute(sa.text(f'SELECT min(created_at) FROM "{old}"')).scalar()
+    today = datetime.utcnow().date()
+    month = date((first or today).year, (first or today).month, 1)
+    last = _add_months(date(today.year, today.month, 1), PREMAKE_MONTHS)
+    while month <= last:
+        end = _add_months(month, 1)
+        op.execute(
+            f'CREATE TABLE "{table}_p{month:%Y_%m}" PARTITION OF "{table}" '
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{end.isoformat()}')"
+        )
+        month = end
+    op.execute(f'CREATE TABLE "{table}_default" PARTITION OF "{table}" DEFAULT')
+    
+    op.execute(f'INSERT INTO "{table}" SELECT * FROM "{old}"')
+    op.execute(f'DROP TABLE "{old}"')
+    op.execute(f'ALTER SEQUENCE "{table}_id_seq" OWNED BY "{table}".id')
+    
+    # Indexes on the parent cascade to every current and future partition
+    for name, columns in INDEXES[table]:
+        op.create_index(name, table, columns)
+
+def _unpartition(table: str) -> None:
+    """Rebuild a partitioned table as a plain table."""
+    old = f"{table}_partitioned"
+    
+    op.execute(f'ALTER TABLE "{table}" RENAME TO "{old}"')
+    op.execute(f'ALTER TABLE "{old}" RENAME CONSTRAINT "{table}_pkey" TO "{old}_pkey"')
+    op.execute(f'ALTER SEQUENCE "{table}_id_seq" OWNED BY NONE')
+    for name, _ in INDEXES[table]:
+        op.execute(f'DROP INDEX IF EXISTS "{name}"')
+    
+    op.execute(f'CREATE TABLE "{table}" (LIKE "{old}" INCLUDING DEFAULTS INCLUDING CONSTRAINTS)')
+    op.execute(f'ALTER TABLE "{table}" ADD CONSTRAINT "{table}_pkey" PRIMARY KEY (id)')
+    for name, column, target in FOREIGN_KEYS[table]:
+        op.execute(f'ALTER TABLE "{old}" DROP CONSTRAINT "{name}"')
+        op.execute(
+            f'ALTER TABLE "{table}" ADD CONSTRAINT "{name}" '
+            f'FOREIGN KEY ({column}) REFERENCES "{target}" (id)'
+        )
+    
+    op.execute(f'INSERT INTO "{table}" SELECT * FROM "{old}"')
+    op.execute(f'DROP TABLE "{old}" CASCADE')
+    op.execute(f'ALTER SEQUENCE "{table}_id_seq" OWNED BY "{table}".id')
+    
+    for name, columns in INDEXES[table]:
+        op.create_index(name, table, columns)
+
+def upgrade() -> None:
+    """Apply the migration."""
+    # A foreign key can only reference a unique key covering the partition
+    # key, so token.contribution_id is no longer enforced by the database
+    op.drop_constraint("token_contribution_id_fkey", "token", type_="foreignkey")
+    
+    _partition("contribution")
+    _partition("token")
+
+def downgrade() -> None:
+    """Revert the migration."""
+    _unpartition("token")
+    _unpartition("contribution")
+    
+    op.create_foreign_key(
+        "token_contribution_id_fkey", "token", "contribution", ["contribution_id"], ["id"],
+    )
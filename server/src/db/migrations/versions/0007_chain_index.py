@@ -0,0 +1,71 @@
+"""Add on-chain event index.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# Revision identifiers, used by Alembic
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+chain_event_type = sa.Enum("MINT", "TRANSFER", "BURN", name="chaineventtype")
+
+def _timestamps():
+    """Columns shared by every table through BaseModel."""
+    return [
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+    ]
+
+def upgrade() -> None:
+    """Apply the migration."""
+    op.create_table(
+        "chainevent",
+        *_timestamps(),
+        sa.Column("block_number", sa.BigInteger(), nullable=False),
+        sa.Column("block_hash", sa.String(66), nullable=False),
+        sa.Column("transaction_hash", sa.String(66), nullable=False),
+        sa.Column("log_index", sa.Integer(), nullable=False),
+        sa.Column("contract_address", sa.String(42), nullable=False),
+        sa.Column("type", chain_event_type, nullable=False),
+        sa.Column("from_address", sa.String(42), nullable=False),
+        sa.Column("to_address", sa.String(42), nullable=False),
+        sa.Column("token_id", sa.Numeric(78, 0), nullable=True),
+        sa.Column("amount", sa.Numeric(78, 0), nullable=True),
+        sa.UniqueConstraint("block_hash", "log_index", name="uq_chainevent_log"),
+    )
+    op.create_index("ix_chainevent_id", "chainevent", ["id"])
+    op.create_index("ix_chainevent_to_address", "chainevent", ["to_address", "block_number", "log_index"])
+    op.create_index("ix_chainevent_from_address", "chainevent", ["from_address", "block_number", "log_index"])
+    op.create_index("ix_chainevent_block_number", "chainevent", ["block_number"])
+    
+    op.create_table(
+        "chainblock",
+        *_timestamps(),
+        sa.Column("number", sa.BigInteger(), nullable=False, unique=True),
+        sa.Column("hash", sa.String(66), nullable=False),
+    )
+    op.create_index("ix_chainblock_id", "chainblock", ["id"])
+    
+    op.create_table(
+        "chaincheckpoint",
+        *_timestamps(),
+        sa.Column("name", sa.String(), nullable=False, unique=True),
+        sa.Column("block_number", sa.BigInteger(), nullable=False),
+        sa.Column("block_hash", sa.String(66), nullable=False),
+    )
+    op.create_index("ix_chaincheckpoint_id", "chaincheckpoint", ["id"])
+
+def downgrade() -> None:
+    """Revert the migration."""
+    op.drop_table("chaincheckpoint")
+    op.drop_table("chainblock")
+    op.drop_table("chainevent")
+    chain_event_type.drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,23 @@
+"""Add outboxevent.next_attempt_at for relay retry backoff.
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# Revision identifiers, used by Alembic
+revision = "0008"
+down_revision = "0007"
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    """Apply the migration."""
+    op.add_column("outboxevent", sa.Column("next_attempt_at", sa.DateTime(), nullable=True))
+
+def downgrade() -> None:
+    """Revert the migration."""
+    op.drop_column("outboxevent", "next_attempt_at")
@@ -6,6 +6,10 @@ from .project import Project, Task
 from .contribution import Contribution, ContributionType, ContributionStatus
 from .badge import Badge, UserBadge
 from .token import Token, TokenType, TokenStatus
+from .outbox import OutboxEvent
+from .activity import Activity, ActivityKind
+from .analytics import ContributionDaily, RollupWatermark
+from .chain import ChainEvent, ChainEventType, ChainBlock, ChainCheckpoint
 
 __all__ = [
     "BaseModel",
@@ -20,4 +24,13 @@ __all__ = [
     "Token",
     "TokenType",
     "TokenStatus",
+    "OutboxEvent",
+    "Activity",
+    "ActivityKind",
+    "ContributionDaily",
+    "RollupWatermark",
+    "ChainEvent",
+    "ChainEventType",
+    "ChainBlock",
+    "ChainCheckpoint",
 ]
\ No newline at end of file
@@ -0,0 +1,39 @@
+from sqlalchemy import Column, Integer, DateTime, JSON, ForeignKey, Enum, Index, UniqueConstraint
+import enum
+
+from .base import BaseModel
+
+class ActivityKind(str, enum.Enum):
+    """Enum for activity timeline entry kinds."""
+    
+    CONTRIBUTION = "contribution"
+    BADGE = "badge"
+    TOKEN = "token"
+
+class Activity(BaseModel):
+    """Entry of a user's activity timeline, written alongside its subject row."""
+    
+    # Timeline owner
+    user_id = Column(Integer, ForeignKey("user.id", ondelete="CASCADE"), nullable=False)
+    
+    # Subject of the entry: a contribution, user badge or token row
+    kind = Column(Enum(ActivityKind), nullable=False)
+    subject_id = Column(Integer, nullable=False)
+    project_id = Column(Integer, nullable=True)
+    
+    # When the subject happened, which orders the timeline
+    occurred_at = Column(DateTime, nullable=False)
+    
+    # Denormalized subject fields needed to render the entry
+    data = Column(JSON, nullable=False, default=dict)
+    
+    __table_args__ = (
+        # One entry per subject, which makes the backfill idempotent
+        UniqueConstraint("kind", "subject_id", name="uq_activity_subject"),
+        # Serves a timeline page as a single backward index range scan
+        Index("ix_activity_timeline", "user_id", "occurred_at", "id"),
+    )
+    
+    def __repr__(self):
+        """String representation of the activity."""
+        return f"<Activity(id={self.id}, kind={self.kind}, user_id={self.user_id})>"
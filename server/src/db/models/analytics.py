@@ -0,0 +1,38 @@
+from sqlalchemy import Column, String, Integer, Float, Date, DateTime, Enum, UniqueConstraint, Index
+
+from .base import BaseModel
+from .contribution import ContributionType, ContributionStatus
+
+class ContributionDaily(BaseModel):
+    """Daily rollup of contributions per project, type and status."""
+    
+    # Rollup key
+    day = Column(Date, nullable=False)
+    project_id = Column(Integer, nullable=False)
+    type = Column(Enum(ContributionType), nullable=False)
+    status = Column(Enum(ContributionStatus), nullable=False)
+    
+    # Aggregates
+    count = Column(Integer, nullable=False, default=0)
+    value = Column(Float, nullable=False, default=0.0)
+    token_amount = Column(Float, nullable=False, default=0.0)
+    
+    __table_args__ = (
+        UniqueConstraint("day", "project_id", "type", "status", name="uq_contributiondaily_key"),
+        # Range queries filtered by project
+        Index("ix_contributiondaily_project_day", "project_id", "day"),
+    )
+    
+    def __repr__(self):
+        """String representation of the daily rollup."""
+        return f"<ContributionDaily(day={self.day}, project_id={self.project_id}, type={self.type})>"
+
+class RollupWatermark(BaseModel):
+    """Point up to which a rollup has processed its source rows."""
+    
+    name = Column(String, nullable=False, unique=True)
+    watermark = Column(DateTime, nullable=False)
+    
+    def __repr__(self):
+        """String representation of the watermark."""
+        return f"<RollupWatermark(name={self.name}, watermark={self.watermark})>"
@@ -0,0 +1,64 @@
+from sqlalchemy import Column, String, Integer, BigInteger, Numeric, Enum, UniqueConstraint, Index
+import enum
+
+from .base import BaseModel
+
+class ChainEventType(str, enum.Enum):
+    """Enum for indexed token transfer kinds."""
+    
+    MINT = "mint"
+    TRANSFER = "transfer"
+    BURN = "burn"
+
+class ChainEvent(BaseModel):
+    """Token transfer log emitted by the portal contract, decoded by the indexer."""
+    
+    # Log position
+    block_number = Column(BigInteger, nullable=False)
+    block_hash = Column(String(66), nullable=False)
+    transaction_hash = Column(String(66), nullable=False)
+    log_index = Column(Integer, nullable=False)
+    contract_address = Column(String(42), nullable=False)
+    
+    # Decoded transfer; addresses are lower-case hex
+    type = Column(Enum(ChainEventType), nullable=False)
+    from_address = Column(String(42), nullable=False)
+    to_address = Column(String(42), nullable=False)
+    # ERC-721 token id or ERC-20 amount, uint256 on chain
+    token_id = Column(Numeric(78, 0), nullable=True)
+    amount = Column(Numeric(78, 0), nullable=True)
+    
+    __table_args__ = (
+        # Re-indexing a range after an interrupted run inserts nothing twice
+        UniqueConstraint("block_hash", "log_index", name="uq_chainevent_log"),
+        # Wallet history, newest first
+        Index("ix_chainevent_to_address", "to_address", "block_number", "log_index"),
+        Index("ix_chainevent_from_address", "from_address", "block_number", "log_index"),
+        # Reorg rollback
+        Index("ix_chainevent_block_number", "block_number"),
+    )
+    
+    def __repr__(self):
+        """String representation of the chain event."""
+        return f"<ChainEvent(id={self.id}, type={self.type}, block_number={self.block_number})>"
+
+class ChainBlock(BaseModel):
+    """Hash of an indexed block, kept to detect reorgs."""
+    
+    number = Column(BigInteger, nullable=False, unique=True)
+    hash = Column(String(66), nullable=False)
+    
+    def __repr__(self):
+        """String representation of the chain block."""
+        return f"<ChainBlock(number={self.number}, hash={self.hash})>"
+
+class ChainCheckpoint(BaseModel):
+    """Last block an indexer has fully processed."""
+    
+    name = Column(String, nullable=False, unique=True)
+    block_number = Column(BigInteger, nullable=False)
+    block_hash = Column(String(66), nullable=False)
+    
+    def __repr__(self):
+        """String representation of the checkpoint."""
+        return f"<ChainCheckpoint(name={self.name}, block_number={self.block_number})>"
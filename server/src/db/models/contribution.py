@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, Text, Float, ForeignKey, Enum
+from sqlalchemy import Column, String, Integer, Text, Float, ForeignKey, Enum, Index
 from sqlalchemy.orm import relationship
 import enum
 
@@ -23,7 +23,15 @@ class ContributionStatus(str, enum.Enum):
     REJECTED = "rejected"
 
 class Contribution(BaseModel):
-    """Contribution model for tracking user contributions."""
+    """
+    Contribution model for tracking user contributions.
+    
+    The table is partitioned by month of ``created_at`` (see
+    ``db.partitions``) and its database primary key is (id, created_at), as
+    created by migration 0006, which is authoritative for its DDL. The model
+    maps ``id`` alone, which stays unique through the shared sequence, so
+    rows are still loaded by id.
+    """
     
     # Contribution information
     title = Column(String, nullable=False)
@@ -50,6 +58,11 @@ class Contribution(BaseModel):
     project = relationship("Project", back_populates="contributions")
     task = relationship("Task", back_populates="contributions")
     
+    __table_args__ = (
+        # Lets incremental rollups find the rows changed since their watermark
+        Index("ix_contribution_updated_at", "updated_at"),
+    )
+    
     def __repr__(self):
         """String representation of the contribution."""
         return f"<Contribution(id={self.id}, type={self.type}, user_id={self.user_id})>"
\ No newline at end of file
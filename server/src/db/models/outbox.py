@@ -0,0 +1,34 @@
+from sqlalchemy import Column, String, Integer, Text, DateTime, JSON, Index
+
+from .base import BaseModel
+
+class OutboxEvent(BaseModel):
+    """Domain event written in the same transaction as the change it describes."""
+    
+    # Event information
+    topic = Column(String, nullable=False)
+    payload = Column(JSON, nullable=False)
+    
+    # Routing information
+    user_id = Column(Integer, nullable=True)
+    project_id = Column(Integer, nullable=True)
+    
+    # Relay tracking
+    published_at = Column(DateTime, nullable=True)
+    attempts = Column(Integer, nullable=False, default=0)
+    last_error = Column(Text, nullable=True)
+    # Earliest time a failed event is retried, backing off exponentially
+    next_attempt_at = Column(DateTime, nullable=True)
+    
+    __table_args__ = (
+        # Keeps the relay's "oldest unpublished first" scan small
+        Index(
+            "ix_outboxevent_unpublished",
+            "id",
+            postgresql_where=published_at.is_(None),
+        ),
+    )
+    
+    def __repr__(self):
+        """String representation of the outbox event."""
+        return f"<OutboxEvent(id={self.id}, topic={self.topic})>"
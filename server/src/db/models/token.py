@@ -21,7 +21,12 @@ class TokenStatus(str, enum.Enum):
     FAILED = "failed"
 
 class Token(BaseModel):
-    """Token model for blockchain token transactions and balances."""
+    """
+    Token model for blockchain token transactions and balances.
+    
+    Partitioned like ``Contribution``; migration 0006 is authoritative for
+    the table's DDL.
+    """
     
     # Token information
     amount = Column(Float, nullable=False)
@@ -37,11 +42,17 @@ class Token(BaseModel):
     
     # Relationships
     user_id = Column(Integer, ForeignKey("user.id"), nullable=False)
-    contribution_id = Column(Integer, ForeignKey("contribution.id"), nullable=True)
+    # Not a foreign key: the partitioned contribution table has no unique key
+    # on id alone for it to reference
+    contribution_id = Column(Integer, nullable=True)
     
     # Relationships
     user = relationship("User", back_populates="tokens")
-    contribution = relationship("Contribution")
+    contribution = relationship(
+        "Contribution",
+        primaryjoin="foreign(Token.contribution_id) == Contribution.id",
+        viewonly=True,
+    )
     
     def __repr__(self):
         """String representation of the token."""
@@ -0,0 +1,197 @@
+"""
+Monthly range partitions of the append-heavy tables.
+
+``contribution`` and ``token`` are partitioned by ``RANGE (created_at)``
+with one partition per calendar month, named ``<table>_pYYYY_MM``, plus a
+``<table>_default`` partition catching rows outside every monthly range.
+Queries filtered on ``created_at`` only touch the matching partitions, and
+each partition has its own small heap and indexes to vacuum.
+
+:func:`maintain_partitions` runs periodically (see ``tasks.partitions``). It
+creates the partitions of the coming months ahead of time, so new rows never
+land in the default partition, and detaches the partitions that fell out of
+the retention window. Detached partitions stay in the database as plain
+tables until they are archived and dropped.
+"""
+
+import logging
+import re
+from datetime import date, datetime
+from typing import Dict, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from ..config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+PARTITIONED_TABLES = ("contribution", "token")
+
+# Tables whose old partitions may leave the live table. Token balances are
+# summed over all of a user's token rows, so token partitions always stay.
+EXPIRING_TABLES = ("contribution",)
+
+# Arbitrary application-wide key serializing partition maintenance
+PARTITION_LOCK_KEY = 7_204_313
+
+_PARTITION_NAME = re.compile(r"^(?P<table>\w+)_p(?P<year>\d{4})_(?P<month>\d{2})$")
+
+def month_start(day: date) -> date:
+    """First day of the month of ``day``."""
+    return date(day.year, day.month, 1)
+
+def add_months(month: date, months: int) -> date:
+    """First day of the month ``months`` after ``month``."""
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+def partition_name(table: str, month: date) -> str:
+    """
+    Name of a table's partition for a month.
+    
+    Args:
+        table: Partitioned table
+        month: Any day of the month
+        
+    Returns:
+        str: Partition name
+    """
+    return f"{table}_p{month:%Y_%m}"
+
+def partition_month(name: str) -> Optional[date]:
+    """
+    Month covered by a monthly partition.
+    
+    Args:
+        name: Partition name
+        
+    Returns:
+        Optional[date]: First day of the month, None if not a monthly partition
+    """
+    match = _PARTITION_NAME.match(name)
+    if match is None:
+        return None
+    return date(int(match["year"]), int(match["month"]), 1)
+
+def attached_partitions(db: Session, table: str) -> List[str]:
+    """
+    List the partitions currently attached to a table.
+    
+    Args:
+        db: Database session
+        table: Partitioned table
+        
+    Returns:
+        List[str]: Partition names
+    """
+    return list(db.scalars(
+        text(
+            "SELECT c.relname FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = CAST(:table AS regclass) "
+            "ORDER BY c.relname"
+        ),
+        {"table": f'"{table}"'},
+    ))
+
+def create_partition(db: Session, table: str, month: date) -> str:
+    """
+    Create a table's partition for a month.
+    
+    Rows of that month already in the default partition are moved into the
+    new partition; Postgres refuses to attach a range the default partition
+    has rows for.
+    
+    Args:
+        db: Database session
+        table: Partitioned table
+        month: Any day of the month
+        
+    Returns:
+        str: Partition name
+    """
+    start = month_start(month)
+    end = add_months(start, 1)
+    name = partition_name(table, start)
+    default = f"{table}_default"
+    bounds = {"start": datetime.combine(start, datetime.min.time()), "end": datetime.combine(end, datetime.min.time())}
+    
+    stray = db.scalar(
+        text(f'SELECT EXISTS (SELECT 1 FROM "{default}" WHERE created_at >= :start AND created_at < :end)'),
+        bounds,
+    )
+    if stray:
+        db.execute(text(f'ALTER TABLE "{table}" DETACH PARTITION "{default}"'))
+    
+    db.execute(text(
+        f'CREATE TABLE IF NOT EXISTS "{name}" PARTITION OF "{table}" '
+        f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+    ))
+    
+    if stray:
+        db.execute(
+            text(
+                f'WITH moved AS (DELETE FROM "{default}" '
+                f"WHERE created_at >= :start AND created_at < :end RETURNING *) "
+                f'INSERT INTO "{table}" SELECT * FROM moved'
+            ),
+            bounds,
+        )
+        db.execute(text(f'ALTER TABLE "{table}" ATTACH PARTITION "{default}" DEFAULT'))
+        logger.warning("Moved rows of %s from %s into %s", start, default, name)
+    
+    return name
+
+def detach_partition(db: Session, table: str, name: str) -> None:
+    """
+    Detach a partition, leaving it as a standalone table.
+    
+    Args:
+        db: Database session
+        table: Partitioned table
+        name: Partition name
+    """
+    db.execute(text(f'ALTER TABLE "{table}" DETACH PARTITION "{name}"'))
+
+def maintain_partitions(db: Session, today: Optional[date] = None) -> Dict[str, Dict[str, List[str]]]:
+    """
+    Create upcoming partitions and detach expired ones.
+    
+    Keeps ``PARTITION_PREMAKE_MONTHS`` months of partitions ahead of the
+    current one and, when ``PARTITION_RETENTION_MONTHS`` is set, detaches
+    the partitions of ``EXPIRING_TABLES`` that ended more than that many
+    months ago.
+    
+    Args:
+        db: Database session
+        today: Reference day, today by default
+        
+    Returns:
+        Dict[str, Dict[str, List[str]]]: Created and detached partitions per table
+    """
+    db.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": PARTITION_LOCK_KEY})
+    
+    current = month_start(today or datetime.utcnow().date())
+    changes = {}
+    for table in PARTITIONED_TABLES:
+        attached = set(attached_partitions(db, table))
+        created, detached = [], []
+        
+        for offset in range(settings.PARTITION_PREMAKE_MONTHS + 1):
+            month = add_months(current, offset)
+            if partition_name(table, month) not in attached:
+                created.append(create_partition(db, table, month))
+        
+        if settings.PARTITION_RETENTION_MONTHS > 0 and table in EXPIRING_TABLES:
+            cutoff = add_months(current, -settings.PARTITION_RETENTION_MONTHS)
+            for name in sorted(attached):
+                month = partition_month(name)
+                if month is not None and month < cutoff:
+                    detach_partition(db, table, name)
+                    detached.append(name)
+        
+        changes[table] = {"created": created, "detached": detached}
+    
+    db.commit()
+    return changes
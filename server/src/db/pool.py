@@ -0,0 +1,109 @@
+"""Connection pool instrumented with checkout wait statistics."""
+
+import math
+import threading
+import time
+
+from sqlalchemy import event, exc
+from sqlalchemy.pool import QueuePool
+
+class CheckoutWaitTracker:
+    """
+    Exponentially weighted moving average of pool checkout wait time.
+    
+    The average decays towards zero while no checkouts happen, so a pool
+    that stopped being used (for example because requests are being shed)
+    is not reported as saturated forever.
+    """
+    
+    def __init__(self, half_life: float = 1.0, alpha: float = 0.2):
+        """
+        Initialize the tracker.
+        
+        Args:
+            half_life: Seconds of inactivity after which the average halves
+            alpha: Weight given to each new sample
+        """
+        self._decay = math.log(2) / half_life
+        self._alpha = alpha
+        self._value = 0.0
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self.listeners = []
+    
+    def observe(self, wait: float) -> None:
+        """
+        Record one checkout wait.
+        
+        Args:
+            wait: Seconds spent waiting for a connection
+        """
+        now = time.monotonic()
+        with self._lock:
+            decayed = self._value * math.exp(-self._decay * (now - self._updated))
+            self._value = decayed + self._alpha * (wait - decayed)
+            self._updated = now
+        for listener in self.listeners:
+            listener(wait)
+    
+    @property
+    def value(self) -> float:
+        """Current decayed average wait in seconds."""
+        with self._lock:
+            return self._value * math.exp(-self._decay * (time.monotonic() - self._updated))
+
+
+class TimedQueuePool(QueuePool):
+    """QueuePool that measures how long each checkout waits for a connection."""
+    
+    def __init__(self, *args, **kwargs):
+        """Initialize the pool and its wait tracker."""
+        super().__init__(*args, **kwargs)
+        self.checkout_wait = CheckoutWaitTracker()
+    
+    def _do_get(self):
+        """Check out a connection, recording the time spent waiting."""
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            self.checkout_wait.observe(time.perf_counter() - start)
+    
+    def recreate(self):
+        """Recreate the pool, keeping the wait tracker."""
+        new_pool = super().recreate()
+        new_pool.checkout_wait = self.checkout_wait
+        return new_pool
+
+def install_idle_ping(engine, idle_seconds: float) -> None:
+    """
+    Ping connections that sat idle in the pool before handing them out.
+    
+    Connections checked in less than ``idle_seconds`` ago are handed out
+    without a round trip; older ones are tested with ``SELECT 1`` and
+    replaced transparently if the server closed them. Disconnects on busy
+    connections are still caught when a statement fails, which makes
+    SQLAlchemy invalidate the pool.
+    
+    Args:
+        engine: SQLAlchemy engine
+        idle_seconds: Idle time after which a connection is pinged
+    """
+    @event.listens_for(engine, "checkin")
+    def _on_checkin(dbapi_connection, connection_record):
+        connection_record.info["checked_in_at"] = time.monotonic()
+    
+    @event.listens_for(engine, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        checked_in_at = connection_record.info.get("checked_in_at")
+        if checked_in_at is None or time.monotonic() - checked_in_at < idle_seconds:
+            return
+        cursor = dbapi_connection.cursor()
+        try:
+            cursor.execute("SELECT 1")
+            dbapi_connection.rollback()
+        except Exception:
+            # Makes the pool discard this connection and retry with a new one
+            raise exc.DisconnectionError()
+        finally:
+            cursor.close()
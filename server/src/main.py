@@ -1,10 +1,23 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 
 from .config.settings import settings
-from .db.database import engine, Base
 from .api.routes import api_router
-from .db.init_db import init_db
+from .db.database import engine
+from .utils.admission import AdmissionControlMiddleware
+from .utils.coalesce import CoalescingMiddleware
+from .utils.encoding import ContentNegotiationMiddleware
+from .utils.idempotency import IdempotencyMiddleware
+from .utils.metrics import (
+    CONTENT_TYPE_LATEST,
+    CeleryQueueCollector,
+    MetricsMiddleware,
+    instrument_pool,
+    render_metrics,
+)
+from .utils.redis_client import get_redis
+from .utils.tracing import configure_tracing, instrument_app, instrument_engine, instrument_libraries
+from .worker import celery
 
 # Create FastAPI app
 app = FastAPI(
@@ -16,7 +29,59 @@ app = FastAPI(
     openapi_url=f"{settings.API_PREFIX}/openapi.json",
 )
 
-# Add CORS middleware
+# Replay POST responses for retried Idempotency-Key requests (innermost, so
+# stored responses are plain JSON whatever the client negotiates)
+app.add_middleware(
+    IdempotencyMiddleware,
+    ttl=settings.IDEMPOTENCY_TTL,
+    lock_ttl=settings.IDEMPOTENCY_LOCK_TTL,
+    wait=settings.IDEMPOTENCY_WAIT,
+    poll_interval=settings.IDEMPOTENCY_POLL_INTERVAL,
+    # Access tokens are never written to Redis
+    exempt_paths=(f"{settings.API_PREFIX}/auth/token", f"{settings.API_PREFIX}/auth/refresh"),
+)
+
+# Share one execution among identical concurrent reads of hot resources
+app.add_middleware(
+    CoalescingMiddleware,
+    paths=(
+        f"{settings.API_PREFIX}/projects/{{project_id}}",
+        f"{settings.API_PREFIX}/contributions/project/{{project_id}}",
+    ),
+    redis=settings.COALESCE_REDIS,
+    lock_ttl=settings.COALESCE_LOCK_TTL,
+    wait=settings.COALESCE_WAIT,
+    poll_interval=settings.COALESCE_POLL_INTERVAL,
+)
+
+# Serve MessagePack and compressed bodies on request (inside metrics and
+# tracing, so they include the encoding cost)
+app.add_middleware(
+    ContentNegotiationMiddleware,
+    min_size=settings.COMPRESSION_MIN_SIZE,
+    thread_min_size=settings.COMPRESSION_THREAD_MIN_SIZE,
+)
+
+# Shed load with 503 before the database pool saturates
+app.add_middleware(
+    AdmissionControlMiddleware,
+    max_in_flight=settings.ADMISSION_MAX_IN_FLIGHT,
+    max_pool_wait=settings.ADMISSION_MAX_POOL_WAIT_MS / 1000,
+    pool_wait=lambda: engine.pool.checkout_wait.value,
+    retry_after=settings.ADMISSION_RETRY_AFTER_SECONDS,
+    exempt_paths=("/", "/health", "/metrics", f"{settings.API_PREFIX}/events/stream"),
+)
+
+# Record request latency and in-flight requests, including shed requests
+app.add_middleware(MetricsMiddleware)
+instrument_pool(engine)
+
+# Trace requests, SQL statements, outbound HTTP calls and enqueued tasks
+instrument_app(app)
+instrument_engine(engine)
+instrument_libraries()
+
+# Add CORS middleware (outermost, so rejected requests still carry CORS headers)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],  # Modify in production
@@ -25,9 +90,8 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Create database tables
-# Comment this out if using Alembic migrations
-# Base.metadata.create_all(bind=engine)
+# Database schema is managed by Alembic (``alembic upgrade head``) and seed
+# data by ``python -m src.db.init_db``; application startup does neither.
 
 # Root endpoint
 @app.get("/")
@@ -45,15 +109,26 @@ async def health():
     """Health check endpoint."""
     return {"status": "ok"}
 
+# Prometheus metrics endpoint
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    """Prometheus metrics endpoint."""
+    queue_collector = CeleryQueueCollector(
+        get_redis(),
+        queues=[queue.name for queue in celery.conf.task_queues],
+        priority_steps=celery.conf.broker_transport_options["priority_steps"],
+    )
+    return Response(render_metrics(queue_collector), media_type=CONTENT_TYPE_LATEST)
+
 # Include API router
 app.include_router(api_router, prefix=settings.API_PREFIX)
 
-# Initialize database on startup
 @app.on_event("startup")
 async def startup_event():
-    """Initialize database on startup."""
-    init_db()
+    """Set up per-process resources once the worker process is running."""
+    configure_tracing("bettercorp-api")
 
 if __name__ == "__main__":
+    # Development only; see gunicorn.conf.py for production
     import uvicorn
-    uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
\ No newline at end of file
+    uvicorn.run("src.main:app", host="0.0.0.0", port=8000, reload=True)
\ No newline at end of file
@@ -0,0 +1,246 @@
+"""
+User activity timelines.
+
+Every contribution, badge award and token is fanned out on write into an
+``Activity`` row of its user's timeline, in the transaction that creates the
+subject row. Reading a timeline page is then a single range scan of the
+``(user_id, occurred_at, id)`` index instead of a merge of three tables.
+
+Pages are addressed with opaque keyset cursors rather than offsets, so deep
+pages cost the same as the first one and concurrent inserts never shift
+entries between pages. History written before the timeline existed is
+imported by :func:`backfill_activity`.
+"""
+
+import base64
+import binascii
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import String, cast, func, insert, literal, null, select, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from ..config.settings import settings
+from ..db.models import Activity, ActivityKind, Badge, Contribution, Token, UserBadge
+
+def record_activity(
+    db: Session,
+    kind: ActivityKind,
+    user_id: int,
+    subject_id: int,
+    occurred_at: datetime,
+    project_id: Optional[int] = None,
+    data: Optional[Dict[str, Any]] = None,
+) -> Activity:
+    """
+    Add a timeline entry as part of the caller's transaction.
+    
+    Args:
+        db: Database session of the ongoing transaction
+        kind: Kind of the subject row
+        user_id: Timeline owner
+        subject_id: ID of the subject row
+        occurred_at: When the subject happened
+        project_id: Project the subject belongs to
+        data: Subject fields needed to render the entry
+        
+    Returns:
+        Activity: Pending timeline entry
+    """
+    activity = Activity(
+        kind=kind,
+        user_id=user_id,
+        subject_id=subject_id,
+        project_id=project_id,
+        occurred_at=occurred_at,
+        data=data or {},
+    )
+    db.add(activity)
+    return activity
+
+def record_activities(db: Session, entries: List[Dict[str, Any]]) -> None:
+    """
+    Add many timeline entries with one bulk INSERT.
+    
+    Used by set-based writes that never load their subject rows as objects.
+    
+    Args:
+        db: Database session of the ongoing transaction
+        entries: Dicts with the arguments of :func:`record_activity`
+    """
+    if not entries:
+        return
+    now = datetime.utcnow()
+    db.execute(
+        insert(Activity),
+        [
+            {
+                "project_id": None,
+                "data": {},
+                **entry,
+                "created_at": now,
+                "updated_at": now,
+            }
+            for entry in entries
+        ],
+    )
+
+def encode_cursor(activity: Activity) -> str:
+    """
+    Build the cursor of the page following the given entry.
+    
+    Args:
+        activity: Last entry of the current page
+        
+    Returns:
+        str: Opaque cursor
+    """
+    raw = f"{activity.occurred_at.isoformat()}|{activity.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """
+    Decode a cursor built by :func:`encode_cursor`.
+    
+    Args:
+        cursor: Opaque cursor
+        
+    Returns:
+        Tuple[datetime, int]: Position of the last entry of the previous page
+        
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        occurred_at, activity_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(occurred_at), int(activity_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise ValueError("Invalid cursor")
+
+def get_timeline(
+    db: Session,
+    user_id: int,
+    cursor: Optional[str] = None,
+    limit: int = settings.ACTIVITY_PAGE_SIZE,
+) -> Tuple[List[Activity], Optional[str]]:
+    """
+    Read one page of a user's timeline, newest first.
+    
+    Args:
+        db: Database session
+        user_id: Timeline owner
+        cursor: Cursor returned with the previous page
+        limit: Maximum number of entries
+        
+    Returns:
+        Tuple[List[Activity], Optional[str]]: Entries and the cursor of the
+        next page, None on the last page
+        
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    query = select(Activity).where(Activity.user_id == user_id)
+    if cursor:
+        position = decode_cursor(cursor)
+        query = query.where(tuple_(Activity.occurred_at, Activity.id) < position)
+    
+    # One extra row tells whether another page follows
+    entries = db.scalars(
+        query.order_by(Activity.occurred_at.desc(), Activity.id.desc()).limit(limit + 1)
+    ).all()
+    if len(entries) > limit:
+        return entries[:limit], encode_cursor(entries[limit - 1])
+    return entries, None
+
+def _kind(kind: ActivityKind):
+    """Literal of the activity kind column type."""
+    return literal(kind, Activity.__table__.c.kind.type)
+
+def _backfill_sources():
+    """SELECTs producing the timeline entries of each subject table."""
+    return [
+        (
+            Contribution,
+            select(
+                Contribution.user_id,
+                _kind(ActivityKind.CONTRIBUTION),
+                Contribution.id,
+                Contribution.project_id,
+                Contribution.created_at,
+                func.json_build_object(
+                    "title", Contribution.title,
+                    "type", func.lower(cast(Contribution.type, String)),
+                    "value", Contribution.value,
+                ),
+            ),
+        ),
+        (
+            UserBadge,
+            select(
+                UserBadge.user_id,
+                _kind(ActivityKind.BADGE),
+                UserBadge.id,
+                null(),
+                UserBadge.created_at,
+                func.json_build_object(
+                    "badge_id", UserBadge.badge_id,
+                    "badge_name", Badge.name,
+                ),
+            ).join(Badge, Badge.id == UserBadge.badge_id),
+        ),
+        (
+            Token,
+            select(
+                Token.user_id,
+                _kind(ActivityKind.TOKEN),
+                Token.id,
+                Contribution.project_id,
+                Token.created_at,
+                func.json_build_object(
+                    "amount", Token.amount,
+                    "type", func.lower(cast(Token.type, String)),
+                    "contribution_id", Token.contribution_id,
+                ),
+            ).outerjoin(Contribution, Contribution.id == Token.contribution_id),
+        ),
+    ]
+
+def backfill_activity(db: Session, batch_size: int = settings.ACTIVITY_BACKFILL_BATCH_SIZE) -> Dict[str, int]:
+    """
+    Create the missing timeline entries of existing subject rows.
+    
+    Each subject table is walked in ID ranges of ``batch_size`` rows, one
+    INSERT ... SELECT per range committed on its own, so the job holds no
+    long transaction. Existing entries are skipped, which makes the backfill
+    safe to rerun or to run while new rows are being written.
+    
+    Args:
+        db: Database session
+        batch_size: Subject rows per statement
+        
+    Returns:
+        Dict[str, int]: Number of entries created per subject table
+    """
+    columns = ["user_id", "kind", "subject_id", "project_id", "occurred_at", "data"]
+    created = {}
+    for model, source in _backfill_sources():
+        table = model.__tablename__
+        created[table] = 0
+        max_id = db.scalar(select(func.max(model.id))) or 0
+        for start in range(0, max_id, batch_size):
+            now = literal(datetime.utcnow())
+            stmt = (
+                pg_insert(Activity)
+                .from_select(
+                    columns + ["created_at", "updated_at"],
+                    source.add_columns(now, now).where(
+                        model.id > start,
+                        model.id <= start + batch_size,
+                    ),
+                )
+                .on_conflict_do_nothing(constraint="uq_activity_subject")
+            )
+            created[table] += db.execute(stmt).rowcount
+            db.commit()
+    return created
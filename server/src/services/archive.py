@@ -0,0 +1,293 @@
+"""
+Cold-tier archive of old contributions.
+
+Monthly partitions of ``contribution`` (see ``db.partitions``) older than
+``ARCHIVE_HORIZON_MONTHS`` are exported to zstd-compressed Parquet files
+under ``ARCHIVE_URI``, a local directory or an object storage URI such as
+``s3://bucket/prefix``, and then dropped from Postgres. Files are laid out
+with Hive-style keys::
+    
+    contribution/month=2023-04/project_id=7/contribution_p2023_04-0.parquet
+
+Tokens are not archived: user balances are summed over every token row, so
+they stay in Postgres. Profile summaries count the contributions still in
+Postgres; archiving a partition invalidates every cached summary.
+
+Archived rows are queried in-process with DuckDB, which only opens the files
+whose ``month`` and ``project_id`` keys match the filters. Exporting a month
+replaces any files written for it by an earlier, interrupted run, so the job
+can safely be retried.
+"""
+
+import logging
+import os
+import threading
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import duckdb
+import pyarrow as pa
+import pyarrow.dataset as ds
+from pyarrow import fs
+from sqlalchemy import DateTime, Enum, Float, Integer, column, select, table, text
+from sqlalchemy.orm import Session
+
+from ..config.settings import settings
+from ..db.models import Contribution
+from ..db.partitions import add_months, month_start, partition_month, partition_name
+from .summary import mark_all_stale
+
+logger = logging.getLogger(__name__)
+
+# Archived models and the keys their files are split by, besides the month
+ARCHIVED_MODELS = {
+    "contribution": (Contribution, ["project_id"]),
+}
+
+# In-memory DuckDB database shared by the queries of this process; it loads
+# the object storage extension and credentials once
+_database: Optional[duckdb.DuckDBPyConnection] = None
+_database_lock = threading.Lock()
+
+def _arrow_type(column_type: Any) -> pa.DataType:
+    """Arrow type storing a column; enums are stored by value."""
+    if isinstance(column_type, Enum):
+        return pa.string()
+    if isinstance(column_type, Integer):
+        return pa.int64()
+    if isinstance(column_type, Float):
+        return pa.float64()
+    if isinstance(column_type, DateTime):
+        return pa.timestamp("us")
+    return pa.string()
+
+def _arrow_schema(name: str) -> pa.Schema:
+    """Arrow schema of an archived table, including the month key."""
+    model, _ = ARCHIVED_MODELS[name]
+    fields = [pa.field(col.name, _arrow_type(col.type)) for col in model.__table__.columns]
+    return pa.schema(fields + [pa.field("month", pa.string())])
+
+def _archive_uri() -> str:
+    """Archive root as a URI or an absolute path."""
+    uri = settings.ARCHIVE_URI
+    return uri if "://" in uri else os.path.abspath(uri)
+
+def _storage() -> Tuple[fs.FileSystem, str]:
+    """Filesystem and base path of the archive."""
+    return fs.FileSystem.from_uri(_archive_uri())
+
+def archive_location(name: str) -> str:
+    """
+    Location of an archived table, as DuckDB addresses it.
+    
+    Args:
+        name: Archived table
+        
+    Returns:
+        str: Directory or URI
+    """
+    return f"{_archive_uri().rstrip('/')}/{name}"
+
+def monthly_partitions(db: Session, name: str) -> List[str]:
+    """
+    List the monthly partitions of a table, attached or detached.
+    
+    Args:
+        db: Database session
+        name: Partitioned table
+        
+    Returns:
+        List[str]: Partition names, oldest first
+    """
+    tables = db.scalars(
+        text("SELECT tablename FROM pg_tables WHERE schemaname = current_schema()")
+    )
+    partitions = []
+    for table_name in tables:
+        month = partition_month(table_name)
+        if month is not None and table_name == partition_name(name, month):
+            partitions.append(table_name)
+    return sorted(partitions)
+
+def _record_batches(db: Session, name: str, partition: str, month: str) -> Iterator[pa.RecordBatch]:
+    """Stream the rows of a partition as Arrow record batches."""
+    model, _ = ARCHIVED_MODELS[name]
+    columns = list(model.__table__.columns)
+    source = table(partition, *[column(col.name, col.type) for col in columns])
+    schema = _arrow_schema(name)
+    
+    result = db.execute(select(source), execution_options={"yield_per": settings.ARCHIVE_BATCH_SIZE})
+    for rows in result.partitions():
+        data = {col.name: [] for col in columns}
+        for row in rows:
+            for col, value in zip(columns, row):
+                data[col.name].append(value.value if isinstance(col.type, Enum) and value is not None else value)
+        data["month"] = [month] * len(rows)
+        yield pa.RecordBatch.from_pydict(data, schema=schema)
+
+def archive_partition(db: Session, name: str, partition: str) -> None:
+    """
+    Export a monthly partition to Parquet and drop it.
+    
+    The partition is dropped in the same transaction as it is detached, once
+    its files are written.
+    
+    Args:
+        db: Database session
+        name: Partitioned table
+        partition: Monthly partition of ``name``
+    """
+    _, keys = ARCHIVED_MODELS[name]
+    month = f"{partition_month(partition):%Y-%m}"
+    filesystem, base_path = _storage()
+    
+    ds.write_dataset(
+        _record_batches(db, name, partition, month),
+        f"{base_path.rstrip('/')}/{name}",
+        schema=_arrow_schema(name),
+        format="parquet",
+        filesystem=filesystem,
+        partitioning=["month", *keys],
+        partitioning_flavor="hive",
+        basename_template=f"{partition}-{{i}}.parquet",
+        existing_data_behavior="delete_matching",
+        file_options=ds.ParquetFileFormat().make_write_options(compression="zstd"),
+    )
+    
+    attached = db.scalar(
+        text("SELECT relispartition FROM pg_class WHERE oid = CAST(:partition AS regclass)"),
+        {"partition": f'"{partition}"'},
+    )
+    if attached:
+        db.execute(text(f'ALTER TABLE "{name}" DETACH PARTITION "{partition}"'))
+    db.execute(text(f'DROP TABLE "{partition}"'))
+    mark_all_stale(db)
+    db.commit()
+
+def archive_old_partitions(db: Session) -> Dict[str, List[str]]:
+    """
+    Archive every monthly partition older than the archive horizon.
+    
+    Args:
+        db: Database session
+        
+    Returns:
+        Dict[str, List[str]]: Archived partitions per table
+    """
+    archived = {name: [] for name in ARCHIVED_MODELS}
+    if settings.ARCHIVE_HORIZON_MONTHS <= 0:
+        return archived
+    
+    cutoff = add_months(month_start(datetime.utcnow().date()), -settings.ARCHIVE_HORIZON_MONTHS)
+    for name in ARCHIVED_MODELS:
+        for partition in monthly_partitions(db, name):
+            if partition_month(partition) < cutoff:
+                archive_partition(db, name, partition)
+                archived[name].append(partition)
+                logger.info("Archived %s to %s", partition, archive_location(name))
+    return archived
+
+def _connect() -> duckdb.DuckDBPyConnection:
+    """Open a DuckDB cursor able to read the archive; close it after use."""
+    global _database
+    with _database_lock:
+        if _database is None:
+            database = duckdb.connect()
+            if "://" in settings.ARCHIVE_URI:
+                database.execute("INSTALL httpfs")
+                database.execute("LOAD httpfs")
+                database.execute("CREATE SECRET (TYPE S3, PROVIDER CREDENTIAL_CHAIN)")
+            _database = database
+        # Cursors share the database but not the connection state, so
+        # concurrent requests do not interfere
+        return _database.cursor()
+
+def query_archive(
+    name: str,
+    columns: Optional[Sequence[str]] = None,
+    offset: int = 0,
+    limit: int = 100,
+    descending: bool = False,
+    **filters: Any,
+) -> List[Dict[str, Any]]:
+    """
+    Read archived rows of a table.
+    
+    Args:
+        name: Archived table
+        columns: Columns to read, all table columns if None
+        offset: Number of rows to skip
+        limit: Maximum number of rows to return
+        descending: Whether to return the newest rows (highest ids) first
+        filters: Column values the rows must equal
+        
+    Returns:
+        List[Dict[str, Any]]: Rows in id order
+        
+    Raises:
+        ValueError: If a filter is not a column of the table
+    """
+    model, _ = ARCHIVED_MODELS[name]
+    table_columns = [col.name for col in model.__table__.columns]
+    selected = [col for col in (columns or table_columns) if col in table_columns]
+    unknown = set(filters) - set(table_columns)
+    if unknown:
+        raise ValueError(f"Unknown columns: {', '.join(sorted(unknown))}")
+    
+    select_list = ", ".join(f'"{col}"' for col in selected)
+    conditions = [f'"{col}" = ?' for col in filters] or ["TRUE"]
+    query = (
+        f"SELECT {select_list} "
+        "FROM read_parquet(?, hive_partitioning = true, union_by_name = true) "
+        f"WHERE {' AND '.join(conditions)} "
+        f"ORDER BY id {'DESC' if descending else 'ASC'} LIMIT ? OFFSET ?"
+    )
+    parameters = [f"{archive_location(name)}/**/*.parquet", *filters.values(), limit, offset]
+    
+    connection = _connect()
+    try:
+        cursor = connection.execute(query, parameters)
+        names = [description[0] for description in cursor.description]
+        return [dict(zip(names, row)) for row in cursor.fetchall()]
+    except duckdb.IOException:
+        # Nothing archived yet
+        return []
+    finally:
+        connection.close()
+
+def archived_contributions(
+    columns: Optional[Sequence[str]] = None,
+    offset: int = 0,
+    limit: int = 100,
+    descending: bool = False,
+    **filters: Any,
+) -> List[Contribution]:
+    """
+    Read archived contributions as detached model instances.
+    
+    The instances are never added to a session; they only carry the values
+    read from the archive, for the list endpoints to serialize.
+    
+    Args:
+        columns: Columns to read, all if None
+        offset: Number of contributions to skip
+        limit: Maximum number of contributions to return
+        descending: Whether to return the newest contributions first
+        filters: Column values the contributions must equal
+        
+    Returns:
+        List[Contribution]: Archived contributions in id order
+    """
+    rows = query_archive("contribution", columns, offset, limit, descending, **filters)
+    enums = {
+        col.name: col.type.enum_class
+        for col in Contribution.__table__.columns
+        if isinstance(col.type, Enum)
+    }
+    contributions = []
+    for row in rows:
+        for name, enum_class in enums.items():
+            if row.get(name) is not None:
+                row[name] = enum_class(row[name])
+        contributions.append(Contribution(**row))
+    return contributions
@@ -0,0 +1,180 @@
+"""
+Precomputed ERC-721 metadata of soul-bound badge tokens.
+
+Wallets and marketplaces fetch a token's metadata from its token URI,
+``/badges/metadata/{token_id}``, and poll it often. The JSON documents are
+rendered ahead of time, when a badge is awarded or a badge or award changes
+(see ``tasks.badges``), and stored in Redis, so serving them reads one Redis
+hash and never queries Postgres.
+
+Every document is also stored under its content hash, which is its ETag.
+``/badges/metadata/{token_id}/{content_hash}`` serves that exact version and
+never changes, so it is cached as immutable; the token URI itself is cached
+for ``BADGE_METADATA_MAX_AGE`` seconds and revalidated with the ETag.
+
+Version keys expire ``BADGE_METADATA_VERSION_TTL`` seconds after they were
+last published, so replaced versions and those of removed tokens do not
+accumulate. The current version stays available for as long as it is
+current, since it is also served from the token's own key.
+"""
+
+import calendar
+import hashlib
+import json
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from ..config.settings import settings
+from ..db.models import Badge, UserBadge
+from ..utils.redis_client import get_redis
+
+# Rows rendered per Redis pipeline
+PUBLISH_BATCH_SIZE = 500
+
+def _token_key(token_id: int) -> str:
+    """Redis key of the current metadata of a token."""
+    return f"badge:metadata:{token_id}"
+
+def _version_key(token_id: int, content_hash: str) -> str:
+    """Redis key of one metadata version of a token."""
+    return f"badge:metadata:{token_id}:{content_hash}"
+
+def build_metadata(user_badge: UserBadge, badge: Badge) -> Dict[str, Any]:
+    """
+    Build the ERC-721 metadata of a badge token.
+    
+    Args:
+        user_badge: Award holding the token id
+        badge: Awarded badge
+        
+    Returns:
+        Dict[str, Any]: Metadata document
+    """
+    attributes = [
+        {"trait_type": "Category", "value": category}
+        for category, flag in (
+            ("Achievement", badge.is_achievement),
+            ("Skill", badge.is_skill),
+            ("Contribution", badge.is_contribution),
+        )
+        if flag
+    ]
+    attributes.append({
+        "display_type": "date",
+        "trait_type": "Awarded",
+        "value": calendar.timegm(user_badge.created_at.utctimetuple()),
+    })
+    
+    metadata = {
+        "name": badge.name,
+        "description": badge.description or "",
+        "attributes": attributes,
+    }
+    if badge.image_url:
+        metadata["image"] = badge.image_url
+    return metadata
+
+def render_metadata(metadata: Dict[str, Any]) -> Tuple[bytes, str]:
+    """
+    Serialize a metadata document canonically.
+    
+    Args:
+        metadata: Metadata document
+        
+    Returns:
+        Tuple[bytes, str]: JSON body and its content hash
+    """
+    body = json.dumps(metadata, sort_keys=True, separators=(",", ":")).encode()
+    return body, hashlib.sha256(body).hexdigest()[:32]
+
+def publish_badge_metadata(
+    db: Session,
+    user_badge_ids: Optional[Iterable[int]] = None,
+    badge_ids: Optional[Iterable[int]] = None,
+    stale_token_ids: Iterable[int] = (),
+) -> Dict[str, int]:
+    """
+    Render and store the metadata of soul-bound badge tokens.
+    
+    With neither ``user_badge_ids`` nor ``badge_ids``, every token is
+    published, which also backfills the store.
+    
+    Args:
+        db: Database session
+        user_badge_ids: Awards whose token to publish
+        badge_ids: Badges whose tokens to publish
+        stale_token_ids: Token ids that may no longer belong to a soul-bound
+            badge, e.g. the previous token id of an updated award
+            
+    Returns:
+        Dict[str, int]: Number of tokens ``published`` and ``removed``
+    """
+    query = (
+        select(UserBadge, Badge)
+        .join(Badge, Badge.id == UserBadge.badge_id)
+        .where(UserBadge.token_id.is_not(None))
+    )
+    if user_badge_ids is not None or badge_ids is not None:
+        user_badge_ids, badge_ids = list(user_badge_ids or ()), list(badge_ids or ())
+        query = query.where(UserBadge.id.in_(user_badge_ids) | UserBadge.badge_id.in_(badge_ids))
+    
+    client = get_redis()
+    pipeline = client.pipeline()
+    published, removed = set(), set(stale_token_ids)
+    for user_badge, badge in db.execute(query.execution_options(yield_per=PUBLISH_BATCH_SIZE)):
+        if not badge.is_soul_bound:
+            removed.add(user_badge.token_id)
+            continue
+        body, content_hash = render_metadata(build_metadata(user_badge, badge))
+        pipeline.set(
+            _version_key(user_badge.token_id, content_hash), body,
+            ex=settings.BADGE_METADATA_VERSION_TTL,
+        )
+        pipeline.hset(_token_key(user_badge.token_id), mapping={"etag": content_hash, "body": body})
+        published.add(user_badge.token_id)
+        if len(pipeline) >= PUBLISH_BATCH_SIZE:
+            pipeline.execute()
+    
+    removed -= published
+    if removed:
+        pipeline.delete(*(_token_key(token_id) for token_id in removed))
+    pipeline.execute()
+    return {"published": len(published), "removed": len(removed)}
+
+def get_metadata(token_id: int) -> Optional[Tuple[bytes, str]]:
+    """
+    Read the current metadata of a token.
+    
+    Args:
+        token_id: Token id
+        
+    Returns:
+        Optional[Tuple[bytes, str]]: JSON body and content hash, None if the
+        token has no published metadata
+    """
+    entry = get_redis().hgetall(_token_key(token_id))
+    if not entry:
+        return None
+    return entry[b"body"], entry[b"etag"].decode()
+
+def get_metadata_version(token_id: int, content_hash: str) -> Optional[bytes]:
+    """
+    Read one metadata version of a token.
+    
+    Args:
+        token_id: Token id
+        content_hash: Content hash of the version
+        
+    Returns:
+        Optional[bytes]: JSON body, None if unknown or expired
+    """
+    pipeline = get_redis().pipeline()
+    pipeline.get(_version_key(token_id, content_hash))
+    pipeline.hmget(_token_key(token_id), "etag", "body")
+    body, (etag, current) = pipeline.execute()
+    if body is None and etag is not None and etag.decode() == content_hash:
+        # The current version, whose version key expired
+        return current
+    return body
@@ -0,0 +1,92 @@
+"""
+Wallet history from the indexed contract events.
+
+Events are read from ``chainevent`` as filled by ``blockchain.indexer``,
+never from the node. A wallet's history is the union of the events it sent
+and received; each side is one range scan of its address index in chain
+order, and the two are merged in Python, which keeps both scans on their
+index where an ``OR`` would not.
+"""
+
+import base64
+import binascii
+from typing import List, Optional, Tuple
+
+from sqlalchemy import select, tuple_
+from sqlalchemy.orm import Session
+
+from ..config.settings import settings
+from ..db.models import ChainEvent
+
+def encode_cursor(event: ChainEvent) -> str:
+    """
+    Build the cursor of the page following the given event.
+    
+    Args:
+        event: Last event of the current page
+        
+    Returns:
+        str: Opaque cursor
+    """
+    raw = f"{event.block_number}|{event.log_index}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+def decode_cursor(cursor: str) -> Tuple[int, int]:
+    """
+    Decode a cursor built by :func:`encode_cursor`.
+    
+    Args:
+        cursor: Opaque cursor
+        
+    Returns:
+        Tuple[int, int]: Block number and log index of the last event of the
+        previous page
+        
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        block_number, log_index = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return int(block_number), int(log_index)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise ValueError("Invalid cursor")
+
+def get_wallet_events(
+    db: Session,
+    address: str,
+    cursor: Optional[str] = None,
+    limit: int = settings.CHAIN_EVENTS_PAGE_SIZE,
+) -> Tuple[List[ChainEvent], Optional[str]]:
+    """
+    Read one page of the contract events involving a wallet, newest first.
+    
+    Args:
+        db: Database session
+        address: Wallet address, any case
+        cursor: Cursor returned with the previous page
+        limit: Maximum number of events
+        
+    Returns:
+        Tuple[List[ChainEvent], Optional[str]]: Events and the cursor of the
+        next page, None on the last page
+        
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    address = address.lower()
+    position = decode_cursor(cursor) if cursor else None
+    
+    events = {}
+    for column in (ChainEvent.to_address, ChainEvent.from_address):
+        query = select(ChainEvent).where(column == address)
+        if position is not None:
+            query = query.where(tuple_(ChainEvent.block_number, ChainEvent.log_index) < position)
+        # One extra row tells whether another page follows
+        query = query.order_by(ChainEvent.block_number.desc(), ChainEvent.log_index.desc()).limit(limit + 1)
+        # A transfer to oneself is found by both scans
+        events.update((event.id, event) for event in db.scalars(query))
+    
+    page = sorted(events.values(), key=lambda event: (event.block_number, event.log_index), reverse=True)
+    if len(page) > limit:
+        return page[:limit], encode_cursor(page[limit - 1])
+    return page, None
@@ -0,0 +1,334 @@
+"""
+Real-time event bus.
+
+Events are appended to a capped Redis stream, which gives every event a
+monotonically increasing ID that clients can resume from, and announced on a
+single pub/sub channel. Each API process keeps one pub/sub subscription and
+fans events out to its local Server-Sent Events subscribers by channel
+(``user:<id>``, ``project:<id>``).
+"""
+
+import asyncio
+import json
+import logging
+from collections import defaultdict
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Set, Tuple
+
+from redis.exceptions import RedisError
+
+from ..config.settings import settings
+from ..utils.redis_client import get_async_redis, get_redis
+
+logger = logging.getLogger(__name__)
+
+# Redis keys
+EVENT_LOG_KEY = "events:log"
+EVENT_LIVE_CHANNEL = "events:live"
+
+# Event types
+CONTRIBUTION_CREATED = "contribution.created"
+CONTRIBUTION_STATUS_CHANGED = "contribution.status_changed"
+BADGE_AWARDED = "badge.awarded"
+BADGE_UPDATED = "badge.updated"
+USER_BADGE_UPDATED = "badge.award_updated"
+TOKEN_CONFIRMED = "token.confirmed"
+
+# Appends the event to the log and announces it in one atomic step, so live
+# subscribers never see an event that cannot be replayed.
+#
+# KEYS[1] event log stream, KEYS[2] live channel
+# ARGV[1] approximate max log length, ARGV[2] type, ARGV[3] channels, ARGV[4] data
+PUBLISH_SCRIPT = """
+local id = redis.call('XADD', KEYS[1], 'MAXLEN', '~', ARGV[1], '*',
+    'type', ARGV[2], 'channels', ARGV[3], 'data', ARGV[4])
+redis.call('PUBLISH', KEYS[2], cjson.encode({
+    id = id, type = ARGV[2], channels = ARGV[3], data = ARGV[4]
+}))
+return id
+"""
+
+def user_channel(user_id: int) -> str:
+    """Channel carrying events about a user."""
+    return f"user:{user_id}"
+
+def project_channel(project_id: int) -> str:
+    """Channel carrying events about a project."""
+    return f"project:{project_id}"
+
+def _channels(user_id: Optional[int], project_id: Optional[int]) -> List[str]:
+    """Channels an event about the given user and project is published on."""
+    channels = []
+    if user_id is not None:
+        channels.append(user_channel(user_id))
+    if project_id is not None:
+        channels.append(project_channel(project_id))
+    return channels
+
+def publish_events(batch: Iterable[Dict[str, Any]]) -> List[Optional[str]]:
+    """
+    Publish several events in one Redis round trip.
+    
+    Each item has the keys ``type``, ``data`` and optionally ``user_id`` and
+    ``project_id``. Events without a user or project are not published.
+    
+    Args:
+        batch: Events to publish
+        
+    Returns:
+        List[Optional[str]]: Event ID per item, None for unpublished items
+        
+    Raises:
+        RedisError: If Redis is unavailable
+    """
+    pipeline = get_redis().pipeline(transaction=False)
+    slots = []
+    for item in batch:
+        channels = _channels(item.get("user_id"), item.get("project_id"))
+        slots.append(bool(channels))
+        if not channels:
+            continue
+        pipeline.eval(
+            PUBLISH_SCRIPT,
+            2,
+            EVENT_LOG_KEY,
+            EVENT_LIVE_CHANNEL,
+            settings.EVENTS_LOG_MAXLEN,
+            item["type"],
+            ",".join(channels),
+            json.dumps(item["data"], default=str),
+        )
+    results = iter(pipeline.execute() if any(slots) else [])
+    return [_decode(next(results)) if published else None for published in slots]
+
+def publish_event(
+    event_type: str,
+    data: Dict[str, Any],
+    user_id: Optional[int] = None,
+    project_id: Optional[int] = None,
+) -> Optional[str]:
+    """
+    Publish an event to the user and/or project channels.
+    
+    Request handlers should not call this directly; they write an outbox
+    event in their transaction (see ``services.outbox``) and the relay
+    publishes it.
+    
+    Args:
+        event_type: Event type, e.g. ``contribution.status_changed``
+        data: JSON-serializable event payload
+        user_id: User the event concerns
+        project_id: Project the event concerns
+        
+    Returns:
+        Optional[str]: Event ID, or None if the event has no channel
+        
+    Raises:
+        RedisError: If Redis is unavailable
+    """
+    return publish_events([{
+        "type": event_type,
+        "data": data,
+        "user_id": user_id,
+        "project_id": project_id,
+    }])[0]
+
+def _parse_event_id(event_id: str) -> Tuple[int, int]:
+    """Convert a stream ID (``<ms>-<seq>``) to a comparable tuple."""
+    ms, _, seq = event_id.partition("-")
+    return int(ms), int(seq or 0)
+
+def _decode(value: Any) -> str:
+    """Decode a Redis bytes value."""
+    return value.decode() if isinstance(value, bytes) else value
+
+
+class Subscription:
+    """A single SSE client's view of the event bus."""
+    
+    def __init__(self, channels: Iterable[str]):
+        """
+        Initialize the subscription.
+        
+        Args:
+            channels: Channels the client is interested in
+        """
+        self.channels = frozenset(channels)
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=settings.EVENTS_SUBSCRIBER_QUEUE_SIZE)
+        self.overflowed = False
+    
+    def deliver(self, event: Dict[str, Any]) -> None:
+        """Queue a live event, marking the subscription overflowed when full."""
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+
+class EventBroker:
+    """Per-process fan-out of live events to local subscriptions."""
+    
+    def __init__(self):
+        """Initialize the broker."""
+        self._subscriptions: Dict[str, Set[Subscription]] = defaultdict(set)
+        self._listener: Optional[asyncio.Task] = None
+    
+    def _ensure_listener(self) -> None:
+        """Start the pub/sub listener on first use."""
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.get_running_loop().create_task(self._listen())
+    
+    async def _listen(self) -> None:
+        """Read live events from Redis and dispatch them to subscriptions."""
+        while True:
+            pubsub = get_async_redis().pubsub()
+            try:
+                await pubsub.subscribe(EVENT_LIVE_CHANNEL)
+                async for message in pubsub.listen():
+                    if message["type"] != "message":
+                        continue
+                    self._dispatch(json.loads(message["data"]))
+            except asyncio.CancelledError:
+                raise
+            except (RedisError, OSError):
+                logger.warning("Event listener disconnected, reconnecting")
+                await asyncio.sleep(1)
+            finally:
+                await pubsub.close()
+    
+    def _dispatch(self, event: Dict[str, Any]) -> None:
+        """Deliver an event once to every subscription on any of its channels."""
+        targets: Set[Subscription] = set()
+        for channel in event["channels"].split(","):
+            targets.update(self._subscriptions.get(channel, ()))
+        for subscription in targets:
+            subscription.deliver(event)
+    
+    def subscribe(self, channels: Iterable[str]) -> Subscription:
+        """
+        Register a subscription for live events.
+        
+        Args:
+            channels: Channels to subscribe to
+            
+        Returns:
+            Subscription: New subscription
+        """
+        self._ensure_listener()
+        subscription = Subscription(channels)
+        for channel in subscription.channels:
+            self._subscriptions[channel].add(subscription)
+        return subscription
+    
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """Remove a subscription."""
+        for channel in subscription.channels:
+            subscribers = self._subscriptions.get(channel)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscriptions[channel]
+
+broker = EventBroker()
+
+async def replay_events(
+    channels: Iterable[str],
+    last_event_id: str,
+) -> Tuple[Optional[List[Dict[str, Any]]], Optional[str]]:
+    """
+    Read events after ``last_event_id`` from the event log.
+    
+    Args:
+        channels: Channels to filter on
+        last_event_id: Last event ID the client has seen
+        
+    Returns:
+        Tuple: Matching events and the ID of the last log entry read, or
+        (None, None) if events after ``last_event_id`` were already trimmed
+        and the client must refetch its state
+    """
+    redis = get_async_redis()
+    wanted = set(channels)
+    
+    info = await redis.xinfo_stream(EVENT_LOG_KEY) if await redis.exists(EVENT_LOG_KEY) else None
+    if info is not None:
+        max_deleted = _decode(info.get("max-deleted-entry-id", "0-0"))
+        if _parse_event_id(last_event_id) < _parse_event_id(max_deleted):
+            return None, None
+    
+    entries = await redis.xrange(
+        EVENT_LOG_KEY,
+        min=f"({last_event_id}",
+        count=settings.EVENTS_REPLAY_MAX,
+    )
+    events = []
+    last_read = None
+    for entry_id, fields in entries:
+        last_read = _decode(entry_id)
+        fields = {_decode(key): _decode(value) for key, value in fields.items()}
+        if wanted.intersection(fields["channels"].split(",")):
+            events.append({"id": last_read, **fields})
+    if len(entries) >= settings.EVENTS_REPLAY_MAX:
+        # Too far behind to replay; a refetch is cheaper
+        return None, None
+    return events, last_read
+
+def format_sse(event: Dict[str, Any]) -> str:
+    """Format an event as a Server-Sent Events message."""
+    return f"id: {event['id']}\nevent: {event['type']}\ndata: {event['data']}\n\n"
+
+async def stream_events(
+    channels: List[str],
+    last_event_id: Optional[str] = None,
+) -> AsyncIterator[str]:
+    """
+    Stream events for the given channels as SSE messages.
+    
+    When ``last_event_id`` is given, missed events are replayed from the log
+    before switching to live delivery; if they are gone or the ID is
+    malformed, a ``reset`` event is sent instead. The live subscription is registered
+    before replaying, and live events already covered by the replay are
+    skipped, so no event is lost or duplicated at the handoff.
+    
+    Args:
+        channels: Channels to stream
+        last_event_id: Last event ID received by the client, if reconnecting
+        
+    Yields:
+        str: SSE-formatted messages
+    """
+    subscription = broker.subscribe(channels)
+    try:
+        yield f"retry: {settings.EVENTS_RETRY_MS}\n\n"
+        
+        high_water = None
+        if last_event_id:
+            try:
+                high_water = _parse_event_id(last_event_id)
+                events, last_read = await replay_events(channels, last_event_id)
+            except (RedisError, ValueError):
+                # A malformed ID cannot be resumed from either
+                events, last_read = None, None
+            if events is None:
+                # History is gone: ask the client to refetch, then go live
+                yield "event: reset\ndata: {}\n\n"
+            else:
+                for event in events:
+                    yield format_sse(event)
+                if last_read is not None:
+                    high_water = _parse_event_id(last_read)
+        
+        while not subscription.overflowed:
+            try:
+                event = await asyncio.wait_for(
+                    subscription.queue.get(),
+                    timeout=settings.EVENTS_HEARTBEAT_SECONDS,
+                )
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+            if high_water is not None and _parse_event_id(event["id"]) <= high_water:
+                continue
+            yield format_sse(event)
+        # A slow client fell behind; closing makes it reconnect and replay
+    finally:
+        broker.unsubscribe(subscription)
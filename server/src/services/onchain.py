@@ -0,0 +1,163 @@
+"""
+On-chain state of a user's wallet, cached per block.
+
+A wallet page shows the wallet's native balance, its balance on the portal
+contract and which of the user's badge tokens it still owns. These are read
+from the node with one batched request (see ``blockchain.multicall``) at the
+latest block.
+
+The latest block number is cached in Redis for ``ONCHAIN_BLOCK_TTL``
+seconds, so API processes ask the node for it at most that often. Results
+are cached under the block they were read at: when a new block arrives,
+requests look up a new key, which invalidates the old entries without
+deleting them; they expire after ``ONCHAIN_CACHE_TTL``.
+"""
+
+import hashlib
+import json
+import logging
+from typing import Any, Dict, List, Optional
+
+from eth_abi import decode, encode
+from redis.exceptions import RedisError
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from web3 import Web3
+
+from ..blockchain.multicall import encode_call, read
+from ..blockchain.provider import contract_address
+from ..blockchain.rpc import get_rpc
+from ..config.settings import settings
+from ..db.models import User, UserBadge
+from ..utils.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+BLOCK_KEY = "onchain:block"
+
+def _cache_key(address: str, block: int, token_ids: List[int]) -> str:
+    """Redis key of a wallet's state at a block, for a set of badge tokens."""
+    tokens = hashlib.sha256(encode(["uint256[]"], [token_ids])).hexdigest()[:16]
+    return f"onchain:{address}:{block}:{tokens}"
+
+def latest_block() -> int:
+    """
+    Get the latest block number, cached for ``ONCHAIN_BLOCK_TTL`` seconds.
+    
+    Returns:
+        int: Block number
+    """
+    client = get_redis()
+    try:
+        cached = client.get(BLOCK_KEY)
+        if cached is not None:
+            return int(cached)
+    except RedisError:
+        logger.warning("On-chain cache unavailable", exc_info=True)
+        client = None
+    
+    block = int(get_rpc().call("eth_blockNumber"), 16)
+    if client is not None:
+        try:
+            client.set(BLOCK_KEY, block, px=int(settings.ONCHAIN_BLOCK_TTL * 1000))
+        except RedisError:
+            logger.warning("On-chain cache unavailable", exc_info=True)
+    return block
+
+def _uint(data: Optional[bytes]) -> Optional[int]:
+    """Decode a uint256 return value, None if the call failed."""
+    if data is None or len(data) < 32:
+        return None
+    return decode(["uint256"], data)[0]
+
+def _address(data: Optional[bytes]) -> Optional[str]:
+    """Decode an address return value, None if the call failed."""
+    if data is None or len(data) < 32:
+        return None
+    return decode(["address"], data)[0].lower()
+
+def read_wallet(address: str, token_ids: List[int], block: int) -> Dict[str, Any]:
+    """
+    Read a wallet's balances and badge token ownership from the node.
+    
+    Args:
+        address: Wallet address
+        token_ids: Badge token ids to check the ownership of
+        block: Block number to read at
+        
+    Returns:
+        Dict[str, Any]: Native balance, contract balance and the owned badge
+        token ids, as of the block
+        
+    Raises:
+        RpcError: If the node returned an error
+        requests.RequestException: If the node could not be reached
+    """
+    contract = contract_address()
+    calls = []
+    if contract is not None:
+        calls.append((contract, encode_call("balanceOf(address)", ["address"], [address])))
+        calls += [(contract, encode_call("ownerOf(uint256)", ["uint256"], [token_id])) for token_id in token_ids]
+    
+    (balance,), returned = read(get_rpc(), block, [("eth_getBalance", [address])], calls)
+    token_balance = _uint(returned[0]) if returned else None
+    owners = [_address(data) for data in returned[1:]]
+    return {
+        "wallet_address": address,
+        "block_number": block,
+        "native_balance": str(int(balance, 16)),
+        "token_balance": str(token_balance) if token_balance is not None else None,
+        "badge_token_ids": [token_id for token_id, owner in zip(token_ids, owners) if owner == address],
+    }
+
+def get_onchain_state(db: Session, user_id: int) -> Optional[Dict[str, Any]]:
+    """
+    Get a user's on-chain wallet state, from the cache when the chain has not
+    moved since it was read.
+    
+    Args:
+        db: Database session
+        user_id: User ID
+        
+    Returns:
+        Optional[Dict[str, Any]]: Wallet state, with empty values for a user
+        without a valid wallet address; None if the user does not exist
+        
+    Raises:
+        RpcError: If the node returned an error
+        requests.RequestException: If the node could not be reached
+    """
+    rows = db.execute(
+        select(User.wallet_address, UserBadge.token_id)
+        .outerjoin(UserBadge, (UserBadge.user_id == User.id) & UserBadge.token_id.is_not(None))
+        .where(User.id == user_id)
+    ).all()
+    if not rows:
+        return None
+    address = rows[0].wallet_address
+    if not address or not Web3.is_address(address):
+        return {
+            "wallet_address": None,
+            "block_number": None,
+            "native_balance": None,
+            "token_balance": None,
+            "badge_token_ids": [],
+        }
+    address = address.lower()
+    token_ids = sorted({row.token_id for row in rows if row.token_id is not None})
+    
+    block = latest_block()
+    key = _cache_key(address, block, token_ids)
+    try:
+        cached = get_redis().get(key)
+        if cached is not None:
+            return json.loads(cached)
+    except RedisError:
+        logger.warning("On-chain cache unavailable", exc_info=True)
+    
+    state = read_wallet(address, token_ids, block)
+    try:
+        get_redis().set(key, json.dumps(state), ex=settings.ONCHAIN_CACHE_TTL)
+    except RedisError:
+        logger.warning("On-chain cache unavailable", exc_info=True)
+    return state
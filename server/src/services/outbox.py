@@ -0,0 +1,253 @@
+"""
+Transactional outbox.
+
+Request handlers record domain events with :func:`enqueue_event` inside the
+transaction that makes the change, so an event exists if and only if the
+change was committed. The relay (:func:`relay_outbox`) later drains unpublished
+events in batches, runs the registered handlers and publishes the events
+whose handlers succeeded to the event bus. Delivery is at-least-once: an
+event whose handlers or publication fail stays in the outbox and is retried
+after a backoff, until ``OUTBOX_MAX_ATTEMPTS`` attempts failed.
+"""
+
+import logging
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Any, Callable, Collection, Dict, List, Optional, Set
+
+from sqlalchemy import func, or_
+from sqlalchemy.orm import Session
+
+from ..config.settings import settings
+from ..db.models import OutboxEvent
+from . import events
+
+logger = logging.getLogger(__name__)
+
+# Handlers run by the relay for each event, keyed by topic
+_handlers: Dict[str, List[Callable[[Dict[str, Any]], None]]] = defaultdict(list)
+
+def outbox_handler(*topics: str) -> Callable:
+    """
+    Register a function to run for every relayed event of the given topics.
+    
+    Handlers receive the event as a dict with ``id``, ``topic``, ``payload``,
+    ``user_id``, ``project_id`` and ``created_at``. They may run more than
+    once for the same event and must therefore be idempotent; typically they
+    only enqueue a Celery task.
+    
+    Args:
+        topics: Event topics to handle
+        
+    Returns:
+        Callable: Decorator registering the handler
+    """
+    def decorator(handler: Callable[[Dict[str, Any]], None]) -> Callable[[Dict[str, Any]], None]:
+        for topic in topics:
+            _handlers[topic].append(handler)
+        return handler
+    return decorator
+
+def enqueue_event(
+    db: Session,
+    topic: str,
+    payload: Dict[str, Any],
+    user_id: Optional[int] = None,
+    project_id: Optional[int] = None,
+) -> OutboxEvent:
+    """
+    Add an event to the outbox as part of the caller's transaction.
+    
+    The event is not published until the caller commits.
+    
+    Args:
+        db: Database session of the ongoing transaction
+        topic: Event topic, one of the ``services.events`` event types
+        payload: JSON-serializable event payload
+        user_id: User the event concerns
+        project_id: Project the event concerns
+        
+    Returns:
+        OutboxEvent: Pending outbox event
+    """
+    event = OutboxEvent(
+        topic=topic,
+        payload=payload,
+        user_id=user_id,
+        project_id=project_id,
+    )
+    db.add(event)
+    return event
+
+def _as_dict(event: OutboxEvent) -> Dict[str, Any]:
+    """Convert an outbox row to the dict passed to publishers and handlers."""
+    return {
+        "id": event.id,
+        "topic": event.topic,
+        "payload": event.payload,
+        "user_id": event.user_id,
+        "project_id": event.project_id,
+        "created_at": event.created_at,
+    }
+
+def _retry_delay(attempts: int) -> timedelta:
+    """Backoff before the next attempt of an event that failed ``attempts`` times."""
+    delay = settings.OUTBOX_RETRY_BASE_DELAY * 2 ** min(attempts - 1, 32)
+    return timedelta(seconds=min(delay, settings.OUTBOX_RETRY_MAX_DELAY))
+
+def relay_batch(db: Session, batch_size: int, exclude_ids: Collection[int] = ()) -> Dict[str, Any]:
+    """
+    Relay one batch of unpublished outbox events.
+    
+    Rows are locked with ``FOR UPDATE SKIP LOCKED`` so several relays can
+    run concurrently without relaying the same batch twice. Handlers run
+    first; only the events whose handlers succeeded are published to the
+    event bus and marked published, so a retried event reaches live
+    subscribers once. A failed event is retried after a backoff that doubles
+    with every attempt.
+    
+    Args:
+        db: Database session
+        batch_size: Maximum number of events to relay
+        exclude_ids: Events to skip, e.g. ones that already failed in this run
+        
+    Returns:
+        Dict: Number of events ``published`` and ``failed``, the ids of the
+        ``failed_ids`` and the ``max_lag`` in seconds between an event's
+        creation and its publication
+    """
+    now = datetime.utcnow()
+    query = db.query(OutboxEvent).filter(
+        OutboxEvent.published_at.is_(None),
+        OutboxEvent.attempts < settings.OUTBOX_MAX_ATTEMPTS,
+        or_(OutboxEvent.next_attempt_at.is_(None), OutboxEvent.next_attempt_at <= now),
+    )
+    if exclude_ids:
+        query = query.filter(OutboxEvent.id.notin_(exclude_ids))
+    batch = (
+        query
+        .order_by(OutboxEvent.id)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+        .all()
+    )
+    if not batch:
+        db.rollback()
+        return {"published": 0, "failed": 0, "failed_ids": [], "max_lag": 0.0}
+    
+    succeeded, failed_ids = [], []
+    for event in batch:
+        event.attempts += 1
+        try:
+            for handler in _handlers.get(event.topic, ()):
+                handler(_as_dict(event))
+        except Exception as e:
+            logger.exception("Outbox handler failed for event %s", event.id)
+            event.last_error = repr(e)
+            event.next_attempt_at = now + _retry_delay(event.attempts)
+            failed_ids.append(event.id)
+            continue
+        succeeded.append(event)
+    
+    # One round trip for the whole batch; a Redis failure aborts the batch
+    # and leaves every row unpublished for the next run
+    if succeeded:
+        try:
+            events.publish_events([
+                {
+                    "type": event.topic,
+                    "data": {"event_id": event.id, **event.payload},
+                    "user_id": event.user_id,
+                    "project_id": event.project_id,
+                }
+                for event in succeeded
+            ])
+        except Exception:
+            db.rollback()
+            raise
+    
+    now = datetime.utcnow()
+    max_lag = 0.0
+    for event in succeeded:
+        event.published_at = now
+        event.last_error = None
+        event.next_attempt_at = None
+        max_lag = max(max_lag, (now - event.created_at).total_seconds())
+    
+    db.commit()
+    return {
+        "published": len(succeeded),
+        "failed": len(failed_ids),
+        "failed_ids": failed_ids,
+        "max_lag": max_lag,
+    }
+
+def relay_outbox(db: Session) -> Dict[str, Any]:
+    """
+    Drain the outbox in batches until it is empty or the time budget is spent.
+    
+    Events that fail are not retried within the same run; they wait for
+    their backoff to pass.
+    
+    Args:
+        db: Database session
+        
+    Returns:
+        Dict: Relay statistics: ``published``, ``failed``, ``batches``,
+        ``elapsed`` seconds, ``throughput`` in events per second, ``max_lag``
+        seconds of the slowest relayed event and ``backlog_lag`` seconds of
+        the oldest event still waiting
+    """
+    start = time.monotonic()
+    stats = {"published": 0, "failed": 0, "batches": 0, "max_lag": 0.0}
+    failed_ids: Set[int] = set()
+    
+    while time.monotonic() - start < settings.OUTBOX_RELAY_TIME_BUDGET:
+        result = relay_batch(db, settings.OUTBOX_BATCH_SIZE, failed_ids)
+        if not result["published"] and not result["failed"]:
+            break
+        failed_ids.update(result["failed_ids"])
+        stats["batches"] += 1
+        stats["published"] += result["published"]
+        stats["failed"] += result["failed"]
+        stats["max_lag"] = max(stats["max_lag"], result["max_lag"])
+        if result["published"] + result["failed"] < settings.OUTBOX_BATCH_SIZE:
+            break
+    
+    elapsed = time.monotonic() - start
+    stats["elapsed"] = elapsed
+    stats["throughput"] = stats["published"] / elapsed if elapsed > 0 else 0.0
+    stats["backlog_lag"] = backlog_lag(db)
+    
+    if stats["published"] or stats["failed"]:
+        logger.info(
+            "Outbox relay: published=%d failed=%d batches=%d "
+            "throughput=%.1f/s max_lag=%.3fs backlog_lag=%.3fs",
+            stats["published"], stats["failed"], stats["batches"],
+            stats["throughput"], stats["max_lag"], stats["backlog_lag"],
+        )
+    return stats
+
+def backlog_lag(db: Session) -> float:
+    """
+    Age in seconds of the oldest event still waiting to be relayed.
+    
+    Args:
+        db: Database session
+        
+    Returns:
+        float: Lag in seconds, 0 when the outbox is drained
+    """
+    oldest = (
+        db.query(func.min(OutboxEvent.created_at))
+        .filter(
+            OutboxEvent.published_at.is_(None),
+            OutboxEvent.attempts < settings.OUTBOX_MAX_ATTEMPTS,
+        )
+        .scalar()
+    )
+    db.rollback()
+    if oldest is None:
+        return 0.0
+    return max(0.0, (datetime.utcnow() - oldest).total_seconds())
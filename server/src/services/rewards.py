@@ -0,0 +1,122 @@
+"""
+Token rewards for verified contributions.
+
+A verified contribution earns ``value * rate`` tokens, where the rate depends
+on the contribution type and is configured with the ``TOKEN_RATE_*``
+settings. The rates are also exposed as a SQL expression so that the reward
+of a whole batch is computed by the database in one statement; both round to
+six decimals.
+
+Verifying a contribution, one at a time or in bulk, creates its pending
+``Token`` with :func:`create_reward_tokens`.
+"""
+
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence
+
+from sqlalchemy import Float, Numeric, case, cast, func, insert
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.elements import ColumnElement
+
+from ..config.settings import settings
+from ..db.models import ActivityKind, Contribution, ContributionType, Token, TokenStatus, TokenType
+from .activity import record_activities
+from .summary import mark_stale
+
+def token_rates() -> Dict[ContributionType, float]:
+    """
+    Tokens earned per unit of contribution value, by contribution type.
+    
+    Returns:
+        Dict[ContributionType, float]: Rate of each type
+    """
+    return {
+        contribution_type: getattr(settings, f"TOKEN_RATE_{contribution_type.name}")
+        for contribution_type in ContributionType
+    }
+
+def token_amount(contribution_type: ContributionType, value: Optional[float]) -> float:
+    """
+    Token reward of one contribution.
+    
+    Args:
+        contribution_type: Contribution type
+        value: Contribution value
+        
+    Returns:
+        float: Token amount
+    """
+    return round((value or 0.0) * token_rates().get(contribution_type, 0.0), 6)
+
+def token_amount_expr() -> ColumnElement:
+    """
+    SQL expression computing the token reward of each contribution row.
+    
+    Returns:
+        ColumnElement: Expression usable in UPDATE ... SET and SELECT
+    """
+    rate = case(
+        *((Contribution.type == contribution_type, rate) for contribution_type, rate in token_rates().items()),
+        else_=0.0,
+    )
+    return cast(func.round(cast(Contribution.value * rate, Numeric), 6), Float)
+
+def create_reward_tokens(db: Session, rewards: Sequence[Any], now: datetime) -> List[Dict[str, Any]]:
+    """
+    Create the pending tokens earned by verified contributions.
+    
+    Tokens and their timeline entries are inserted in bulk, in the ongoing
+    transaction. Contributions without a reward get no token.
+    
+    Args:
+        db: Database session of the ongoing transaction
+        rewards: Verified contributions, objects with ``id``, ``user_id``,
+            ``project_id`` and ``token_amount``
+        now: Time of the verification
+        
+    Returns:
+        List[Dict[str, Any]]: Values of the created tokens
+    """
+    tokens = [
+        {
+            "amount": reward.token_amount,
+            "type": TokenType.CONTRIBUTION,
+            "status": TokenStatus.PENDING,
+            "user_id": reward.user_id,
+            "contribution_id": reward.id,
+            "created_at": now,
+            "updated_at": now,
+        }
+        for reward in rewards
+        if reward.token_amount
+    ]
+    if not tokens:
+        return tokens
+    
+    created_tokens = db.execute(
+        insert(Token).returning(Token.id, Token.user_id, Token.contribution_id),
+        tokens,
+    ).all()
+    contributions = {reward.id: reward for reward in rewards}
+    record_activities(
+        db,
+        [
+            {
+                "kind": ActivityKind.TOKEN,
+                "user_id": token.user_id,
+                "subject_id": token.id,
+                "project_id": contributions[token.contribution_id].project_id,
+                "occurred_at": now,
+                "data": {
+                    "amount": contributions[token.contribution_id].token_amount,
+                    "type": TokenType.CONTRIBUTION.value,
+                    "contribution_id": token.contribution_id,
+                },
+            }
+            for token in created_tokens
+        ],
+    )
+    
+    # The bulk INSERT bypasses the unit of work
+    mark_stale(db, {token["user_id"] for token in tokens})
+    return tokens
@@ -0,0 +1,158 @@
+"""
+Login sessions: short-lived access tokens and rotating refresh tokens.
+
+A login starts a session and returns an access token (a JWT valid for
+``JWT_ACCESS_TOKEN_EXPIRE_MINUTES``) and an opaque refresh token. Exchanging
+the refresh token returns a new pair and retires the old refresh token, so
+clients stay signed in without sending their password again. A retired
+refresh token presented a second time means it leaked; the whole session is
+revoked.
+
+Refresh tokens are stored in Redis by hash only. Revoked sessions are listed
+in ``utils.revocation``, which access token checks consult in memory.
+"""
+
+import hashlib
+import secrets
+import time
+import uuid
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from ..config.settings import settings
+from ..utils.auth import create_access_token
+from ..utils.redis_client import get_redis
+from ..utils.revocation import REVOCATION_CHANNEL, REVOKED_KEY
+
+# Marks a refresh token used and returns its session, atomically, so two
+# concurrent refreshes with the same token cannot both succeed.
+#
+# KEYS[1] refresh token hash
+# Returns {0} if unknown, {1, sid, user_id} if valid, {2, sid} if already used
+ROTATE_SCRIPT = """
+local sid = redis.call('HGET', KEYS[1], 'sid')
+if not sid then
+    return {0}
+end
+if redis.call('HGET', KEYS[1], 'used') == '1' then
+    return {2, sid}
+end
+redis.call('HSET', KEYS[1], 'used', '1')
+return {1, sid, redis.call('HGET', KEYS[1], 'user_id')}
+"""
+
+def _refresh_ttl() -> int:
+    """Lifetime of a refresh token in seconds."""
+    return settings.JWT_REFRESH_TOKEN_EXPIRE_DAYS * 86400
+
+def _refresh_key(refresh_token: str) -> str:
+    """Redis key of a refresh token."""
+    return f"auth:refresh:{hashlib.sha256(refresh_token.encode()).hexdigest()}"
+
+def _sessions_key(user_id: int) -> str:
+    """Redis key of the set of a user's session ids."""
+    return f"auth:sessions:{user_id}"
+
+def _decode(value: Any) -> str:
+    """Decode a Redis value."""
+    return value.decode() if isinstance(value, bytes) else value
+
+def issue_tokens(user_id: int, session_id: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Issue an access token and a refresh token.
+    
+    Args:
+        user_id: User the tokens are for
+        session_id: Session to extend, a new session if None
+        
+    Returns:
+        Dict[str, Any]: Token response
+    """
+    session_id = session_id or uuid.uuid4().hex
+    refresh_token = secrets.token_urlsafe(32)
+    
+    pipeline = get_redis().pipeline()
+    pipeline.hset(_refresh_key(refresh_token), mapping={"sid": session_id, "user_id": user_id, "used": "0"})
+    pipeline.expire(_refresh_key(refresh_token), _refresh_ttl())
+    pipeline.sadd(_sessions_key(user_id), session_id)
+    pipeline.expire(_sessions_key(user_id), _refresh_ttl())
+    pipeline.execute()
+    
+    access_token = create_access_token(data={"sub": str(user_id), "sid": session_id})
+    return {
+        "access_token": access_token,
+        "refresh_token": refresh_token,
+        "token_type": "bearer",
+        "expires_in": settings.JWT_ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+    }
+
+def is_session_revoked(session_id: str) -> bool:
+    """
+    Check the revoked session list in Redis.
+    
+    Args:
+        session_id: Session id
+        
+    Returns:
+        bool: True if the session was revoked
+    """
+    expires_at = get_redis().zscore(REVOKED_KEY, session_id)
+    return expires_at is not None and expires_at > time.time()
+
+def rotate_refresh_token(refresh_token: str) -> Optional[Tuple[int, str]]:
+    """
+    Retire a refresh token.
+    
+    A token that was already used revokes its session.
+    
+    Args:
+        refresh_token: Refresh token from the client
+        
+    Returns:
+        Optional[Tuple[int, str]]: User id and session id, None if the token
+        is unknown, expired, reused or its session was revoked
+    """
+    result = get_redis().eval(ROTATE_SCRIPT, 1, _refresh_key(refresh_token))
+    if result[0] == 2:
+        revoke_sessions([_decode(result[1])])
+        return None
+    if result[0] != 1:
+        return None
+    
+    session_id = _decode(result[1])
+    if is_session_revoked(session_id):
+        return None
+    return int(result[2]), session_id
+
+def revoke_sessions(session_ids: Iterable[str]) -> None:
+    """
+    Revoke sessions in every API process.
+    
+    Entries are kept as long as any refresh token of the sessions may still
+    be valid, which also outlasts their access tokens.
+    
+    Args:
+        session_ids: Sessions to revoke
+    """
+    session_ids = list(session_ids)
+    if not session_ids:
+        return
+    
+    now = time.time()
+    pipeline = get_redis().pipeline()
+    pipeline.zadd(REVOKED_KEY, {session_id: now + _refresh_ttl() for session_id in session_ids})
+    pipeline.zremrangebyscore(REVOKED_KEY, "-inf", now)
+    for session_id in session_ids:
+        pipeline.publish(REVOCATION_CHANNEL, session_id)
+    pipeline.execute()
+
+def revoke_user_sessions(user_id: int) -> None:
+    """
+    Revoke every session of a user, e.g. after a password change.
+    
+    Args:
+        user_id: User whose sessions to revoke
+    """
+    client = get_redis()
+    session_ids = [_decode(session_id) for session_id in client.smembers(_sessions_key(user_id))]
+    revoke_sessions(session_ids)
+    client.delete(_sessions_key(user_id))
@@ -0,0 +1,243 @@
+"""
+User profile summaries.
+
+A summary gathers everything a profile page shows about a user: the profile,
+contribution counts, visible badges and token balances. It is built with two
+queries and cached in Redis.
+
+Cached summaries are invalidated when a transaction that changed a user, one
+of their contributions, badges or tokens commits. Session flushes are tracked
+automatically; set-based statements that bypass the unit of work report the
+users they touched with :func:`mark_stale`. Badge definitions are shared by
+many users, so changing one bumps a generation number instead, which turns
+every cached summary stale at once.
+
+A summary built while a writer commits could be stored after the writer's
+invalidation and outlive it. Invalidating a user also bumps their version
+number, and a summary is stored only if neither the user's version nor the
+generation changed since they were read, before the build.
+"""
+
+import json
+import logging
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from redis.exceptions import RedisError
+from sqlalchemy import event, func, inspect, select
+from sqlalchemy.orm import Session, joinedload
+
+from ..config.settings import settings
+from ..db.database import SessionLocal
+from ..db.models import Badge, Contribution, Token, TokenStatus, User, UserBadge
+from ..utils.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+GENERATION_KEY = "summary:generation"
+
+# Stores a summary only if it was built from current data, atomically.
+#
+# KEYS[1] cached summary, KEYS[2] user version, KEYS[3] generation
+# ARGV[1] user version and ARGV[2] generation read before the build,
+# ARGV[3] entry, ARGV[4] TTL in seconds
+# Returns 1 if stored, 0 if the summary went stale while it was built
+STORE_SCRIPT = """
+if tonumber(redis.call('GET', KEYS[2]) or '0') ~= tonumber(ARGV[1]) then
+    return 0
+end
+if tonumber(redis.call('GET', KEYS[3]) or '0') ~= tonumber(ARGV[2]) then
+    return 0
+end
+redis.call('SET', KEYS[1], ARGV[3], 'EX', ARGV[4])
+return 1
+"""
+
+# Session.info keys collecting what the ongoing transaction made stale
+_STALE_USERS = "summary_stale_users"
+_STALE_ALL = "summary_stale_all"
+
+def _cache_key(user_id: int) -> str:
+    """Redis key of a user's cached summary."""
+    return f"summary:user:{user_id}"
+
+def _version_key(user_id: int) -> str:
+    """Redis key of the number of times a user's summary was invalidated."""
+    return f"summary:version:{user_id}"
+
+def _token_sum(token_status: TokenStatus):
+    """Correlated subquery summing a user's tokens of one status."""
+    return (
+        select(func.coalesce(func.sum(Token.amount), 0.0))
+        .where(Token.user_id == User.id, Token.status == token_status)
+        .scalar_subquery()
+    )
+
+def build_summary(db: Session, user_id: int) -> Optional[Dict[str, Any]]:
+    """
+    Build a user's summary from the database.
+    
+    The profile, the contribution counts and the token balances come from
+    one grouped query (one row per contribution type and status); the visible
+    badges and their details from a second one.
+    
+    Args:
+        db: Database session
+        user_id: User ID
+        
+    Returns:
+        Optional[Dict[str, Any]]: Summary, None if the user does not exist
+    """
+    rows = db.execute(
+        select(
+            User,
+            Contribution.type,
+            Contribution.status,
+            func.count(Contribution.id),
+            _token_sum(TokenStatus.CONFIRMED),
+            _token_sum(TokenStatus.PENDING),
+        )
+        .outerjoin(Contribution, Contribution.user_id == User.id)
+        .where(User.id == user_id)
+        .group_by(User.id, Contribution.type, Contribution.status)
+    ).all()
+    if not rows:
+        return None
+    
+    user, _, _, _, confirmed, pending = rows[0]
+    contributions = {"total": 0, "by_status": {}, "by_type": {}}
+    for _, contribution_type, contribution_status, count, _, _ in rows:
+        if not count:
+            continue
+        contributions["total"] += count
+        by_status = contributions["by_status"]
+        by_status[contribution_status.value] = by_status.get(contribution_status.value, 0) + count
+        by_type = contributions["by_type"]
+        by_type[contribution_type.value] = by_type.get(contribution_type.value, 0) + count
+    
+    badges = db.scalars(
+        select(UserBadge)
+        .options(joinedload(UserBadge.badge))
+        .where(UserBadge.user_id == user_id, UserBadge.is_visible.is_(True))
+        .order_by(UserBadge.created_at.desc())
+    ).all()
+    
+    return {
+        "user": user,
+        "contributions": contributions,
+        "badges": badges,
+        "tokens": {"confirmed": confirmed, "pending": pending},
+    }
+
+def get_cached_summary(user_id: int) -> Tuple[Optional[Dict[str, Any]], Optional[Tuple[int, int]]]:
+    """
+    Read a user's summary from the cache.
+    
+    Args:
+        user_id: User ID
+        
+    Returns:
+        Tuple[Optional[Dict[str, Any]], Optional[Tuple[int, int]]]: Cached
+        summary, None on a miss, and the user's version and the generation to
+        store a fresh summary under, None when the cache is unavailable
+    """
+    try:
+        cached, version, generation = get_redis().mget(
+            _cache_key(user_id), _version_key(user_id), GENERATION_KEY,
+        )
+    except RedisError:
+        logger.warning("Summary cache unavailable", exc_info=True)
+        return None, None
+    stamp = (int(version or 0), int(generation or 0))
+    if cached is None:
+        return None, stamp
+    entry = json.loads(cached)
+    if entry["generation"] != stamp[1]:
+        return None, stamp
+    return entry["summary"], stamp
+
+def cache_summary(user_id: int, summary: Dict[str, Any], stamp: Tuple[int, int]) -> bool:
+    """
+    Store a user's summary in the cache unless it went stale while built.
+    
+    Args:
+        user_id: User ID
+        summary: JSON-serializable summary
+        stamp: User's version and generation read before the summary was
+            built, so that a change committed meanwhile still invalidates it
+            
+    Returns:
+        bool: True if the summary was stored
+    """
+    version, generation = stamp
+    try:
+        return bool(get_redis().eval(
+            STORE_SCRIPT, 3,
+            _cache_key(user_id), _version_key(user_id), GENERATION_KEY,
+            version, generation,
+            json.dumps({"generation": generation, "summary": summary}),
+            settings.USER_SUMMARY_CACHE_TTL,
+        ))
+    except RedisError:
+        logger.warning("Summary cache unavailable", exc_info=True)
+        return False
+
+def mark_stale(db: Session, user_ids: Iterable[int]) -> None:
+    """
+    Invalidate the users' summaries once the session's transaction commits.
+    
+    Args:
+        db: Database session of the ongoing transaction
+        user_ids: Users whose summary the transaction changes
+    """
+    db.info.setdefault(_STALE_USERS, set()).update(user_ids)
+
+def mark_all_stale(db: Session) -> None:
+    """
+    Invalidate every summary once the session's transaction commits.
+    
+    Args:
+        db: Database session of the ongoing transaction
+    """
+    db.info[_STALE_ALL] = True
+
+def _user_ids(obj: Any) -> Iterable[int]:
+    """Users whose summary depends on a flushed object, before and after the change."""
+    attribute = "id" if isinstance(obj, User) else "user_id"
+    history = inspect(obj).attrs[attribute].history
+    return [user_id for user_id in (*history.unchanged, *history.added, *history.deleted) if user_id]
+
+@event.listens_for(SessionLocal, "after_flush")
+def _track_flush(db: Session, flush_context) -> None:
+    """Collect the summaries made stale by a flush."""
+    for obj in (*db.new, *db.dirty, *db.deleted):
+        if isinstance(obj, Badge):
+            mark_all_stale(db)
+        elif isinstance(obj, (User, Contribution, UserBadge, Token)):
+            mark_stale(db, _user_ids(obj))
+
+@event.listens_for(SessionLocal, "after_commit")
+def _invalidate(db: Session) -> None:
+    """Drop the summaries made stale by the committed transaction."""
+    user_ids = db.info.pop(_STALE_USERS, None)
+    stale_all = db.info.pop(_STALE_ALL, False)
+    if not user_ids and not stale_all:
+        return
+    try:
+        pipeline = get_redis().pipeline()
+        if stale_all:
+            pipeline.incr(GENERATION_KEY)
+        for user_id in user_ids or ():
+            # Outlives any build that read the previous version
+            pipeline.incr(_version_key(user_id))
+            pipeline.expire(_version_key(user_id), settings.USER_SUMMARY_CACHE_TTL)
+            pipeline.delete(_cache_key(user_id))
+        pipeline.execute()
+    except RedisError:
+        # Entries expire after USER_SUMMARY_CACHE_TTL at the latest
+        logger.warning("Failed to invalidate summaries", exc_info=True)
+
+@event.listens_for(SessionLocal, "after_rollback")
+def _discard(db: Session) -> None:
+    """Forget what a rolled back transaction would have made stale."""
+    db.info.pop(_STALE_USERS, None)
+    db.info.pop(_STALE_ALL, None)
@@ -0,0 +1,5 @@
+"""Background tasks executed by the Celery worker."""
+
+# Registers the session listeners that invalidate cached profile summaries,
+# so that rows written by tasks invalidate them as they do in the API
+from ..services import summary  # noqa: F401
@@ -0,0 +1,28 @@
+"""Activity timeline maintenance tasks."""
+
+import logging
+
+from ..db.database import SessionLocal
+from ..services.activity import backfill_activity
+from ..worker import celery, PRIORITY_LOW
+
+logger = logging.getLogger(__name__)
+
+@celery.task(priority=PRIORITY_LOW)
+def backfill_activity_task() -> dict:
+    """
+    Create the timeline entries of history written before the timeline.
+    
+    Safe to rerun; entries that already exist are skipped.
+    
+    Returns:
+        dict: Number of entries created per subject table
+    """
+    db = SessionLocal()
+    try:
+        created = backfill_activity(db)
+    finally:
+        db.close()
+    
+    logger.info("Activity backfill created %s", created)
+    return created
@@ -0,0 +1,20 @@
+"""Analytics rollup tasks."""
+
+from ..config.settings import settings
+from ..db.database import SessionLocal
+from ..services.analytics import refresh_contribution_rollups
+from ..worker import celery
+
+@celery.task(expires=settings.ANALYTICS_ROLLUP_INTERVAL)
+def refresh_rollups_task() -> dict:
+    """
+    Re-aggregate the days with contributions changed since the last run.
+    
+    Returns:
+        dict: Refresh statistics
+    """
+    db = SessionLocal()
+    try:
+        return refresh_contribution_rollups(db)
+    finally:
+        db.close()
@@ -0,0 +1,20 @@
+"""Cold-tier archival tasks."""
+
+from ..config.settings import settings
+from ..db.database import SessionLocal
+from ..services.archive import archive_old_partitions
+from ..worker import celery
+
+@celery.task(expires=settings.ARCHIVE_INTERVAL)
+def archive_partitions_task() -> dict:
+    """
+    Move the monthly partitions older than the archive horizon to Parquet.
+    
+    Returns:
+        dict: Archived partitions per table
+    """
+    db = SessionLocal()
+    try:
+        return archive_old_partitions(db)
+    finally:
+        db.close()
@@ -0,0 +1,60 @@
+"""Badge token metadata tasks."""
+
+from typing import Any, Dict, List, Optional
+
+from ..db.database import SessionLocal
+from ..services import events
+from ..services.badge_metadata import publish_badge_metadata
+from ..services.outbox import outbox_handler
+from ..worker import celery, PRIORITY_LOW
+
+@celery.task
+def publish_badge_metadata_task(
+    user_badge_ids: Optional[List[int]] = None,
+    badge_ids: Optional[List[int]] = None,
+    stale_token_ids: Optional[List[int]] = None,
+) -> dict:
+    """
+    Render and store the metadata of changed badge tokens.
+    
+    Args:
+        user_badge_ids: Awards whose token to publish
+        badge_ids: Badges whose tokens to publish
+        stale_token_ids: Token ids that may no longer have metadata
+        
+    Returns:
+        dict: Number of tokens published and removed
+    """
+    db = SessionLocal()
+    try:
+        return publish_badge_metadata(db, user_badge_ids or [], badge_ids or [], stale_token_ids or [])
+    finally:
+        db.close()
+
+@celery.task(priority=PRIORITY_LOW)
+def backfill_badge_metadata_task() -> dict:
+    """
+    Render and store the metadata of every badge token.
+    
+    Returns:
+        dict: Number of tokens published and removed
+    """
+    db = SessionLocal()
+    try:
+        return publish_badge_metadata(db)
+    finally:
+        db.close()
+
+@outbox_handler(events.BADGE_AWARDED, events.USER_BADGE_UPDATED)
+def _on_award_changed(event: Dict[str, Any]) -> None:
+    """Republish the metadata of an award's token."""
+    previous_token_id = event["payload"].get("previous_token_id")
+    publish_badge_metadata_task.delay(
+        user_badge_ids=[event["payload"]["user_badge_id"]],
+        stale_token_ids=[previous_token_id] if previous_token_id is not None else [],
+    )
+
+@outbox_handler(events.BADGE_UPDATED)
+def _on_badge_updated(event: Dict[str, Any]) -> None:
+    """Republish the metadata of every token of a badge."""
+    publish_badge_metadata_task.delay(badge_ids=[event["payload"]["badge_id"]])
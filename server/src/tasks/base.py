@@ -0,0 +1,164 @@
+"""Base classes and helpers for Celery tasks."""
+
+import hashlib
+import json
+import logging
+from typing import Any, Callable, Dict, List, Optional
+
+from celery import Task
+
+from ..config.settings import settings
+from ..utils.redis_client import get_redis
+from ..worker import celery
+
+logger = logging.getLogger(__name__)
+
+class IdempotentTask(Task):
+    """
+    Task that runs at most once per idempotency key.
+    
+    Before running, the task takes a short Redis lock on its key so that a
+    redelivered copy does not run concurrently; after a successful run the
+    key is marked done for ``TASK_IDEMPOTENCY_TTL`` seconds and further
+    copies are skipped. A copy finding the lock taken is retried later
+    rather than dropped: the lock may belong to a worker that crashed, in
+    which case it expires and the retry runs the job (see ``test_tasks.py``).
+    Tasks may define ``idempotency_key`` (a callable receiving the task
+    arguments) to choose which arguments identify a job; by default all
+    arguments do.
+    """
+    
+    idempotency_key: Optional[Callable[..., str]] = None
+    
+    def _key(self, args: tuple, kwargs: dict) -> str:
+        """Build the Redis key identifying this invocation."""
+        if self.idempotency_key is not None:
+            identity = str(self.idempotency_key(*args, **kwargs))
+        else:
+            identity = hashlib.sha256(
+                json.dumps([args, kwargs], sort_keys=True, default=str).encode()
+            ).hexdigest()
+        return f"task:idempotency:{self.name}:{identity}"
+    
+    def __call__(self, *args, **kwargs):
+        """Run the task unless it already ran or is running elsewhere."""
+        key = self._key(args, kwargs)
+        redis = get_redis()
+        
+        if redis.exists(f"{key}:done"):
+            logger.info("Skipping %s: already done", self.name)
+            return None
+        
+        lock_ttl = int(self.time_limit or settings.TASK_IDEMPOTENCY_LOCK_TTL)
+        if not redis.set(f"{key}:lock", 1, nx=True, ex=lock_ttl):
+            if self.request.called_directly:
+                logger.info("Skipping %s: already running", self.name)
+                return None
+            # Check again once the other copy finished or its lock expired
+            countdown = min(max(redis.ttl(f"{key}:lock"), 1), settings.TASK_IDEMPOTENCY_RETRY_DELAY)
+            logger.info("Deferring %s by %ss: already running", self.name, countdown)
+            raise self.retry(countdown=countdown, max_retries=None)
+        
+        try:
+            result = super().__call__(*args, **kwargs)
+            redis.set(f"{key}:done", 1, ex=settings.TASK_IDEMPOTENCY_TTL)
+            return result
+        finally:
+            redis.delete(f"{key}:lock")
+
+
+# Registered batches, keyed by name
+_batches: Dict[str, "Batch"] = {}
+
+class Batch:
+    """
+    Accumulates many small jobs and processes them in one task execution.
+    
+    Producers call :meth:`add`, which appends the item to a Redis list. When
+    the list reaches ``max_size`` a flush task is enqueued immediately;
+    otherwise the periodic ``flush_all_batches`` task picks the items up
+    within ``TASK_BATCH_FLUSH_INTERVAL`` seconds.
+    
+    Args:
+        name: Batch name, used in the Redis key
+        handler: Function processing a list of items
+        max_size: Number of items processed per execution
+    """
+    
+    def __init__(self, name: str, handler: Callable[[List[Any]], None], max_size: int):
+        """Initialize the batch."""
+        self.name = name
+        self.handler = handler
+        self.max_size = max_size
+        self.key = f"task:batch:{name}"
+    
+    def add(self, item: Any) -> None:
+        """
+        Queue an item for batched processing.
+        
+        Args:
+            item: JSON-serializable item
+        """
+        size = get_redis().rpush(self.key, json.dumps(item, default=str))
+        if size % self.max_size == 0:
+            celery.send_task("src.tasks.batching.flush_batch", args=[self.name])
+    
+    def flush(self) -> int:
+        """
+        Process queued items in chunks of ``max_size``.
+        
+        Items are popped atomically, so concurrent flushes never process the
+        same item twice. A chunk whose handler fails is pushed back to the
+        front of the list to be retried.
+        
+        Returns:
+            int: Number of items processed
+        """
+        redis = get_redis()
+        processed = 0
+        while True:
+            raw = redis.lpop(self.key, self.max_size)
+            if not raw:
+                return processed
+            items = [json.loads(value) for value in raw]
+            try:
+                self.handler(items)
+            except Exception:
+                redis.lpush(self.key, *reversed(raw))
+                raise
+            processed += len(items)
+            if len(items) < self.max_size:
+                return processed
+
+def batched(name: str, max_size: int = 100) -> Callable[[Callable[[List[Any]], None]], Batch]:
+    """
+    Register a function as the handler of a batch.
+    
+    Usage::
+    
+        @batched("badge-metadata", max_size=200)
+        def regenerate_metadata(items):
+            ...
+        
+        regenerate_metadata.add({"user_badge_id": 42})
+    
+    Args:
+        name: Batch name
+        max_size: Maximum number of items per handler call
+        
+    Returns:
+        Callable: Decorator returning the :class:`Batch`
+    """
+    def decorator(handler: Callable[[List[Any]], None]) -> Batch:
+        batch = Batch(name, handler, max_size)
+        _batches[name] = batch
+        return batch
+    return decorator
+
+def get_batch(name: str) -> Batch:
+    """Get a registered batch by name."""
+    return _batches[name]
+
+def registered_batches() -> List[Batch]:
+    """Get all registered batches."""
+    return list(_batches.values())
@@ -0,0 +1,20 @@
+"""Tasks flushing batched jobs (see ``tasks.base.Batch``)."""
+
+from ..worker import celery
+from .base import get_batch, registered_batches
+
+@celery.task
+def flush_batch(name: str) -> None:
+    """
+    Process the queued items of one batch.
+    
+    Args:
+        name: Batch name
+    """
+    get_batch(name).flush()
+
+@celery.task
+def flush_all_batches() -> None:
+    """Process the queued items of every registered batch."""
+    for batch in registered_batches():
+        batch.flush()
@@ -0,0 +1,20 @@
+"""Chain indexer tasks."""
+
+from ..blockchain.indexer import index_chain
+from ..config.settings import settings
+from ..db.database import SessionLocal
+from ..worker import celery
+
+@celery.task(expires=settings.CHAIN_INDEXER_INTERVAL)
+def index_chain_task() -> dict:
+    """
+    Index the contract logs of the blocks confirmed since the last run.
+    
+    Returns:
+        dict: Indexing statistics
+    """
+    db = SessionLocal()
+    try:
+        return index_chain(db)
+    finally:
+        db.close()
@@ -0,0 +1,60 @@
+"""Celery task metrics and tracing."""
+
+import logging
+import os
+import time
+
+from celery.signals import (
+    task_postrun,
+    task_prerun,
+    worker_init,
+    worker_process_init,
+    worker_process_shutdown,
+)
+from prometheus_client import multiprocess, start_http_server
+
+from ..config.settings import settings
+from ..db.database import engine
+from ..utils.metrics import CELERY_TASK_RUNTIME, instrument_pool, metrics_registry
+from ..utils.tracing import configure_tracing, instrument_engine, instrument_libraries
+
+logger = logging.getLogger(__name__)
+
+# Start times of running tasks, keyed by task ID
+_started = {}
+
+instrument_pool(engine)
+instrument_engine(engine)
+instrument_libraries()
+
+@task_prerun.connect
+def _task_started(task_id=None, **kwargs):
+    """Remember when a task started."""
+    _started[task_id] = time.perf_counter()
+
+@task_postrun.connect
+def _task_finished(task_id=None, task=None, state=None, **kwargs):
+    """Record the task's runtime."""
+    start = _started.pop(task_id, None)
+    if start is not None and task is not None:
+        CELERY_TASK_RUNTIME.labels(task.name, state or "UNKNOWN").observe(
+            time.perf_counter() - start
+        )
+
+@worker_init.connect
+def _serve_metrics(**kwargs):
+    """Expose metrics of the worker and its pool processes over HTTP."""
+    if settings.CELERY_METRICS_PORT:
+        start_http_server(settings.CELERY_METRICS_PORT, registry=metrics_registry())
+        logger.info("Serving Celery metrics on port %d", settings.CELERY_METRICS_PORT)
+
+@worker_process_shutdown.connect
+def _mark_process_dead(pid=None, **kwargs):
+    """Drop live gauges of an exiting pool process."""
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        multiprocess.mark_process_dead(pid or os.getpid())
+
+@worker_process_init.connect
+def _start_tracing(**kwargs):
+    """Install the tracer provider in each pool process after fork."""
+    configure_tracing("bettercorp-worker")
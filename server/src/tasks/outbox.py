@@ -0,0 +1,27 @@
+"""Outbox relay task."""
+
+from ..db.database import SessionLocal
+from ..services.outbox import relay_outbox
+from ..utils.metrics import OUTBOX_BACKLOG_LAG, OUTBOX_EVENTS_RELAYED, OUTBOX_RELAY_LAG
+from ..worker import celery, PRIORITY_HIGH
+
+@celery.task(priority=PRIORITY_HIGH)
+def relay_outbox_task() -> dict:
+    """
+    Publish pending outbox events.
+    
+    Returns:
+        dict: Relay statistics (throughput and lag), also logged
+    """
+    db = SessionLocal()
+    try:
+        stats = relay_outbox(db)
+    finally:
+        db.close()
+    
+    OUTBOX_EVENTS_RELAYED.labels("published").inc(stats["published"])
+    OUTBOX_EVENTS_RELAYED.labels("failed").inc(stats["failed"])
+    OUTBOX_BACKLOG_LAG.set(stats["backlog_lag"])
+    if stats["published"]:
+        OUTBOX_RELAY_LAG.observe(stats["max_lag"])
+    return stats
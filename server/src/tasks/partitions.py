@@ -0,0 +1,20 @@
+"""Table partition maintenance tasks."""
+
+from ..config.settings import settings
+from ..db.database import SessionLocal
+from ..db.partitions import maintain_partitions
+from ..worker import celery
+
+@celery.task(expires=settings.PARTITION_MAINTENANCE_INTERVAL)
+def maintain_partitions_task() -> dict:
+    """
+    Create the coming months' partitions and detach expired ones.
+    
+    Returns:
+        dict: Created and detached partitions per table
+    """
+    db = SessionLocal()
+    try:
+        return maintain_partitions(db)
+    finally:
+        db.close()
@@ -0,0 +1,102 @@
+"""
+On-demand profiling of Celery workers.
+
+Tasks run in the pool's child processes, so the ``profile`` remote control
+command (handled by the worker's main process) signals every child, and each
+child samples its own stacks and writes a collapsed-stack file to
+``PROFILER_OUTPUT_DIR``::
+
+    celery -A src.worker.celery control profile 30
+
+The same node-wide guard as the API profiler allows one session at a time.
+"""
+
+import json
+import logging
+import os
+import signal
+import threading
+import time
+
+from celery.signals import worker_process_init
+from celery.worker.control import control_command
+
+from ..config.settings import settings
+from ..utils.profiler import (
+    ProfilerBusy,
+    acquire_session,
+    collapse,
+    release_session,
+    sample_stacks,
+)
+
+logger = logging.getLogger(__name__)
+
+# Signal asking a pool process to profile itself
+PROFILE_SIGNAL = signal.SIGUSR2
+
+def _request_path() -> str:
+    """File through which the main process passes the session duration."""
+    return os.path.join(settings.PROFILER_OUTPUT_DIR, "request.json")
+
+def _profile_child(seconds: float) -> None:
+    """Sample the current pool process and write its collapsed stacks."""
+    counts = sample_stacks(seconds, settings.PROFILER_INTERVAL)
+    path = os.path.join(
+        settings.PROFILER_OUTPUT_DIR,
+        f"celery-{os.getpid()}-{int(time.time())}.collapsed",
+    )
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(collapse(counts))
+    logger.info("Wrote worker profile to %s", path)
+
+def _on_profile_signal(signum, frame) -> None:
+    """Start a sampling thread in this pool process."""
+    try:
+        with open(_request_path(), encoding="utf-8") as f:
+            seconds = float(json.load(f)["seconds"])
+    except (OSError, ValueError, KeyError):
+        return
+    threading.Thread(target=_profile_child, args=(seconds,), daemon=True).start()
+
+@worker_process_init.connect
+def _install_profile_handler(**kwargs):
+    """Let pool processes be profiled on request."""
+    signal.signal(PROFILE_SIGNAL, _on_profile_signal)
+
+@control_command(
+    args=[("seconds", float)],
+    signature="[seconds=10]",
+)
+def profile(state, seconds=10.0):
+    """Profile every pool process of this worker for a number of seconds."""
+    seconds = min(float(seconds), settings.PROFILER_MAX_SECONDS)
+    pids = state.consumer.pool.info.get("processes", [])
+    
+    try:
+        node_locked = acquire_session(seconds)
+    except ProfilerBusy as e:
+        return {"error": str(e)}
+    
+    try:
+        os.makedirs(settings.PROFILER_OUTPUT_DIR, exist_ok=True)
+        with open(_request_path(), "w", encoding="utf-8") as f:
+            json.dump({"seconds": seconds}, f)
+        for pid in pids:
+            os.kill(pid, PROFILE_SIGNAL)
+        if not pids:
+            # Thread-based pools run tasks in this process
+            threading.Thread(target=_profile_child, args=(seconds,), daemon=True).start()
+    except Exception:
+        release_session(node_locked)
+        raise
+    
+    # Hold the node slot, without blocking the worker, until the children
+    # are done sampling
+    threading.Timer(seconds, release_session, args=(node_locked,)).start()
+    
+    return {
+        "ok": f"profiling {len(pids)} processes for {seconds:g}s",
+        "pids": pids,
+        "output_dir": settings.PROFILER_OUTPUT_DIR,
+    }
@@ -0,0 +1,79 @@
+"""Admission control middleware that sheds load before the API saturates."""
+
+import json
+from typing import Callable, Iterable
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+class AdmissionControlMiddleware:
+    """
+    ASGI middleware rejecting requests with 503 when the process is overloaded.
+    
+    A request is shed when the number of requests already in flight in this
+    process reaches ``max_in_flight``, or when the average time spent waiting
+    for a database connection exceeds ``max_pool_wait``. Rejected requests get
+    a ``Retry-After`` header so well-behaved clients back off instead of
+    queueing behind a saturated pool.
+    
+    Args:
+        app: Wrapped ASGI application
+        max_in_flight: Maximum concurrent requests per process
+        max_pool_wait: Maximum average pool checkout wait in seconds
+        pool_wait: Callable returning the current average checkout wait
+        retry_after: Value of the Retry-After header in seconds
+        exempt_paths: Paths that are never shed (health checks, metrics)
+    """
+    
+    def __init__(
+        self,
+        app: ASGIApp,
+        max_in_flight: int,
+        max_pool_wait: float,
+        pool_wait: Callable[[], float],
+        retry_after: int = 1,
+        exempt_paths: Iterable[str] = (),
+    ):
+        """Initialize the middleware."""
+        self.app = app
+        self.max_in_flight = max_in_flight
+        self.max_pool_wait = max_pool_wait
+        self.pool_wait = pool_wait
+        self.retry_after = retry_after
+        self.exempt_paths = frozenset(exempt_paths)
+        self.in_flight = 0
+    
+    def _overloaded(self) -> bool:
+        """Check whether a new request should be shed."""
+        if self.in_flight >= self.max_in_flight:
+            return True
+        return self.pool_wait() > self.max_pool_wait
+    
+    async def _reject(self, send: Send) -> None:
+        """Send a 503 response."""
+        body = json.dumps({"detail": "Server overloaded, retry later"}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 503,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(self.retry_after).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Admit or shed the request."""
+        if scope["type"] != "http" or scope["path"] in self.exempt_paths:
+            await self.app(scope, receive, send)
+            return
+        
+        if self._overloaded():
+            await self._reject(send)
+            return
+        
+        self.in_flight += 1
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.in_flight -= 1
@@ -0,0 +1,64 @@
+"""Helpers for calling ASGI applications in-process."""
+
+from dataclasses import dataclass, field
+from typing import List, Tuple
+
+from starlette.types import ASGIApp, Message, Scope
+
+@dataclass
+class CapturedResponse:
+    """HTTP response collected from an ASGI application."""
+    
+    status: int = 500
+    headers: List[Tuple[bytes, bytes]] = field(default_factory=list)
+    body: bytes = b""
+    
+    def header(self, name: str) -> str:
+        """
+        Get a response header.
+        
+        Args:
+            name: Lower-case header name
+            
+        Returns:
+            str: Header value, empty if absent
+        """
+        key = name.encode()
+        for header, value in self.headers:
+            if header == key:
+                return value.decode("latin-1")
+        return ""
+
+async def call_asgi(app: ASGIApp, scope: Scope, body: bytes = b"") -> CapturedResponse:
+    """
+    Run an HTTP request through an ASGI application and collect its response.
+    
+    Args:
+        app: ASGI application
+        scope: HTTP request scope
+        body: Request body
+        
+    Returns:
+        CapturedResponse: Collected response
+    """
+    response = CapturedResponse()
+    chunks = []
+    request_sent = False
+    
+    async def receive() -> Message:
+        nonlocal request_sent
+        if request_sent:
+            return {"type": "http.disconnect"}
+        request_sent = True
+        return {"type": "http.request", "body": body, "more_body": False}
+    
+    async def send(message: Message) -> None:
+        if message["type"] == "http.response.start":
+            response.status = message["status"]
+            response.headers = list(message.get("headers", []))
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+    
+    await app(scope, receive, send)
+    response.body = b"".join(chunks)
+    return response
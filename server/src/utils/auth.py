@@ -1,17 +1,27 @@
 from datetime import datetime, timedelta
 from typing import Optional
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 from sqlalchemy.orm import Session
 
 from ..config.settings import settings
 from ..db.database import get_db
-# from ..db.models.user import User
+from ..db.models import User
+from .revocation import revocations
+from .tracing import tracer
 
 # OAuth2 scheme for token authentication
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_PREFIX}/auth/token")
+optional_oauth2_scheme = OAuth2PasswordBearer(
+    tokenUrl=f"{settings.API_PREFIX}/auth/token",
+    auto_error=False,
+)
+
+# Request state key under which a request may provide an already validated
+# token payload (set for the sub-requests of a batch)
+PRINCIPAL_STATE = "principal"
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """
@@ -41,6 +51,7 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     return encoded_jwt
 
 async def get_current_user(
+    request: Request,
     token: str = Depends(oauth2_scheme),
     db: Session = Depends(get_db)
 ) -> dict:
@@ -48,6 +59,7 @@ async def get_current_user(
     Get the current authenticated user from the JWT token.
     
     Args:
+        request: Current request
         token: JWT token
         db: Database session
         
@@ -57,6 +69,11 @@ async def get_current_user(
     Raises:
         HTTPException: If token is invalid or user not found
     """
+    # Token already validated for the enclosing batch request
+    principal = request.scope.get("state", {}).get(PRINCIPAL_STATE)
+    if principal is not None:
+        return principal
+    
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -65,14 +82,20 @@ async def get_current_user(
     
     try:
         # Decode the token
-        payload = jwt.decode(
-            token, 
-            settings.JWT_SECRET_KEY, 
-            algorithms=[settings.JWT_ALGORITHM]
-        )
+        with tracer.start_as_current_span("auth.decode_token"):
+            payload = jwt.decode(
+                token, 
+                settings.JWT_SECRET_KEY, 
+                algorithms=[settings.JWT_ALGORITHM]
+            )
         user_id: Optional[str] = payload.get("sub")
+        session_id: Optional[str] = payload.get("sid")
         
-        if user_id is None:
+        if user_id is None or session_id is None:
+            raise credentials_exception
+        
+        # Checked in memory; see utils.revocation
+        if await revocations.is_revoked(session_id):
             raise credentials_exception
             
         # Get the user from the database
@@ -87,4 +110,58 @@ async def get_current_user(
         return payload
         
     except JWTError:
-        raise credentials_exception
\ No newline at end of file
+        raise credentials_exception
+
+async def get_optional_user(
+    request: Request,
+    token: Optional[str] = Depends(optional_oauth2_scheme),
+) -> Optional[dict]:
+    """
+    Get the current user if the request carries a token.
+    
+    Args:
+        request: Current request
+        token: JWT token, if any
+        
+    Returns:
+        Optional[dict]: Current user token payload, None for anonymous requests
+        
+    Raises:
+        HTTPException: If a token is given but invalid
+    """
+    if token is None:
+        return None
+    return await get_current_user(request, token)
+
+def get_current_admin(
+    current_user: dict = Depends(get_current_user),
+    db: Session = Depends(get_db),
+) -> dict:
+    """
+    Require the current user to be an administrator.
+    
+    Args:
+        current_user: Current user from token
+        db: Database session
+        
+    Returns:
+        dict: Current user token payload
+        
+    Raises:
+        HTTPException: If the user is not an active superuser
+    """
+    is_admin = (
+        db.query(User.id)
+        .filter(
+            User.id == current_user.get("sub"),
+            User.is_active.is_(True),
+            User.is_superuser.is_(True),
+        )
+        .first()
+    )
+    if is_admin is None:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Administrator privileges required",
+        )
+    return current_user
@@ -0,0 +1,65 @@
+"""Bloom filter for fast negative membership checks."""
+
+import hashlib
+import math
+from typing import Iterable
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter over strings.
+    
+    Membership tests never give false negatives and give false positives at
+    about ``error_rate`` once ``capacity`` items were added. Items cannot be
+    removed; rebuild a new filter instead.
+    
+    Args:
+        capacity: Expected number of items
+        error_rate: Target false positive rate at capacity
+    """
+    
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        """Initialize an empty filter."""
+        capacity = max(capacity, 1)
+        self.size = max(int(-capacity * math.log(error_rate) / math.log(2) ** 2), 8)
+        self.hash_count = max(round(self.size / capacity * math.log(2)), 1)
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+    
+    def _positions(self, item: str) -> Iterable[int]:
+        """Bit positions of an item, by double hashing one digest."""
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        first, second = int.from_bytes(digest[:8], "little"), int.from_bytes(digest[8:], "little") | 1
+        return ((first + i * second) % self.size for i in range(self.hash_count))
+    
+    def add(self, item: str) -> None:
+        """
+        Add an item.
+        
+        Args:
+            item: Item to add
+        """
+        for position in self._positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+    
+    def __contains__(self, item: str) -> bool:
+        """Whether the item may have been added."""
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+    
+    @classmethod
+    def from_items(cls, items: Iterable[str], capacity: int, error_rate: float = 0.001) -> "BloomFilter":
+        """
+        Build a filter holding the given items.
+        
+        Args:
+            items: Items to add
+            capacity: Expected number of items
+            error_rate: Target false positive rate at capacity
+            
+        Returns:
+            BloomFilter: New filter
+        """
+        bloom = cls(capacity, error_rate)
+        for item in items:
+            bloom.add(item)
+        return bloom
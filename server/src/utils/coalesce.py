@@ -0,0 +1,221 @@
+"""
+Single-flight coalescing of identical GET requests.
+
+When many clients read the same resource at once, e.g. a project right after
+it is announced, only the first request (the leader) runs the endpoint; the
+identical requests arriving while it runs (followers) wait for it and get a
+copy of its response. The database is queried, and the response serialized,
+once per burst instead of once per request.
+
+Requests are identical when they have the same path, query string and
+``Authorization`` header. Coalescing never serves a response produced
+before a request arrived, so it adds no staleness beyond what concurrent
+execution already has.
+
+Within a process, followers await the leader's future. With ``redis`` set,
+leaders of different processes coordinate through a Redis lock: the first
+takes the lock and publishes its response under a key named after the lock
+token, and the others wait for that key instead of running the endpoint.
+
+The collapse ratio is ``http_coalesced_requests_total{role="follower"}``
+over the sum of both roles.
+"""
+
+import asyncio
+import base64
+import hashlib
+import json
+import logging
+import re
+import time
+import uuid
+from typing import Dict, Iterable, List, Optional, Pattern, Tuple
+
+from redis.exceptions import RedisError
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from .asgi import CapturedResponse, call_asgi
+from .metrics import HTTP_COALESCED_REQUESTS
+from .redis_client import get_async_redis
+
+logger = logging.getLogger(__name__)
+
+# Deletes the lock only if it still holds the leader's token
+_RELEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+def _compile(template: str) -> Pattern:
+    """Regular expression matching the paths of a route template."""
+    parts = re.split(r"(\{[^}]+\})", template)
+    return re.compile("^" + "".join(
+        "[^/]+" if part.startswith("{") else re.escape(part) for part in parts
+    ) + "$")
+
+def _encode(response: CapturedResponse) -> str:
+    """Serialize a response for Redis."""
+    return json.dumps({
+        "status": response.status,
+        "headers": [[name.decode("latin-1"), value.decode("latin-1")] for name, value in response.headers],
+        "body": base64.b64encode(response.body).decode(),
+    })
+
+def _decode(raw: bytes) -> CapturedResponse:
+    """Deserialize a response stored in Redis."""
+    entry = json.loads(raw)
+    return CapturedResponse(
+        status=entry["status"],
+        headers=[(name.encode("latin-1"), value.encode("latin-1")) for name, value in entry["headers"]],
+        body=base64.b64decode(entry["body"]),
+    )
+
+class CoalescingMiddleware:
+    """
+    ASGI middleware sharing one execution among identical concurrent GETs.
+    
+    Args:
+        app: Wrapped ASGI application
+        paths: Route templates to coalesce, e.g. ``"/api/projects/{project_id}"``
+        redis: Whether to also coalesce across processes through Redis
+        lock_ttl: Seconds a cross-process leader holds its lock at most
+        wait: Seconds a cross-process follower waits before running itself
+        poll_interval: Seconds between checks while waiting on another process
+    """
+    
+    def __init__(
+        self,
+        app: ASGIApp,
+        paths: Iterable[str],
+        redis: bool = False,
+        lock_ttl: float = 10.0,
+        wait: float = 5.0,
+        poll_interval: float = 0.01,
+    ):
+        """Initialize the middleware."""
+        self.app = app
+        self.routes: List[Tuple[Pattern, str]] = [(_compile(path), path) for path in paths]
+        self.redis = redis
+        self.lock_ttl = lock_ttl
+        self.wait = wait
+        self.poll_interval = poll_interval
+        self.in_flight: Dict[str, asyncio.Future] = {}
+    
+    def _route(self, path: str) -> Optional[str]:
+        """Template of the coalesced route matching a path, if any."""
+        for pattern, template in self.routes:
+            if pattern.match(path):
+                return template
+        return None
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Join or lead the flight of identical requests."""
+        route = None
+        if scope["type"] == "http" and scope["method"] == "GET":
+            route = self._route(scope["path"])
+        if route is None:
+            await self.app(scope, receive, send)
+            return
+        
+        headers = Headers(scope=scope)
+        key = hashlib.sha256(b"\n".join((
+            scope["path"].encode(),
+            scope.get("query_string", b""),
+            headers.get("authorization", "").encode(),
+        ))).hexdigest()
+        
+        flight = self.in_flight.get(key)
+        response = None
+        if flight is not None:
+            response = await asyncio.shield(flight)
+            if response is None:
+                # The leader failed or was cancelled: run the request alone
+                HTTP_COALESCED_REQUESTS.labels(route=route, role="leader").inc()
+                response = await call_asgi(self.app, scope)
+            else:
+                HTTP_COALESCED_REQUESTS.labels(route=route, role="follower").inc()
+        else:
+            flight = asyncio.get_running_loop().create_future()
+            self.in_flight[key] = flight
+            try:
+                response = await self._lead(scope, key, route)
+            finally:
+                del self.in_flight[key]
+                flight.set_result(response)
+        
+        await send({"type": "http.response.start", "status": response.status, "headers": response.headers})
+        await send({"type": "http.response.body", "body": response.body})
+    
+    async def _lead(self, scope: Scope, key: str, route: str) -> CapturedResponse:
+        """Run the request for this process, coordinating with others if enabled."""
+        if not self.redis:
+            HTTP_COALESCED_REQUESTS.labels(route=route, role="leader").inc()
+            return await call_asgi(self.app, scope)
+        
+        client = get_async_redis()
+        lock_key = f"coalesce:lock:{key}"
+        token = uuid.uuid4().hex
+        try:
+            acquired = await client.set(lock_key, token, nx=True, px=int(self.lock_ttl * 1000))
+            if not acquired:
+                response = await self._follow(lock_key)
+                if response is not None:
+                    HTTP_COALESCED_REQUESTS.labels(route=route, role="follower").inc()
+                    return response
+        except RedisError:
+            logger.warning("Coalescing lock unavailable", exc_info=True)
+            acquired = False
+        
+        HTTP_COALESCED_REQUESTS.labels(route=route, role="leader").inc()
+        if not acquired:
+            return await call_asgi(self.app, scope)
+        
+        try:
+            response = await call_asgi(self.app, scope)
+            if response.status == 200:
+                try:
+                    await client.set(
+                        f"coalesce:result:{token}", _encode(response), px=int(self.wait * 1000),
+                    )
+                except RedisError:
+                    logger.warning("Failed to share coalesced response", exc_info=True)
+            return response
+        finally:
+            try:
+                await client.eval(_RELEASE_SCRIPT, 1, lock_key, token)
+            except RedisError:
+                # The lock expires after lock_ttl at the latest
+                logger.warning("Failed to release coalescing lock", exc_info=True)
+    
+    async def _follow(self, lock_key: str) -> Optional[CapturedResponse]:
+        """
+        Wait for the response of the request holding the lock in another process.
+        
+        Args:
+            lock_key: Redis key of the lock
+            
+        Returns:
+            Optional[CapturedResponse]: Shared response, None if this process
+            should run the request itself
+        """
+        token = await get_async_redis().get(lock_key)
+        if token is None:
+            return None
+        result_key = f"coalesce:result:{token.decode()}"
+        
+        deadline = time.monotonic() + self.wait
+        while time.monotonic() < deadline:
+            pipeline = get_async_redis().pipeline(transaction=False)
+            pipeline.get(result_key)
+            pipeline.get(lock_key)
+            raw, holder = await pipeline.execute()
+            if raw is not None:
+                return _decode(raw)
+            if holder != token:
+                # The leader failed or did not share its response
+                return None
+            await asyncio.sleep(self.poll_interval)
+        return None
@@ -0,0 +1,217 @@
+"""
+Response content negotiation: compact wire formats and compression.
+
+JSON responses are re-encoded as MessagePack for clients that prefer it in
+``Accept`` and compressed with zstd, brotli or gzip according to
+``Accept-Encoding``. Small bodies are sent as is, since compressing them
+costs more CPU than it saves on the wire; large bodies are compressed in a
+worker thread so the event loop keeps serving other requests.
+
+A strong ``ETag`` identifies the exact bytes sent, so it is weakened when the
+body is re-encoded or compressed: each representation then carries a weak
+validator, which ``If-None-Match`` still matches.
+"""
+
+import gzip
+import json
+from typing import Callable, Dict, List, Optional, Tuple
+
+import anyio
+import brotli
+import msgpack
+import zstandard
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from ..config.settings import settings
+
+JSON = "application/json"
+MSGPACK = "application/msgpack"
+
+# Media types clients may use to ask for MessagePack
+MSGPACK_TYPES = (MSGPACK, "application/x-msgpack")
+
+def _compress_zstd(body: bytes) -> bytes:
+    """Compress with zstd."""
+    return zstandard.ZstdCompressor(level=settings.COMPRESSION_ZSTD_LEVEL).compress(body)
+
+def _compress_br(body: bytes) -> bytes:
+    """Compress with brotli."""
+    return brotli.compress(body, quality=settings.COMPRESSION_BROTLI_QUALITY)
+
+def _compress_gzip(body: bytes) -> bytes:
+    """Compress with gzip."""
+    return gzip.compress(body, compresslevel=settings.COMPRESSION_GZIP_LEVEL, mtime=0)
+
+# Supported content codings, in server preference order for equal quality
+ENCODERS: Dict[str, Callable[[bytes], bytes]] = {
+    "zstd": _compress_zstd,
+    "br": _compress_br,
+    "gzip": _compress_gzip,
+}
+
+def parse_quality_list(header: str) -> List[Tuple[str, float]]:
+    """
+    Parse an ``Accept`` or ``Accept-Encoding`` style header.
+    
+    Args:
+        header: Header value, e.g. ``"gzip;q=0.5, br"``
+        
+    Returns:
+        List[Tuple[str, float]]: Lower-case tokens with their quality
+    """
+    items = []
+    for part in header.split(","):
+        token, _, params = part.strip().partition(";")
+        if not token:
+            continue
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        items.append((token.strip().lower(), quality))
+    return items
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    """
+    Choose the content coding for a response.
+    
+    Args:
+        accept_encoding: ``Accept-Encoding`` request header
+        
+    Returns:
+        Optional[str]: Coding name, None to send the body uncompressed
+    """
+    accepted = dict(parse_quality_list(accept_encoding))
+    best, best_quality = None, 0.0
+    for coding in ENCODERS:
+        quality = accepted.get(coding, accepted.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = coding, quality
+    return best
+
+def prefers_msgpack(accept: str) -> bool:
+    """
+    Check whether a client prefers MessagePack over JSON.
+    
+    Args:
+        accept: ``Accept`` request header
+        
+    Returns:
+        bool: True if MessagePack is acceptable and ranked above JSON
+    """
+    accepted = dict(parse_quality_list(accept))
+    msgpack_quality = max(accepted.get(media_type, 0.0) for media_type in MSGPACK_TYPES)
+    return msgpack_quality > 0 and msgpack_quality >= accepted.get(JSON, 0.0)
+
+def json_to_msgpack(body: bytes) -> bytes:
+    """
+    Re-encode a JSON document as MessagePack.
+    
+    Args:
+        body: JSON document
+        
+    Returns:
+        bytes: Equivalent MessagePack document
+    """
+    return msgpack.packb(json.loads(body), use_bin_type=True)
+
+class ContentNegotiationMiddleware:
+    """
+    ASGI middleware converting and compressing JSON responses.
+    
+    Only complete JSON responses without a content coding are touched;
+    streams such as the server-sent event endpoint pass through unchanged.
+    
+    Args:
+        app: Wrapped ASGI application
+        min_size: Smallest body, in bytes, that gets compressed
+        thread_min_size: Smallest body compressed in a worker thread
+    """
+    
+    def __init__(self, app: ASGIApp, min_size: int = 1024, thread_min_size: int = 65536):
+        """Initialize the middleware."""
+        self.app = app
+        self.min_size = min_size
+        self.thread_min_size = thread_min_size
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Handle an ASGI connection."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        request_headers = Headers(scope=scope)
+        use_msgpack = prefers_msgpack(request_headers.get("accept", ""))
+        encoding = choose_encoding(request_headers.get("accept-encoding", ""))
+        if not use_msgpack and encoding is None:
+            await self.app(scope, receive, send)
+            return
+        
+        start: Optional[Message] = None
+        chunks: List[bytes] = []
+        passthrough = False
+        
+        async def send_wrapper(message: Message) -> None:
+            nonlocal start, passthrough
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message["headers"])
+                content_type = headers.get("content-type", "")
+                if content_type.startswith(JSON) and "content-encoding" not in headers:
+                    start = message
+                else:
+                    passthrough = True
+                    await send(message)
+                return
+            if passthrough or message["type"] != "http.response.body":
+                await send(message)
+                return
+            
+            chunks.append(message.get("body", b""))
+            if message.get("more_body", False):
+                return
+            await self._send_negotiated(send, start, b"".join(chunks), use_msgpack, encoding)
+        
+        await self.app(scope, receive, send_wrapper)
+    
+    async def _run(self, func: Callable[[bytes], bytes], body: bytes) -> bytes:
+        """Transform a body, in a worker thread if it is large."""
+        if len(body) >= self.thread_min_size:
+            return await anyio.to_thread.run_sync(func, body)
+        return func(body)
+    
+    async def _send_negotiated(
+        self,
+        send: Send,
+        start: Message,
+        body: bytes,
+        use_msgpack: bool,
+        encoding: Optional[str],
+    ) -> None:
+        """Send a buffered JSON response in the negotiated format and coding."""
+        headers = MutableHeaders(raw=list(start["headers"]))
+        headers.add_vary_header("Accept")
+        headers.add_vary_header("Accept-Encoding")
+        
+        reencoded = False
+        if use_msgpack and body:
+            body = await self._run(json_to_msgpack, body)
+            headers["content-type"] = MSGPACK
+            reencoded = True
+        
+        if encoding is not None and len(body) >= self.min_size:
+            body = await self._run(ENCODERS[encoding], body)
+            headers["content-encoding"] = encoding
+            reencoded = True
+        
+        etag = headers.get("etag")
+        if reencoded and etag and not etag.startswith("W/"):
+            headers["etag"] = f"W/{etag}"
+        
+        headers["content-length"] = str(len(body))
+        await send({**start, "headers": headers.raw})
+        await send({"type": "http.response.body", "body": body, "more_body": False})
@@ -0,0 +1,155 @@
+"""Sparse fieldsets: ``?fields=`` selection of response fields."""
+
+from functools import lru_cache
+from typing import Any, FrozenSet, Iterable, Optional, Tuple, Type
+
+from fastapi import HTTPException, Query, status
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, ConfigDict, create_model
+from sqlalchemy import inspect
+from sqlalchemy.orm import Query as SQLQuery, load_only
+
+@lru_cache(maxsize=256)
+def _trimmed_schema(schema: Type[BaseModel], names: FrozenSet[str]) -> Type[BaseModel]:
+    """Response schema keeping only the selected fields of ``schema``."""
+    return create_model(
+        f"{schema.__name__}Fields",
+        __config__=ConfigDict(from_attributes=True),
+        **{
+            name: (field.annotation, field)
+            for name, field in schema.model_fields.items()
+            if name in names
+        },
+    )
+
+class FieldSet:
+    """
+    Fields selected for a response.
+    
+    An empty selection stands for "all fields": queries are left untouched
+    and results are returned as is, to be serialized by the endpoint's
+    response model.
+    
+    Args:
+        schema: Full response schema
+        model: Database model the response is built from
+        names: Selected field names, empty for all fields
+    """
+    
+    def __init__(self, schema: Type[BaseModel], model: Any, names: Iterable[str] = ()):
+        """Initialize the field set."""
+        self.schema = schema
+        self.model = model
+        self.names: Tuple[str, ...] = tuple(names)
+    
+    @property
+    def selected(self) -> bool:
+        """Whether only some fields were requested."""
+        return bool(self.names)
+    
+    def wants(self, name: str) -> bool:
+        """
+        Check whether a field is part of the response.
+        
+        Args:
+            name: Field name
+            
+        Returns:
+            bool: True if the field was selected or all fields are returned
+        """
+        return not self.names or name in self.names
+    
+    def apply(self, query: SQLQuery, *columns: Any) -> SQLQuery:
+        """
+        Restrict a query to the columns backing the selected fields.
+        
+        Args:
+            query: Query loading ``model`` rows
+            columns: Additional columns the endpoint itself needs
+            
+        Returns:
+            Query: Query loading only the needed columns
+        """
+        if not self.names:
+            return query
+        column_names = inspect(self.model).column_attrs.keys()
+        attributes = [getattr(self.model, name) for name in self.names if name in column_names]
+        return query.options(load_only(*attributes, *columns))
+    
+    def render(self, result: Any, **extra: Any) -> Any:
+        """
+        Serialize an object or a list of objects to the selected fields.
+        
+        Args:
+            result: Database object or list of objects
+            extra: Values of computed fields, taking precedence over attributes
+            
+        Returns:
+            Any: ``result`` unchanged for all fields, otherwise a JSON response
+            with only the selected fields
+        """
+        if not self.names:
+            return result
+        
+        schema = _trimmed_schema(self.schema, frozenset(self.names))
+        
+        def dump(obj: Any) -> dict:
+            data = {name: extra[name] if name in extra else getattr(obj, name) for name in self.names}
+            return schema.model_validate(data, from_attributes=True).model_dump(mode="json")
+        
+        if isinstance(result, list):
+            return JSONResponse([dump(obj) for obj in result])
+        return JSONResponse(dump(result))
+
+class SparseFields:
+    """
+    Dependency parsing the ``fields`` query parameter.
+    
+    The comma-separated names are validated against the endpoint's response
+    schema; the ``always`` fields are included in every selection.
+    
+    Args:
+        schema: Full response schema
+        model: Database model the response is built from
+        always: Fields returned whatever the selection
+    """
+    
+    def __init__(self, schema: Type[BaseModel], model: Any, always: Iterable[str] = ("id",)):
+        """Initialize the dependency."""
+        self.schema = schema
+        self.model = model
+        self.always = tuple(always)
+    
+    def __call__(
+        self,
+        fields: Optional[str] = Query(
+            None,
+            description="Comma-separated fields to return; all fields if omitted",
+        ),
+    ) -> FieldSet:
+        """
+        Parse the selected fields.
+        
+        Args:
+            fields: Comma-separated field names
+            
+        Returns:
+            FieldSet: Selected fields
+            
+        Raises:
+            HTTPException: If a field is not part of the response schema
+        """
+        if not fields:
+            return FieldSet(self.schema, self.model)
+        
+        requested = [name.strip() for name in fields.split(",") if name.strip()]
+        unknown = sorted(set(requested) - set(self.schema.model_fields))
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown fields: {', '.join(unknown)}",
+            )
+        
+        names = list(self.always)
+        names += [name for name in requested if name not in names]
+        return FieldSet(self.schema, self.model, names)
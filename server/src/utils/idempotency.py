@@ -0,0 +1,276 @@
+"""
+Idempotency keys for POST requests.
+
+A client sending ``Idempotency-Key`` with a POST request may retry it safely:
+the first request runs and its response is stored in Redis for
+``IDEMPOTENCY_TTL`` seconds, and every retry with the same key gets that
+response back without reaching the endpoint, so without touching Postgres.
+A retry arriving while the first request is still running waits for its
+result instead of running again. The running request holds its key with a
+lock that it extends until it finishes, so a slow request is never run
+twice; the lock of a crashed process expires after ``IDEMPOTENCY_LOCK_TTL``.
+
+Keys are scoped to the method, path and credentials of the request, so two
+clients never share responses. Reusing a key with a different body is a
+client error and is rejected with 422.
+"""
+
+import asyncio
+import base64
+import hashlib
+import json
+import logging
+import time
+import uuid
+from typing import Any, Dict, Iterable, Optional
+
+from redis.exceptions import RedisError
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from .asgi import CapturedResponse, call_asgi
+from .metrics import IDEMPOTENT_REQUESTS
+from .redis_client import get_async_redis
+
+logger = logging.getLogger(__name__)
+
+HEADER = "idempotency-key"
+REPLAY_HEADER = b"idempotent-replayed"
+
+# Longest accepted key; clients are expected to send UUIDs
+MAX_KEY_LENGTH = 255
+
+PENDING = "pending"
+
+# Extends the lock only if it still holds the running request's entry
+_EXTEND_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('EXPIRE', KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+def _pending_entry(fingerprint: str) -> str:
+    """Entry locking a key while its request runs, unique to that request."""
+    return json.dumps({"state": PENDING, "fingerprint": fingerprint, "token": uuid.uuid4().hex})
+
+def _is_stored(status: int) -> bool:
+    """Whether a response is final for its key; others let a retry run again."""
+    return status < 500 and status not in (409, 429)
+
+async def _read_body(receive: Receive) -> bytes:
+    """Read a complete request body."""
+    chunks = []
+    while True:
+        message = await receive()
+        if message["type"] != "http.request":
+            break
+        chunks.append(message.get("body", b""))
+        if not message.get("more_body", False):
+            break
+    return b"".join(chunks)
+
+async def _send_json(send: Send, status: int, detail: str, headers: Optional[Dict[str, str]] = None) -> None:
+    """Send an error response."""
+    body = json.dumps({"detail": detail}).encode()
+    raw_headers = [
+        (b"content-type", b"application/json"),
+        (b"content-length", str(len(body)).encode()),
+    ]
+    raw_headers += [(name.encode(), value.encode()) for name, value in (headers or {}).items()]
+    await send({"type": "http.response.start", "status": status, "headers": raw_headers})
+    await send({"type": "http.response.body", "body": body})
+
+class IdempotencyMiddleware:
+    """
+    ASGI middleware deduplicating POST requests that carry an idempotency key.
+    
+    Requests without the header, and all requests while Redis is unavailable,
+    pass through unchanged. Responses with a 5xx, 409 or 429 status are not
+    stored, so the client can retry them.
+    
+    Args:
+        app: Wrapped ASGI application
+        ttl: Seconds a stored response is replayed for
+        lock_ttl: Seconds a running request holds its key unless extended; it
+            is extended every third of it while the request runs, and bounds
+            how long a crashed process blocks retries
+        wait: Seconds a duplicate waits for the first request to finish
+        poll_interval: Seconds between checks while waiting
+        exempt_paths: Paths never deduplicated, e.g. ones returning credentials
+    """
+    
+    def __init__(
+        self,
+        app: ASGIApp,
+        ttl: int = 86400,
+        lock_ttl: int = 60,
+        wait: float = 10.0,
+        poll_interval: float = 0.05,
+        exempt_paths: Iterable[str] = (),
+    ):
+        """Initialize the middleware."""
+        self.app = app
+        self.ttl = ttl
+        self.lock_ttl = lock_ttl
+        self.wait = wait
+        self.poll_interval = poll_interval
+        self.exempt_paths = frozenset(exempt_paths)
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Run, replay or hold back the request."""
+        if scope["type"] != "http" or scope["method"] != "POST" or scope["path"] in self.exempt_paths:
+            await self.app(scope, receive, send)
+            return
+        
+        headers = Headers(scope=scope)
+        key = headers.get(HEADER)
+        if key is None:
+            await self.app(scope, receive, send)
+            return
+        if not key or len(key) > MAX_KEY_LENGTH:
+            await _send_json(send, 400, f"Idempotency-Key must be 1 to {MAX_KEY_LENGTH} characters")
+            return
+        
+        body = await _read_body(receive)
+        fingerprint = hashlib.sha256(body).hexdigest()
+        scope_digest = hashlib.sha256(
+            "\n".join((scope["method"], scope["path"], headers.get("authorization", ""), key)).encode()
+        ).hexdigest()
+        redis_key = f"idempotency:{scope_digest}"
+        
+        pending = _pending_entry(fingerprint)
+        try:
+            acquired = await get_async_redis().set(redis_key, pending, nx=True, ex=self.lock_ttl)
+        except RedisError:
+            logger.warning("Idempotency store unavailable", exc_info=True)
+            await self._forward(scope, body, send)
+            return
+        
+        if acquired:
+            IDEMPOTENT_REQUESTS.labels(outcome="executed").inc()
+            await self._execute(scope, body, send, redis_key, fingerprint, pending)
+            return
+        
+        await self._replay(scope, body, send, redis_key, fingerprint)
+    
+    async def _forward(self, scope: Scope, body: bytes, send: Send) -> None:
+        """Run the request without idempotency."""
+        await self._send_captured(send, await call_asgi(self.app, scope, body))
+    
+    async def _execute(
+        self,
+        scope: Scope,
+        body: bytes,
+        send: Send,
+        redis_key: str,
+        fingerprint: str,
+        pending: str,
+    ) -> None:
+        """Run the first request for a key and store its response."""
+        keeper = asyncio.create_task(self._keep_locked(redis_key, pending))
+        try:
+            response = await call_asgi(self.app, scope, body)
+        except BaseException:
+            await self._release(redis_key)
+            raise
+        finally:
+            keeper.cancel()
+        
+        try:
+            if _is_stored(response.status):
+                entry = {
+                    "state": "done",
+                    "fingerprint": fingerprint,
+                    "status": response.status,
+                    "headers": [
+                        [name.decode("latin-1"), value.decode("latin-1")]
+                        for name, value in response.headers
+                    ],
+                    "body": base64.b64encode(response.body).decode(),
+                }
+                await get_async_redis().set(redis_key, json.dumps(entry), ex=self.ttl)
+            else:
+                await get_async_redis().delete(redis_key)
+        except RedisError:
+            logger.warning("Failed to store idempotent response", exc_info=True)
+        
+        await self._send_captured(send, response)
+    
+    async def _keep_locked(self, redis_key: str, pending: str) -> None:
+        """Extend the lock of a running request until cancelled."""
+        while True:
+            await asyncio.sleep(self.lock_ttl / 3)
+            try:
+                await get_async_redis().eval(_EXTEND_SCRIPT, 1, redis_key, pending, self.lock_ttl)
+            except RedisError:
+                logger.warning("Failed to extend idempotency lock", exc_info=True)
+    
+    async def _release(self, redis_key: str) -> None:
+        """Free a key whose request failed, so a retry can run."""
+        try:
+            await get_async_redis().delete(redis_key)
+        except RedisError:
+            # The lock expires after lock_ttl at the latest
+            logger.warning("Failed to release idempotency key", exc_info=True)
+    
+    async def _replay(self, scope: Scope, body: bytes, send: Send, redis_key: str, fingerprint: str) -> None:
+        """Answer a duplicate with the first request's response once it is stored."""
+        deadline = time.monotonic() + self.wait
+        while True:
+            try:
+                raw = await get_async_redis().get(redis_key)
+            except RedisError:
+                logger.warning("Idempotency store unavailable", exc_info=True)
+                await self._forward(scope, body, send)
+                return
+            
+            entry: Optional[Dict[str, Any]] = None
+            if raw is None:
+                # The first request failed or its lock expired: run this one,
+                # unless another retry took the key first
+                pending = _pending_entry(fingerprint)
+                try:
+                    acquired = await get_async_redis().set(redis_key, pending, nx=True, ex=self.lock_ttl)
+                except RedisError:
+                    acquired = False
+                if acquired:
+                    IDEMPOTENT_REQUESTS.labels(outcome="executed").inc()
+                    await self._execute(scope, body, send, redis_key, fingerprint, pending)
+                    return
+            else:
+                entry = json.loads(raw)
+            
+            if entry is not None and entry["fingerprint"] != fingerprint:
+                IDEMPOTENT_REQUESTS.labels(outcome="mismatch").inc()
+                await _send_json(send, 422, "Idempotency-Key was already used with a different request body")
+                return
+            
+            if entry is not None and entry["state"] != PENDING:
+                IDEMPOTENT_REQUESTS.labels(outcome="replayed").inc()
+                await self._send_captured(send, CapturedResponse(
+                    status=entry["status"],
+                    headers=[
+                        (name.encode("latin-1"), value.encode("latin-1"))
+                        for name, value in entry["headers"]
+                    ] + [(REPLAY_HEADER, b"true")],
+                    body=base64.b64decode(entry["body"]),
+                ))
+                return
+            
+            if time.monotonic() >= deadline:
+                IDEMPOTENT_REQUESTS.labels(outcome="in_progress").inc()
+                await _send_json(
+                    send,
+                    409,
+                    "A request with this Idempotency-Key is still in progress",
+                    {"retry-after": "1"},
+                )
+                return
+            await asyncio.sleep(self.poll_interval)
+    
+    @staticmethod
+    async def _send_captured(send: Send, response: CapturedResponse) -> None:
+        """Send a collected response."""
+        await send({"type": "http.response.start", "status": response.status, "headers": response.headers})
+        await send({"type": "http.response.body", "body": response.body})
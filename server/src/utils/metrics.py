@@ -0,0 +1,246 @@
+"""
+Prometheus metrics.
+
+Metrics work across several worker processes through prometheus_client's
+multiprocess mode: when ``PROMETHEUS_MULTIPROC_DIR`` is set, every process
+writes its samples to that directory and a scrape of any process aggregates
+all of them.
+"""
+
+import os
+import time
+from typing import Iterable
+
+# The multiprocess directory must exist before prometheus_client is imported
+if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+    os.makedirs(os.environ["PROMETHEUS_MULTIPROC_DIR"], exist_ok=True)
+
+from prometheus_client import (
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+)
+from prometheus_client.core import GaugeMetricFamily
+from redis.exceptions import RedisError
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# HTTP metrics
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template",
+    ["method", "route", "status"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+HTTP_REQUESTS_IN_FLIGHT = Gauge(
+    "http_requests_in_flight",
+    "HTTP requests currently being served",
+    ["method"],
+    multiprocess_mode="livesum",
+)
+HTTP_COALESCED_REQUESTS = Counter(
+    "http_coalesced_requests_total",
+    "Coalesced GET requests by role: leaders ran the endpoint, followers shared a leader's response",
+    ["route", "role"],
+)
+
+# Database pool metrics
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out_connections",
+    "Database connections currently checked out of the pool",
+    multiprocess_mode="livesum",
+)
+DB_POOL_OVERFLOW = Gauge(
+    "db_pool_overflow_connections",
+    "Database connections open beyond the pool size",
+    multiprocess_mode="livesum",
+)
+DB_POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting for a database connection",
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0, 30.0),
+)
+
+# Celery metrics
+CELERY_TASK_RUNTIME = Histogram(
+    "celery_task_runtime_seconds",
+    "Celery task execution time",
+    ["task", "state"],
+    buckets=(0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 300.0, 900.0),
+)
+
+# Outbox relay metrics
+OUTBOX_EVENTS_RELAYED = Counter(
+    "outbox_events_relayed_total",
+    "Outbox events processed by the relay",
+    ["result"],
+)
+OUTBOX_BACKLOG_LAG = Gauge(
+    "outbox_backlog_lag_seconds",
+    "Age of the oldest outbox event waiting to be relayed",
+    multiprocess_mode="livemax",
+)
+OUTBOX_RELAY_LAG = Histogram(
+    "outbox_relay_max_lag_seconds",
+    "Largest creation-to-publication delay per relay run",
+    buckets=(0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0),
+)
+
+# Idempotency key metrics
+IDEMPOTENT_REQUESTS = Counter(
+    "http_idempotent_requests_total",
+    "POST requests carrying an Idempotency-Key, by outcome",
+    ["outcome"],
+)
+
+def metrics_registry() -> CollectorRegistry:
+    """
+    Get the registry to expose on scrape.
+    
+    Returns:
+        CollectorRegistry: Multiprocess registry when running with several
+        processes, the default registry otherwise
+    """
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return registry
+    return REGISTRY
+
+def render_metrics(*extra_collectors) -> bytes:
+    """
+    Render all metrics in the Prometheus text format.
+    
+    Args:
+        extra_collectors: Collectors evaluated at scrape time only in the
+            scraping process (e.g. queue depth read from Redis)
+            
+    Returns:
+        bytes: Exposition text
+    """
+    registry = metrics_registry()
+    if registry is REGISTRY:
+        scrape_registry = CollectorRegistry()
+        scrape_registry.register(_RegistryCollector(registry))
+        registry = scrape_registry
+    for collector in extra_collectors:
+        registry.register(collector)
+    return generate_latest(registry)
+
+class _RegistryCollector:
+    """Adapter exposing one registry's metrics from another registry."""
+    
+    def __init__(self, registry: CollectorRegistry):
+        """Initialize the adapter."""
+        self.registry = registry
+    
+    def collect(self):
+        """Yield the wrapped registry's metrics."""
+        return self.registry.collect()
+
+class CeleryQueueCollector:
+    """Reports the number of messages waiting in each Celery queue."""
+    
+    # Separator used by kombu's Redis transport for priority sub-queues
+    PRIORITY_SEP = "\x06\x16"
+    
+    def __init__(self, redis_client, queues: Iterable[str], priority_steps: Iterable[int]):
+        """
+        Initialize the collector.
+        
+        Args:
+            redis_client: Redis client connected to the broker
+            queues: Queue names
+            priority_steps: Priority steps configured on the transport
+        """
+        self.redis = redis_client
+        self.queues = list(queues)
+        self.priority_steps = list(priority_steps)
+    
+    def _keys(self, queue: str):
+        """Redis list keys backing a queue, one per priority step."""
+        for step in self.priority_steps:
+            yield queue if step == 0 else f"{queue}{self.PRIORITY_SEP}{step}"
+    
+    def collect(self):
+        """Yield queue depth gauges."""
+        gauge = GaugeMetricFamily(
+            "celery_queue_length",
+            "Messages waiting in a Celery queue",
+            labels=["queue"],
+        )
+        pipeline = self.redis.pipeline(transaction=False)
+        for queue in self.queues:
+            for key in self._keys(queue):
+                pipeline.llen(key)
+        try:
+            lengths = iter(pipeline.execute())
+        except RedisError:
+            # Report nothing rather than failing the whole scrape
+            return
+        for queue in self.queues:
+            gauge.add_metric([queue], sum(next(lengths) for _ in self.priority_steps))
+        yield gauge
+
+def instrument_pool(engine) -> None:
+    """
+    Record pool checkout, overflow and wait metrics for an engine.
+    
+    Args:
+        engine: SQLAlchemy engine using ``TimedQueuePool``
+    """
+    from sqlalchemy import event
+    
+    @event.listens_for(engine, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        DB_POOL_CHECKED_OUT.inc()
+        DB_POOL_OVERFLOW.set(max(0, engine.pool.overflow()))
+    
+    @event.listens_for(engine, "checkin")
+    def _on_checkin(dbapi_connection, connection_record):
+        DB_POOL_CHECKED_OUT.dec()
+        DB_POOL_OVERFLOW.set(max(0, engine.pool.overflow()))
+    
+    engine.pool.checkout_wait.listeners.append(DB_POOL_CHECKOUT_WAIT.observe)
+
+class MetricsMiddleware:
+    """ASGI middleware recording request latency and in-flight requests."""
+    
+    def __init__(self, app: ASGIApp):
+        """Initialize the middleware."""
+        self.app = app
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Time the request and label it with its route template."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        method = scope["method"]
+        status_code = 500
+        
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+        
+        in_flight = HTTP_REQUESTS_IN_FLIGHT.labels(method)
+        in_flight.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            in_flight.dec()
+            # The router stores the matched route in the scope; using its
+            # template keeps label cardinality bounded
+            route = scope.get("route")
+            template = getattr(route, "path", None) or "unmatched"
+            HTTP_REQUEST_DURATION.labels(method, template, str(status_code)).observe(
+                time.perf_counter() - start
+            )
+
@@ -0,0 +1,163 @@
+"""
+Low-overhead sampling profiler.
+
+A background thread periodically snapshots the stacks of every other thread
+in the process with ``sys._current_frames()`` and counts identical stacks.
+The result is written in the collapsed-stack format understood by
+flamegraph.pl, speedscope and most flamegraph viewers::
+
+    MainThread;run (uvicorn/main.py:570);get_user (src/api/routes/users.py:88) 42
+
+Only one profiling session may run per node at a time: a process-local lock
+prevents overlapping sessions in one process, and a Redis lock keyed by host
+name prevents several worker processes on the same node from profiling at
+once.
+"""
+
+import os
+import socket
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from typing import Iterator
+
+from redis.exceptions import RedisError
+
+from ..config.settings import settings
+from .redis_client import get_redis
+
+class ProfilerBusy(Exception):
+    """Raised when another profiling session is already running."""
+
+_process_lock = threading.Lock()
+
+def _node_key() -> str:
+    """Redis key of this node's profiling slot."""
+    return f"profile:lock:{socket.gethostname()}"
+
+def acquire_session(seconds: float) -> bool:
+    """
+    Reserve the node's single profiling slot.
+    
+    Args:
+        seconds: Planned duration, used to expire the node lock
+        
+    Returns:
+        bool: Whether the node lock in Redis is held (False if Redis is down
+        and only the process-local guard applies)
+        
+    Raises:
+        ProfilerBusy: If a session is already running in this process or node
+    """
+    if not _process_lock.acquire(blocking=False):
+        raise ProfilerBusy("A profiling session is already running in this process")
+    try:
+        locked = get_redis().set(_node_key(), os.getpid(), nx=True, ex=int(seconds) + 5)
+    except RedisError:
+        return False
+    if not locked:
+        _process_lock.release()
+        raise ProfilerBusy("A profiling session is already running on this node")
+    return True
+
+def release_session(node_locked: bool) -> None:
+    """
+    Release the profiling slot taken by :func:`acquire_session`.
+    
+    Args:
+        node_locked: Value returned by :func:`acquire_session`
+    """
+    if node_locked:
+        try:
+            get_redis().delete(_node_key())
+        except RedisError:
+            pass
+    _process_lock.release()
+
+@contextmanager
+def profiling_session(seconds: float) -> Iterator[None]:
+    """
+    Hold the node's profiling slot for the duration of the block.
+    
+    Args:
+        seconds: Planned duration, used to expire the node lock
+        
+    Raises:
+        ProfilerBusy: If a session is already running in this process or node
+    """
+    node_locked = acquire_session(seconds)
+    try:
+        yield
+    finally:
+        release_session(node_locked)
+
+def _frame_label(frame) -> str:
+    """Label of one stack frame: function, file and definition line."""
+    code = frame.f_code
+    filename = code.co_filename
+    for prefix in sys.path:
+        if prefix and filename.startswith(prefix):
+            filename = filename[len(prefix):].lstrip(os.sep)
+            break
+    return f"{code.co_name} ({filename}:{code.co_firstlineno})"
+
+def sample_stacks(seconds: float, interval: float) -> Counter:
+    """
+    Sample the stacks of all other threads of the process.
+    
+    Args:
+        seconds: Sampling duration
+        interval: Seconds between samples
+        
+    Returns:
+        Counter: Number of samples per collapsed stack
+    """
+    own = threading.get_ident()
+    counts: Counter = Counter()
+    deadline = time.monotonic() + seconds
+    
+    while time.monotonic() < deadline:
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for ident, frame in sys._current_frames().items():
+            if ident == own:
+                continue
+            stack = []
+            while frame is not None:
+                stack.append(_frame_label(frame))
+                frame = frame.f_back
+            stack.append(names.get(ident, f"thread-{ident}"))
+            counts[";".join(reversed(stack))] += 1
+        time.sleep(interval)
+    
+    return counts
+
+def collapse(counts: Counter) -> str:
+    """
+    Render sample counts in the collapsed-stack format.
+    
+    Args:
+        counts: Number of samples per collapsed stack
+        
+    Returns:
+        str: One ``stack count`` line per distinct stack
+    """
+    return "".join(f"{stack} {count}\n" for stack, count in counts.most_common())
+
+def profile(seconds: float) -> str:
+    """
+    Profile the current process for a number of seconds.
+    
+    Args:
+        seconds: Sampling duration, capped at ``PROFILER_MAX_SECONDS``
+        
+    Returns:
+        str: Collapsed stacks
+        
+    Raises:
+        ProfilerBusy: If another session is running on this node
+    """
+    seconds = min(seconds, settings.PROFILER_MAX_SECONDS)
+    with profiling_session(seconds):
+        return collapse(sample_stacks(seconds, settings.PROFILER_INTERVAL))
@@ -0,0 +1,190 @@
+"""Redis-backed token bucket rate limiting."""
+
+import logging
+import math
+from typing import Iterable, Optional
+
+from fastapi import HTTPException, Request, status
+from jose import JWTError, jwt
+from redis.exceptions import RedisError
+
+from ..config.settings import settings
+from .redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+# Token bucket evaluated atomically in Redis. The bucket is a hash with the
+# current token count and the time of the last refill; Redis' own clock is
+# used so that all API workers agree on time.
+#
+# KEYS[1] bucket key
+# ARGV[1] refill rate in tokens per second
+# ARGV[2] bucket capacity (burst)
+# ARGV[3] tokens requested
+#
+# Returns {allowed (0/1), tokens remaining, milliseconds until allowed}
+TOKEN_BUCKET_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local requested = tonumber(ARGV[3])
+
+local time = redis.call('TIME')
+local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(bucket[1])
+local ts = tonumber(bucket[2])
+if tokens == nil then
+    tokens = capacity
+    ts = now
+end
+
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+
+local allowed = 0
+local wait_ms = 0
+if tokens >= requested then
+    tokens = tokens - requested
+    allowed = 1
+else
+    wait_ms = math.ceil((requested - tokens) / rate * 1000)
+end
+
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate * 1000) + 1000)
+
+return {allowed, math.floor(tokens), wait_ms}
+"""
+
+def _user_id_from_request(request: Request) -> Optional[str]:
+    """
+    Extract the user ID from the bearer token, if present and valid.
+    
+    Args:
+        request: Incoming request
+        
+    Returns:
+        Optional[str]: User ID, or None for anonymous requests
+    """
+    authorization = request.headers.get("authorization", "")
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    try:
+        payload = jwt.decode(
+            token,
+            settings.JWT_SECRET_KEY,
+            algorithms=[settings.JWT_ALGORITHM],
+        )
+    except JWTError:
+        return None
+    return payload.get("sub")
+
+class RateLimiter:
+    """
+    FastAPI dependency enforcing a token bucket per client.
+    
+    Instances are attached to routers (or single routes) through
+    ``dependencies=[Depends(limiter)]``, so every router can carry its own
+    limits.
+    
+    Args:
+        name: Name of the limit, used in the Redis key
+        per_minute: Sustained number of requests allowed per minute
+        burst: Number of requests allowed in a burst
+        scope: "ip" to limit per client address, "user" to limit per
+            authenticated user (falling back to the address when anonymous)
+        methods: HTTP methods the limit applies to; all methods if None
+    """
+    
+    def __init__(
+        self,
+        name: str,
+        per_minute: float,
+        burst: int,
+        scope: str = "ip",
+        methods: Optional[Iterable[str]] = None,
+    ):
+        """Initialize the rate limiter."""
+        if scope not in ("ip", "user"):
+            raise ValueError(f"Unsupported rate limit scope: {scope}")
+        self.name = name
+        self.rate = per_minute / 60.0
+        self.burst = burst
+        self.scope = scope
+        self.methods = {method.upper() for method in methods} if methods else None
+    
+    def _client_key(self, request: Request) -> str:
+        """
+        Build the bucket key for the client making the request.
+        
+        Args:
+            request: Incoming request
+            
+        Returns:
+            str: Redis key of the client's bucket
+        """
+        if self.scope == "user":
+            user_id = _user_id_from_request(request)
+            if user_id is not None:
+                return f"ratelimit:{self.name}:user:{user_id}"
+        host = request.client.host if request.client else "unknown"
+        return f"ratelimit:{self.name}:ip:{host}"
+    
+    def __call__(self, request: Request) -> None:
+        """
+        Consume one token for the request.
+        
+        Args:
+            request: Incoming request
+            
+        Raises:
+            HTTPException: If the client has exhausted its bucket
+        """
+        if not settings.RATE_LIMIT_ENABLED:
+            return
+        if self.methods is not None and request.method not in self.methods:
+            return
+        
+        try:
+            allowed, _, wait_ms = get_redis().eval(
+                TOKEN_BUCKET_SCRIPT,
+                1,
+                self._client_key(request),
+                self.rate,
+                self.burst,
+                1,
+            )
+        except RedisError:
+            # Fail open: an unavailable Redis must not take the API down
+            logger.warning("Rate limiter %s unavailable, allowing request", self.name)
+            return
+        
+        if not allowed:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Rate limit exceeded",
+                headers={"Retry-After": str(max(1, math.ceil(wait_ms / 1000)))},
+            )
+
+# Limits shared by the routers
+auth_rate_limit = RateLimiter(
+    "auth",
+    per_minute=settings.AUTH_RATE_LIMIT_PER_MINUTE,
+    burst=settings.AUTH_RATE_LIMIT_BURST,
+    scope="ip",
+)
+write_rate_limit_user = RateLimiter(
+    "write-user",
+    per_minute=settings.WRITE_RATE_LIMIT_PER_MINUTE,
+    burst=settings.WRITE_RATE_LIMIT_BURST,
+    scope="user",
+    methods=("POST", "PUT", "PATCH", "DELETE"),
+)
+write_rate_limit_ip = RateLimiter(
+    "write-ip",
+    per_minute=settings.WRITE_RATE_LIMIT_IP_PER_MINUTE,
+    burst=settings.WRITE_RATE_LIMIT_IP_BURST,
+    scope="ip",
+    methods=("POST", "PUT", "PATCH", "DELETE"),
+)
@@ -0,0 +1,43 @@
+"""Shared Redis clients."""
+
+from typing import Optional
+
+import redis
+import redis.asyncio as aioredis
+
+from ..config.settings import settings
+
+# Clients are created lazily so that no connection is opened at import time
+# (and none is inherited by forked worker processes).
+_client: Optional[redis.Redis] = None
+_async_client: Optional[aioredis.Redis] = None
+
+def get_redis() -> redis.Redis:
+    """
+    Get the process-wide synchronous Redis client.
+    
+    Returns:
+        Redis: Redis client
+    """
+    global _client
+    if _client is None:
+        _client = redis.Redis.from_url(settings.REDIS_URL)
+    return _client
+
+def get_async_redis() -> aioredis.Redis:
+    """
+    Get the process-wide asyncio Redis client.
+    
+    Returns:
+        Redis: asyncio Redis client
+    """
+    global _async_client
+    if _async_client is None:
+        _async_client = aioredis.Redis.from_url(settings.REDIS_URL)
+    return _async_client
+
+def reset_redis_clients() -> None:
+    """Drop cached clients, e.g. after fork, so new connections are made."""
+    global _client, _async_client
+    _client = None
+    _async_client = None
@@ -0,0 +1,112 @@
+"""
+Revoked session list, checked in memory.
+
+Every login starts a session whose id (``sid``) is carried by its access
+tokens. Revoking a session adds its id to a Redis sorted set, scored by the
+time the entry may be forgotten, and announces it on a pub/sub channel.
+
+Each API process mirrors the set into a Bloom filter, loaded when its
+listener connects, updated from the channel and rebuilt periodically to drop
+expired entries. Authenticating a request is then a hash lookup in memory:
+only the rare ids the filter reports as possibly revoked (actually revoked
+ones and false positives) are confirmed against Redis, and the database is
+never queried.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Optional
+
+from redis.exceptions import RedisError
+
+from ..config.settings import settings
+from .bloom import BloomFilter
+from .redis_client import get_async_redis
+
+logger = logging.getLogger(__name__)
+
+# Redis keys
+REVOKED_KEY = "auth:revoked"
+REVOCATION_CHANNEL = "auth:revocations"
+
+def _decode(value) -> str:
+    """Decode a Redis value."""
+    return value.decode() if isinstance(value, bytes) else value
+
+class RevocationList:
+    """Per-process Bloom filter mirror of the revoked sessions."""
+    
+    def __init__(self):
+        """Initialize the list; the filter is loaded on first use."""
+        self._bloom: Optional[BloomFilter] = None
+        self._listener: Optional[asyncio.Task] = None
+    
+    def _ensure_listener(self) -> None:
+        """Start the pub/sub listener on first use."""
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.get_running_loop().create_task(self._listen())
+    
+    async def _load(self) -> None:
+        """Rebuild the filter from the unexpired entries in Redis."""
+        members = await get_async_redis().zrangebyscore(REVOKED_KEY, time.time(), "+inf")
+        self._bloom = BloomFilter.from_items(
+            (_decode(member) for member in members),
+            capacity=max(settings.REVOCATION_BLOOM_CAPACITY, 2 * len(members)),
+            error_rate=settings.REVOCATION_BLOOM_ERROR_RATE,
+        )
+    
+    async def _listen(self) -> None:
+        """Keep the filter in sync with Redis."""
+        while True:
+            pubsub = get_async_redis().pubsub()
+            try:
+                # Subscribe before loading so no revocation falls in between
+                await pubsub.subscribe(REVOCATION_CHANNEL)
+                await self._load()
+                rebuild_at = time.monotonic() + settings.REVOCATION_REBUILD_INTERVAL
+                while True:
+                    message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                    if message is not None and message["type"] == "message":
+                        self._bloom.add(_decode(message["data"]))
+                    if time.monotonic() >= rebuild_at:
+                        await self._load()
+                        rebuild_at = time.monotonic() + settings.REVOCATION_REBUILD_INTERVAL
+            except asyncio.CancelledError:
+                raise
+            except (RedisError, OSError):
+                # Revocations may be missed while disconnected: check Redis
+                # directly until the filter is reloaded
+                self._bloom = None
+                logger.warning("Revocation listener disconnected, reconnecting")
+                await asyncio.sleep(1)
+            finally:
+                await pubsub.close()
+    
+    async def is_revoked(self, session_id: str) -> bool:
+        """
+        Check whether a session was revoked.
+        
+        Args:
+            session_id: Session id from the access token
+            
+        Returns:
+            bool: True if the session was revoked
+        """
+        self._ensure_listener()
+        bloom = self._bloom
+        if bloom is not None and session_id not in bloom:
+            return False
+        
+        try:
+            expires_at = await get_async_redis().zscore(REVOKED_KEY, session_id)
+        except RedisError:
+            if bloom is None:
+                # Neither the filter nor Redis can tell; access tokens are
+                # short-lived, so let the request through
+                logger.warning("Revocation list unavailable", exc_info=True)
+                return False
+            return True
+        return expires_at is not None and expires_at > time.time()
+
+revocations = RevocationList()
@@ -0,0 +1,137 @@
+"""
+Distributed tracing with OpenTelemetry.
+
+Instrumentation (FastAPI requests, SQL statements, outbound HTTP calls and
+Celery tasks) is attached at import time and is a no-op until
+:func:`configure_tracing` installs a tracer provider. The provider owns a
+background export thread, so it must be configured in every process after
+fork: on application startup for API workers and on ``worker_process_init``
+for Celery pool processes.
+
+Trace context travels from the API to Celery in task message headers, so a
+request and the tasks it enqueues share one trace.
+"""
+
+import logging
+import threading
+from typing import Optional, Sequence
+
+from opentelemetry import trace
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import (
+    BatchSpanProcessor,
+    ConsoleSpanExporter,
+    SpanExporter,
+    SpanExportResult,
+)
+from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+
+from ..config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+class FileSpanExporter(SpanExporter):
+    """Writes finished spans to a local file, one JSON document per line."""
+    
+    def __init__(self, path: str):
+        """
+        Initialize the exporter.
+        
+        Args:
+            path: File to append spans to
+        """
+        self.path = path
+        self._lock = threading.Lock()
+    
+    def export(self, spans: Sequence) -> SpanExportResult:
+        """Append spans to the file."""
+        lines = "".join(span.to_json(indent=None) + "\n" for span in spans)
+        with self._lock, open(self.path, "a", encoding="utf-8") as f:
+            f.write(lines)
+        return SpanExportResult.SUCCESS
+    
+    def shutdown(self) -> None:
+        """Nothing to release; the file is opened per export."""
+
+def _create_exporter(name: str) -> Optional[SpanExporter]:
+    """
+    Create the span exporter selected in settings.
+    
+    Args:
+        name: "console", "file" or "otlp"
+        
+    Returns:
+        Optional[SpanExporter]: Exporter
+    """
+    if name == "console":
+        return ConsoleSpanExporter()
+    if name == "file":
+        return FileSpanExporter(settings.TRACING_FILE_PATH)
+    if name == "otlp":
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+        return OTLPSpanExporter(endpoint=settings.TRACING_OTLP_ENDPOINT or None)
+    raise ValueError(f"Unknown tracing exporter: {name}")
+
+def configure_tracing(service_name: str) -> None:
+    """
+    Install the tracer provider for the current process.
+    
+    Sampling is decided at the root span with ``TRACING_SAMPLE_RATIO`` and
+    inherited by child spans, including spans in Celery workers, so traces
+    are either complete or absent.
+    
+    Args:
+        service_name: Service name attached to every span
+    """
+    if not settings.TRACING_ENABLED:
+        return
+    
+    provider = TracerProvider(
+        resource=Resource.create({"service.name": service_name}),
+        sampler=ParentBased(TraceIdRatioBased(settings.TRACING_SAMPLE_RATIO)),
+    )
+    provider.add_span_processor(BatchSpanProcessor(_create_exporter(settings.TRACING_EXPORTER)))
+    trace.set_tracer_provider(provider)
+    logger.info(
+        "Tracing enabled for %s (exporter=%s, sample ratio=%s)",
+        service_name, settings.TRACING_EXPORTER, settings.TRACING_SAMPLE_RATIO,
+    )
+
+def instrument_app(app) -> None:
+    """
+    Create a span for each FastAPI request.
+    
+    Args:
+        app: FastAPI application
+    """
+    if not settings.TRACING_ENABLED:
+        return
+    from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
+    FastAPIInstrumentor.instrument_app(app, excluded_urls="health,metrics")
+
+def instrument_engine(engine) -> None:
+    """
+    Create a span for each SQL statement executed by an engine.
+    
+    Args:
+        engine: SQLAlchemy engine
+    """
+    if not settings.TRACING_ENABLED:
+        return
+    from opentelemetry.instrumentation.sqlalchemy import SQLAlchemyInstrumentor
+    SQLAlchemyInstrumentor().instrument(engine=engine)
+
+def instrument_libraries() -> None:
+    """Create spans for outbound HTTP calls and Celery task publish/execution."""
+    if not settings.TRACING_ENABLED:
+        return
+    from opentelemetry.instrumentation.celery import CeleryInstrumentor
+    from opentelemetry.instrumentation.httpx import HTTPXClientInstrumentor
+    from opentelemetry.instrumentation.requests import RequestsInstrumentor
+    
+    RequestsInstrumentor().instrument()
+    HTTPXClientInstrumentor().instrument()
+    CeleryInstrumentor().instrument()
+
+tracer = trace.get_tracer("bettercorp")
@@ -1,14 +1,44 @@
 """Celery worker for background tasks."""
 
 from celery import Celery
+from kombu import Queue
 
 from .config.settings import settings
 
+# Workload queues. Each queue is consumed by its own worker pool (see
+# docker-compose.yml) so long-running chain tasks never hold up short ones:
+#
+#   sync           external synchronization (Taiga)
+#   chain          blockchain interaction, slow and long-running
+#   notifications  event relay and user notifications, latency sensitive
+#   recompute      rollups, backfills and other derived data
+QUEUE_SYNC = "sync"
+QUEUE_CHAIN = "chain"
+QUEUE_NOTIFICATIONS = "notifications"
+QUEUE_RECOMPUTE = "recompute"
+
+# Task priorities (0 is highest with the Redis transport)
+PRIORITY_HIGH = 0
+PRIORITY_NORMAL = 5
+PRIORITY_LOW = 9
+
 # Create Celery app
 celery = Celery(
     "bettercorp",
     broker=settings.REDIS_URL,
     backend=settings.REDIS_URL,
+    include=[
+        "src.tasks.monitoring",
+        "src.tasks.outbox",
+        "src.tasks.profiling",
+        "src.tasks.batching",
+        "src.tasks.activity",
+        "src.tasks.analytics",
+        "src.tasks.partitions",
+        "src.tasks.archive",
+        "src.tasks.chain",
+        "src.tasks.badges",
+    ],
 )
 
 # Configure Celery
@@ -18,20 +48,66 @@ celery.conf.update(
     result_serializer="json",
     timezone="UTC",
     enable_utc=True,
-)
-
-# Import tasks
-# celery.autodiscover_tasks(["src.tasks"])
-
-@celery.task
-def example_task(name: str) -> str:
-    """
-    Example task.
     
-    Args:
-        name: Name to greet
-        
-    Returns:
-        str: Greeting message
-    """
-    return f"Hello, {name}!"
\ No newline at end of file
+    # Routing
+    task_queues=[
+        Queue(QUEUE_SYNC),
+        Queue(QUEUE_CHAIN),
+        Queue(QUEUE_NOTIFICATIONS),
+        Queue(QUEUE_RECOMPUTE),
+    ],
+    task_default_queue=QUEUE_RECOMPUTE,
+    task_routes={
+        "src.tasks.sync.*": {"queue": QUEUE_SYNC},
+        "src.tasks.chain.*": {"queue": QUEUE_CHAIN},
+        "src.tasks.outbox.*": {"queue": QUEUE_NOTIFICATIONS},
+        "src.tasks.notifications.*": {"queue": QUEUE_NOTIFICATIONS},
+        "src.tasks.batching.*": {"queue": QUEUE_NOTIFICATIONS},
+    },
+    
+    # Priorities within a queue
+    task_default_priority=PRIORITY_NORMAL,
+    broker_transport_options={
+        "priority_steps": list(range(10)),
+        "queue_order_strategy": "priority",
+    },
+    
+    # Most tasks are fire-and-forget; tasks whose result is read opt in
+    # with ignore_result=False
+    task_ignore_result=True,
+    result_expires=3600,
+    
+    # Reserve one message at a time so a worker busy with a long task does
+    # not sit on prefetched short ones; ack after completion so a crashed
+    # worker's task is redelivered
+    worker_prefetch_multiplier=1,
+    task_acks_late=True,
+    task_reject_on_worker_lost=True,
+    
+    beat_schedule={
+        "relay-outbox": {
+            "task": "src.tasks.outbox.relay_outbox_task",
+            "schedule": settings.OUTBOX_RELAY_INTERVAL,
+        },
+        "flush-batches": {
+            "task": "src.tasks.batching.flush_all_batches",
+            "schedule": settings.TASK_BATCH_FLUSH_INTERVAL,
+        },
+        "refresh-analytics": {
+            "task": "src.tasks.analytics.refresh_rollups_task",
+            "schedule": settings.ANALYTICS_ROLLUP_INTERVAL,
+        },
+        "maintain-partitions": {
+            "task": "src.tasks.partitions.maintain_partitions_task",
+            "schedule": settings.PARTITION_MAINTENANCE_INTERVAL,
+        },
+        "archive-partitions": {
+            "task": "src.tasks.archive.archive_partitions_task",
+            "schedule": settings.ARCHIVE_INTERVAL,
+        },
+        "index-chain": {
+            "task": "src.tasks.chain.index_chain_task",
+            "schedule": settings.CHAIN_INDEXER_INTERVAL,
+        },
+    },
+)
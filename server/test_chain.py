@@ -0,0 +1,102 @@
+"""
+Test script for the chain indexer against a local dev chain.
+
+Start the dev chain and the database first (``docker compose --profile dev
+up anvil db``) and apply the migrations. The script deploys a minimal
+contract that emits ERC-721 ``Transfer`` logs, indexes them, then rewrites
+the last blocks with a reorg and checks that the indexer rolls them back.
+"""
+
+from sqlalchemy import delete, select
+from web3 import Web3
+
+from src.blockchain.indexer import CHECKPOINT_NAME, TRANSFER_TOPIC, index_chain
+from src.blockchain.provider import ZERO_ADDRESS, get_web3
+from src.config.settings import settings
+from src.db.database import SessionLocal
+from src.db.models import ChainBlock, ChainCheckpoint, ChainEvent, ChainEventType
+from src.services.chain import get_wallet_events
+
+ALICE = "0x" + "a1" * 20
+BOB = "0x" + "b0" * 20
+
+def emitter_bytecode() -> str:
+    """
+    Creation code of a contract logging ``Transfer(from, to, tokenId)`` for
+    the three words of its calldata.
+    
+    Returns:
+        str: Hex creation code
+    """
+    runtime = (
+        "604035" "602035" "600035"    # CALLDATALOAD tokenId, to, from
+        "7f" + TRANSFER_TOPIC[2:] +   # PUSH32 Transfer topic
+        "60006000a4" "00"             # LOG4 with empty data, STOP
+    )
+    size = len(runtime) // 2
+    init = f"60{size:02x}80600b6000396000f3"  # CODECOPY runtime, RETURN it
+    return "0x" + init + runtime
+
+def emit_transfer(w3: Web3, contract: str, sender: str, from_address: str, to_address: str, token_id: int) -> None:
+    """Mine one transaction logging a transfer."""
+    data = "0x" + "".join(
+        value.rjust(64, "0") for value in (from_address[2:], to_address[2:], f"{token_id:x}")
+    )
+    tx_hash = w3.eth.send_transaction({"from": sender, "to": contract, "data": data})
+    w3.eth.wait_for_transaction_receipt(tx_hash)
+
+def reset(db) -> None:
+    """Forget everything indexed by a previous run."""
+    db.execute(delete(ChainEvent))
+    db.execute(delete(ChainBlock))
+    db.execute(delete(ChainCheckpoint).where(ChainCheckpoint.name == CHECKPOINT_NAME))
+    db.commit()
+
+def main() -> None:
+    """Run all tests."""
+    w3 = get_web3()
+    sender = w3.eth.accounts[0]
+    tx_hash = w3.eth.send_transaction({"from": sender, "data": emitter_bytecode()})
+    contract = w3.eth.wait_for_transaction_receipt(tx_hash)["contractAddress"]
+    print(f"Deployed transfer emitter at {contract}")
+    
+    settings.CONTRACT_ADDRESS = contract
+    settings.CHAIN_INDEXER_CONFIRMATIONS = 0
+    settings.CHAIN_INDEXER_START_BLOCK = w3.eth.block_number
+    
+    db = SessionLocal()
+    try:
+        reset(db)
+        
+        print("Testing indexing...")
+        emit_transfer(w3, contract, sender, ZERO_ADDRESS, ALICE, 1)
+        emit_transfer(w3, contract, sender, ALICE, BOB, 1)
+        print(index_chain(db))
+        events, _ = get_wallet_events(db, ALICE)
+        assert [event.type for event in events] == [ChainEventType.TRANSFER, ChainEventType.MINT], events
+        assert int(events[0].token_id) == 1
+        
+        print("Testing idempotent re-run...")
+        print(index_chain(db))
+        assert len(db.scalars(select(ChainEvent)).all()) == 2
+        
+        print("Testing reorg rollback...")
+        snapshot = w3.provider.make_request("evm_snapshot", [])["result"]
+        emit_transfer(w3, contract, sender, ZERO_ADDRESS, ALICE, 2)
+        print(index_chain(db))
+        assert len(get_wallet_events(db, ALICE)[0]) == 3
+        
+        # Replace the block holding the mint of token 2 by a longer branch
+        w3.provider.make_request("evm_revert", [snapshot])
+        emit_transfer(w3, contract, sender, ZERO_ADDRESS, BOB, 3)
+        w3.provider.make_request("anvil_mine", [2])
+        print(index_chain(db))
+        token_ids = sorted(int(event.token_id) for event in db.scalars(select(ChainEvent)))
+        assert token_ids == [1, 1, 3], token_ids
+        
+        print("All tests passed")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Test script for request coalescing.
+
+Start Redis first (``docker compose up redis``). The script sends identical
+GET requests through two ``CoalescingMiddleware`` instances, standing in
+for two API processes, wrapping a test application in-process. It checks
+that a burst runs the endpoint once, and that when the leader fails or
+crashes, its followers run the request themselves instead of failing or
+waiting out their deadline.
+"""
+
+import asyncio
+import hashlib
+import json
+import time
+import uuid
+
+from src.utils.asgi import call_asgi
+from src.utils.coalesce import CoalescingMiddleware
+from src.utils.redis_client import get_async_redis
+
+# Requests the test application ran, by path, and paths whose next run fails
+runs = {}
+failing = set()
+
+async def app(scope, receive, send) -> None:
+    """Count the request, wait a little and answer, or fail if asked to."""
+    path = scope["path"]
+    runs[path] = runs.get(path, 0) + 1
+    await asyncio.sleep(0.2)
+    if path in failing:
+        failing.discard(path)
+        raise RuntimeError(f"Leader failed for {path}")
+    body = json.dumps({"path": path, "run": runs[path]}).encode()
+    await send({
+        "type": "http.response.start",
+        "status": 200,
+        "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+# Two API processes sharing Redis
+first_process = CoalescingMiddleware(app, ["/api/items/{item_id}"], redis=True, wait=3)
+second_process = CoalescingMiddleware(app, ["/api/items/{item_id}"], redis=True, wait=3)
+
+async def get(process: CoalescingMiddleware, path: str):
+    """Send a GET request through a process, None if it failed."""
+    scope = {"type": "http", "method": "GET", "path": path, "query_string": b"", "headers": []}
+    try:
+        return await call_asgi(process, scope)
+    except RuntimeError:
+        return None
+
+def new_path() -> str:
+    """Path of an item no earlier run requested."""
+    return f"/api/items/{uuid.uuid4().hex}"
+
+async def run_tests() -> None:
+    """Run all tests."""
+    print("Testing a burst within one process...")
+    path = new_path()
+    responses = await asyncio.gather(*(get(first_process, path) for _ in range(5)))
+    assert runs[path] == 1, runs
+    assert len({response.body for response in responses}) == 1, responses
+    
+    print("Testing a burst across processes...")
+    path = new_path()
+    leader = asyncio.create_task(get(first_process, path))
+    await asyncio.sleep(0.05)
+    follower = await get(second_process, path)
+    leader = await leader
+    assert runs[path] == 1, runs
+    assert follower.body == leader.body, (leader, follower)
+    
+    print("Testing failover after the leader failed...")
+    path = new_path()
+    failing.add(path)
+    responses = await asyncio.gather(*(get(first_process, path) for _ in range(3)))
+    assert responses[0] is None, responses
+    assert all(response.status == 200 for response in responses[1:]), responses
+    failing.add(path)
+    leader = asyncio.create_task(get(first_process, path))
+    await asyncio.sleep(0.05)
+    follower = await get(second_process, path)
+    assert await leader is None and follower.status == 200, follower
+    
+    print("Testing failover after the leading process crashed...")
+    path = new_path()
+    key = hashlib.sha256(b"\n".join((path.encode(), b"", b""))).hexdigest()
+    await get_async_redis().set(f"coalesce:lock:{key}", uuid.uuid4().hex, px=300)
+    start = time.monotonic()
+    follower = await get(second_process, path)
+    assert follower.status == 200 and runs[path] == 1, (follower, runs)
+    assert time.monotonic() - start < second_process.wait, "Follower waited out its deadline"
+    
+    print("All tests passed")
+
+if __name__ == "__main__":
+    asyncio.run(run_tests())
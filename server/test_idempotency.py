@@ -0,0 +1,89 @@
+"""
+Test script for idempotency keys.
+
+Start Redis first (``docker compose up redis``). The script sends POST
+requests with an ``Idempotency-Key`` through ``IdempotencyMiddleware``
+wrapping a test application, in-process, and checks that retries are
+replayed without running the endpoint again, that reusing a key with
+another body is rejected, and that a duplicate of a request running longer
+than the lock TTL waits for it instead of running it a second time.
+"""
+
+import asyncio
+import json
+import uuid
+
+from src.utils.asgi import call_asgi
+from src.utils.idempotency import IdempotencyMiddleware
+
+# Requests the test application ran, by idempotency key
+runs = {}
+
+async def app(scope, receive, send) -> None:
+    """Count the request, wait ``delay`` seconds and answer with ``status``."""
+    request = json.loads((await receive())["body"])
+    key = dict(scope["headers"])[b"idempotency-key"].decode()
+    runs[key] = runs.get(key, 0) + 1
+    await asyncio.sleep(request.get("delay", 0))
+    body = json.dumps({"run": runs[key], "value": request.get("value")}).encode()
+    await send({
+        "type": "http.response.start",
+        "status": request.get("status", 201),
+        "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+middleware = IdempotencyMiddleware(app, ttl=60, lock_ttl=1, wait=5, poll_interval=0.01)
+
+async def post(key: str, **request):
+    """Send a POST request with an idempotency key."""
+    scope = {
+        "type": "http",
+        "method": "POST",
+        "path": "/api/test",
+        "query_string": b"",
+        "headers": [(b"idempotency-key", key.encode()), (b"content-type", b"application/json")],
+    }
+    return await call_asgi(middleware, scope, json.dumps(request).encode())
+
+async def run_tests() -> None:
+    """Run all tests."""
+    print("Testing replay of a retry...")
+    key = uuid.uuid4().hex
+    first = await post(key, value=1)
+    retry = await post(key, value=1)
+    assert first.status == retry.status == 201, (first, retry)
+    assert retry.body == first.body and retry.header("idempotent-replayed") == "true", retry
+    assert runs[key] == 1, runs
+    
+    print("Testing a key reused with another body...")
+    mismatch = await post(key, value=2)
+    assert mismatch.status == 422, mismatch
+    assert runs[key] == 1, runs
+    
+    print("Testing a duplicate of a running request...")
+    key = uuid.uuid4().hex
+    first, duplicate = await asyncio.gather(post(key, value=1, delay=0.2), post(key, value=1, delay=0.2))
+    assert first.body == duplicate.body, (first, duplicate)
+    assert runs[key] == 1, runs
+    
+    print("Testing a duplicate of a request outlasting the lock TTL...")
+    key = uuid.uuid4().hex
+    slow = asyncio.create_task(post(key, value=1, delay=2.5))
+    await asyncio.sleep(1.5)
+    duplicate = await post(key, value=1, delay=2.5)
+    slow = await slow
+    assert duplicate.status == 201 and duplicate.body == slow.body, (slow, duplicate)
+    assert runs[key] == 1, runs
+    
+    print("Testing a retry of a failed request...")
+    key = uuid.uuid4().hex
+    failed = await post(key, value=1, status=503)
+    retry = await post(key, value=1)
+    assert failed.status == 503 and retry.status == 201, (failed, retry)
+    assert runs[key] == 2, runs
+    
+    print("All tests passed")
+
+if __name__ == "__main__":
+    asyncio.run(run_tests())
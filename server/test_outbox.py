@@ -0,0 +1,98 @@
+"""
+Test script for the outbox relay's retries.
+
+Start the database first (``docker compose up db``) and apply the
+migrations. The script enqueues events of a test topic whose handler fails
+on demand, relays them and checks that a failed event is neither published
+nor retried before its backoff has passed, and that it is parked after
+``OUTBOX_MAX_ATTEMPTS`` failed attempts.
+"""
+
+from sqlalchemy import delete, update
+
+from src.config.settings import settings
+from src.db.database import SessionLocal
+from src.db.models import OutboxEvent
+from src.services import events, outbox
+
+TOPIC = "test.outbox"
+
+# Handler calls and publications per event id
+calls = {}
+published = []
+failing = set()
+
+@outbox.outbox_handler(TOPIC)
+def handle(event) -> None:
+    """Record the call and fail for the events marked as failing."""
+    calls[event["id"]] = calls.get(event["id"], 0) + 1
+    if event["payload"]["name"] in failing:
+        raise RuntimeError(f"Handler failed for {event['payload']['name']}")
+
+def record_publications(batch):
+    """Record published events instead of sending them to Redis."""
+    batch = list(batch)
+    published.extend(event["data"]["event_id"] for event in batch)
+    return [None] * len(batch)
+
+def reset(db) -> None:
+    """Remove the events of a previous run."""
+    db.execute(delete(OutboxEvent).where(OutboxEvent.topic == TOPIC))
+    db.commit()
+
+def make_due(db, event_id: int) -> None:
+    """Let a failed event's backoff pass."""
+    db.execute(update(OutboxEvent).where(OutboxEvent.id == event_id).values(next_attempt_at=None))
+    db.commit()
+
+def main() -> None:
+    """Run all tests."""
+    events.publish_events = record_publications
+    settings.OUTBOX_MAX_ATTEMPTS = 3
+    settings.OUTBOX_RETRY_BASE_DELAY = 60
+    
+    db = SessionLocal()
+    try:
+        reset(db)
+        ok = outbox.enqueue_event(db, TOPIC, {"name": "ok"})
+        bad = outbox.enqueue_event(db, TOPIC, {"name": "bad"})
+        db.commit()
+        failing.add("bad")
+        
+        print("Testing publication after handlers...")
+        print(outbox.relay_outbox(db))
+        assert calls == {ok.id: 1, bad.id: 1}, calls
+        assert published.count(ok.id) == 1 and bad.id not in published, published
+        db.refresh(bad)
+        assert bad.published_at is None and bad.attempts == 1, bad
+        assert bad.next_attempt_at is not None, bad
+        
+        print("Testing backoff...")
+        print(outbox.relay_outbox(db))
+        assert calls == {ok.id: 1, bad.id: 1}, calls
+        
+        print("Testing park after the last attempt...")
+        for _ in range(settings.OUTBOX_MAX_ATTEMPTS):
+            make_due(db, bad.id)
+            print(outbox.relay_outbox(db))
+        assert calls[bad.id] == settings.OUTBOX_MAX_ATTEMPTS, calls
+        db.refresh(bad)
+        assert bad.published_at is None and bad.attempts == settings.OUTBOX_MAX_ATTEMPTS, bad
+        assert "Handler failed" in bad.last_error, bad.last_error
+        
+        print("Testing recovery of a retried event...")
+        db.execute(update(OutboxEvent).where(OutboxEvent.id == bad.id).values(attempts=0, next_attempt_at=None))
+        db.commit()
+        failing.clear()
+        print(outbox.relay_outbox(db))
+        assert published.count(bad.id) == 1 and published.count(ok.id) == 1, published
+        db.refresh(bad)
+        assert bad.published_at is not None and bad.last_error is None, bad
+        
+        print("All tests passed")
+    finally:
+        reset(db)
+        db.close()
+
+if __name__ == "__main__":
+    main()
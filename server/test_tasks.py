@@ -0,0 +1,88 @@
+"""
+Test script for idempotent Celery tasks.
+
+Start Redis first (``docker compose up redis``); no worker is needed. The
+script runs a test task the way a worker runs a delivered message and checks
+that a redelivered copy of a finished job is skipped, and that a copy finding
+the job locked, e.g. by a worker that crashed, is retried later instead of
+dropped.
+"""
+
+import uuid
+
+from celery.exceptions import Retry
+
+from src.tasks.base import IdempotentTask
+from src.utils.redis_client import get_redis
+from src.worker import celery
+
+# Jobs run by the test task and retries it scheduled
+runs = []
+retries = []
+
+class RecordingTask(IdempotentTask):
+    """Idempotent task recording its retries instead of sending them to the broker."""
+    
+    def apply_async(self, args=None, kwargs=None, **options):
+        """Record a scheduled retry."""
+        retries.append({"args": args, **options})
+
+@celery.task(base=RecordingTask, name="test_tasks.record")
+def record(job_id: str) -> str:
+    """Record a run of a job."""
+    runs.append(job_id)
+    return job_id
+
+def deliver(job_id: str):
+    """Run the task as a worker runs a delivered message."""
+    record.push_request(id=uuid.uuid4().hex, args=[job_id], kwargs={}, called_directly=False, retries=0)
+    try:
+        return record(job_id)
+    finally:
+        record.pop_request()
+
+def reset(*job_ids: str) -> None:
+    """Remove the keys of a previous run."""
+    keys = [record._key((job_id,), {}) for job_id in job_ids]
+    get_redis().delete(*(f"{key}:{suffix}" for key in keys for suffix in ("lock", "done")))
+
+def main() -> None:
+    """Run all tests."""
+    reset("a", "b")
+    try:
+        print("Testing first delivery...")
+        assert deliver("a") == "a"
+        assert runs == ["a"], runs
+        
+        print("Testing redelivery of a finished job...")
+        assert deliver("a") is None
+        assert runs == ["a"], runs
+        
+        print("Testing redelivery while the job is locked...")
+        lock = f"{record._key(('b',), {})}:lock"
+        get_redis().set(lock, 1, ex=5)
+        try:
+            deliver("b")
+        except Retry:
+            pass
+        else:
+            raise AssertionError("Locked job was not retried")
+        assert runs == ["a"], runs
+        assert len(retries) == 1 and retries[0]["args"] == ["b"], retries
+        assert 1 <= retries[0]["countdown"] <= 5, retries
+        
+        print("Testing direct call while the job is locked...")
+        assert record("b") is None
+        assert runs == ["a"] and len(retries) == 1, (runs, retries)
+        
+        print("Testing the retry once the lock expired...")
+        get_redis().delete(lock)
+        assert deliver("b") == "b"
+        assert runs == ["a", "b"], runs
+        
+        print("All tests passed")
+    finally:
+        reset("a", "b")
+
+if __name__ == "__main__":
+    main()